@@ -23,11 +23,27 @@
 
 from builtins import object
 from random import uniform
-from math import pi, cos, sin
+from math import pi, cos, sin, sqrt
 
-from qgis.core import QgsFeature, QgsGeometry, QgsPoint
+import numpy as np
+from qgis.core import QgsFeature, QgsGeometry, QgsPoint, QgsWkbTypes
 
-from geopublichealth.src.core.exceptions import PointOutsideEnvelopeException
+from geopublichealth.src.core.blurring.sampling import (
+    BUFFER_SEGMENTS,
+    FeatureRandom,
+    circle_polygons_wkb,
+    circle_template,
+    donut_offsets,
+    random_offsets,
+    sample_in_disk,
+    sample_in_donut,
+    sample_in_triangles,
+    triangulate_polygon,
+)
+from geopublichealth.src.core.exceptions import (
+    MinimumDisplacementException,
+    PointOutsideEnvelopeException,
+)
 
 
 # noinspection PyArgumentList
@@ -35,10 +51,19 @@ class Blur(object):
     """Blurring algorithm."""
 
     @staticmethod
-    def random_point_around_geom_point(point, radius):
-        """Creating a random point."""
-        teta = pi * uniform(0, 2)
-        r = uniform(0, radius)
+    def random_point_around_geom_point(point, radius, rng=None, min_radius=0):
+        """Creating a random point, from ``rng`` or the random module.
+
+        With a minimum radius, the point is area-uniform in the ring between
+        both radii (donut masking).
+        """
+        draw = rng.uniform if rng is not None else uniform
+        teta = pi * draw(0, 2)
+        if min_radius > 0:
+            r = sqrt(draw(0, 1) * (radius ** 2 - min_radius ** 2)
+                     + min_radius ** 2)
+        else:
+            r = draw(0, radius)
         random_x = point.asPoint().x() + (r * cos(teta))
         random_y = point.asPoint().y() + (r * sin(teta))
         # noinspection PyCallByClass,PyTypeChecker
@@ -49,16 +74,105 @@ class Blur(object):
             radius,
             polygon_envelope,
             add_radius_to_attributes,
-            add_centroid_to_attributes):
+            add_centroid_to_attributes,
+            sample_in_envelope=False,
+            seed=None,
+            min_radius=0):
         self.__radius = radius
         self.__polygon_envelope = polygon_envelope
         self.__add_radius_to_attributes = add_radius_to_attributes
         self.__add_centroid_to_attributes = add_centroid_to_attributes
+        # Draw once in the disk clipped by the envelope, no rejection loop.
+        self.__sample_in_envelope = sample_in_envelope
+        # With a seed, each feature has its own stream (see FeatureRandom).
+        self.__seed = seed
+        # Minimum displacement (donut masking), for the blur radius.
+        self.__min_radius = min_radius
+
+    def min_radius(self, radius):
+        """Minimum displacement of a point blurred with the given radius.
+
+        The minimum radius scales with per-point radii, e.g. the ones of
+        ``k_anonymity_radius`` that follow the population density.
+        """
+        if not self.__min_radius or not self.__radius:
+            return 0 * radius
+        return self.__min_radius * radius / self.__radius
+
+    def random_point_in_clipped_disk(self, x, y, uniforms, radius=None):
+        """Draw a point uniformly in the disk of the point inside the envelope.
+
+        The disk is clipped by the envelope once and the clipped region is
+        triangulated, so a single draw is needed and the radius is never
+        reduced.
+
+        :param uniforms: Three uniform numbers in [0, 1).
+
+        :param radius: Radius of this point, the blur radius if None.
+        :type radius: float
+
+        :return: Coordinates of the random point. With a minimum radius,
+            None if no part of the ring is inside the envelope.
+        :rtype: tuple
+        """
+        if radius is None:
+            radius = self.__radius
+        min_radius = self.min_radius(radius)
+        disk = QgsGeometry.fromPoint(QgsPoint(x, y)).buffer(
+            radius, BUFFER_SEGMENTS)
+        if min_radius > 0:
+            # The hole circumscribes the circle of the minimum radius, a
+            # buffer polygon is inscribed and would let closer points in.
+            hole_radius = min_radius / cos(pi / (4 * BUFFER_SEGMENTS))
+            disk = disk.difference(QgsGeometry.fromPoint(
+                QgsPoint(x, y)).buffer(hole_radius, BUFFER_SEGMENTS))
+        region = self.__polygon_envelope.clip(disk)
+        if region is disk:
+            if min_radius > 0:
+                dx, dy = sample_in_donut(min_radius, radius, uniforms)
+            else:
+                dx, dy = sample_in_disk(radius, uniforms)
+            return x + dx, y + dy
+
+        triangles = []
+        if region is not None:
+            for part in region.asGeometryCollection():
+                if part.type() != QgsWkbTypes.PolygonGeometry:
+                    continue
+                if part.isMultipart():
+                    polygons = part.asMultiPolygon()
+                else:
+                    polygons = [part.asPolygon()]
+                for rings in polygons:
+                    triangles.extend(triangulate_polygon(
+                        [[(p.x(), p.y()) for p in ring] for ring in rings]))
+
+        point = sample_in_triangles(np.array(triangles), uniforms)
+        if point is None:
+            if min_radius > 0:
+                # Never closer than the minimum displacement
+                return None
+            # The point is on the envelope boundary, with no area around.
+            return x, y
+        return point
 
-    def blur(self, feature):
+    def blur(self, feature, radius=None, buffer_radius=None):
+        """Blur a point feature, with its own radius if given.
+
+        The point is moved by at most ``radius``, the buffer drawn around it
+        has ``buffer_radius``, the radius itself if None.
+        """
+        if radius is None:
+            radius = self.__radius
+        if buffer_radius is None:
+            buffer_radius = radius
         geom = feature.geometry()
         attributes = feature.attributes()
         random_point = None
+        rng = None
+        if self.__seed is not None:
+            rng = FeatureRandom(self.__seed, feature.id())
+        draw = rng.uniform if rng is not None else uniform
 
         # If we use a mask
         if self.__polygon_envelope is not None:
@@ -67,39 +181,262 @@ class Blur(object):
             if not self.__polygon_envelope.contains(geom):
                 raise PointOutsideEnvelopeException(number=feature.id())
 
-            radius = self.__radius
+            if self.__sample_in_envelope:
+                point = geom.asPoint()
+                random_xy = self.random_point_in_clipped_disk(
+                    point.x(), point.y(), [draw(0, 1) for _ in range(3)],
+                    radius)
+                if random_xy is None:
+                    raise MinimumDisplacementException(number=feature.id())
+                random_x, random_y = random_xy
+                random_point = QgsGeometry.fromPoint(
+                    QgsPoint(random_x, random_y))
+                return self.buffer_feature(
+                    random_point, attributes, buffer_radius)
+
+            # The first buffer is reduced, never below the minimum radius.
+            min_radius = self.min_radius(radius)
+            sampling_radius = radius
             i = 0
             while True:
                 random_point = Blur.random_point_around_geom_point(
-                    geom, radius)
+                    geom, sampling_radius, rng, min_radius)
                 if self.__polygon_envelope.contains(random_point):
                     break
                 else:
                     i += 1
                     # After i increment, we reduce the first buffer
                     if i == 100:
-                        radius = int(radius * 0.5)
+                        sampling_radius = max(
+                            int(sampling_radius * 0.5), min_radius)
                     elif i == 150:
-                        radius = int(radius * 0.5)
+                        sampling_radius = max(
+                            int(sampling_radius * 0.5), min_radius)
                     elif i == 200:
-                        radius = int(radius * 0.5)
+                        sampling_radius = max(
+                            int(sampling_radius * 0.5), min_radius)
                     elif i >= 250:
-                        radius = 0
+                        if min_radius > 0:
+                            raise MinimumDisplacementException(
+                                number=feature.id())
+                        sampling_radius = 0
 
         else:
             random_point = Blur.random_point_around_geom_point(
-                geom, self.__radius)
+                geom, radius, rng, self.min_radius(radius))
+
+        return self.buffer_feature(random_point, attributes, buffer_radius)
 
+    def buffer_feature(self, random_point, attributes, radius):
+        """Create the blurred feature around the random point."""
         # Creating the second buffer.
-        buffer_geom = random_point.buffer(self.__radius, 20)
+        buffer_geom = random_point.buffer(radius, 20)
         buffer_feature = QgsFeature()
         buffer_feature.setGeometry(buffer_geom)
 
         if self.__add_radius_to_attributes:
-            attributes.append(self.__radius)
+            attributes.append(radius)
         if self.__add_centroid_to_attributes:
-            attributes.append(int(buffer_geom.centroid().asPoint().x()))
-            attributes.append(int(buffer_geom.centroid().asPoint().y()))
+            # The random point, as in blur_batch, not the polygon centroid.
+            point = random_point.asPoint()
+            attributes.append(int(point.x()))
+            attributes.append(int(point.y()))
 
         buffer_feature.setAttributes(attributes)
         return buffer_feature
+
+    def random_points_in_envelope(self, x, y, rng, radius=None):
+        """Draw one random point per center, inside the envelope.
+
+        Offsets are drawn and tested (``LayerIndex.contains_many``) for every
+        pending point at once, with the radius reduction of ``blur`` after
+        100, 150, 200 and 250 attempts. ``radius`` is an optional radius per
+        center.
+
+        The radius is never reduced below the minimum radius. With a minimum
+        radius, the points still pending after 250 attempts are not moved
+        and are flagged instead.
+
+        :return: x and y of the random points, and a boolean array, false
+            for the points which could not be moved.
+        :rtype: tuple
+        """
+        if radius is None:
+            radius = np.full(len(x), float(self.__radius))
+        else:
+            radius = np.array(radius, dtype=float)
+        min_radius = self.min_radius(radius)
+        random_x = np.array(x, dtype=float)
+        random_y = np.array(y, dtype=float)
+        pending = np.arange(len(x))
+        attempts = 0
+        while len(pending):
+            dx, dy = self.offsets(rng, radius[pending], min_radius[pending])
+            candidate_x = random_x[pending] + dx
+            candidate_y = random_y[pending] + dy
+            inside = self.__polygon_envelope.contains_many(
+                np.column_stack((candidate_x, candidate_y)))
+            done = pending[inside]
+            random_x[done] = candidate_x[inside]
+            random_y[done] = candidate_y[inside]
+            pending = pending[~inside]
+
+            attempts += 1
+            if attempts in (100, 150, 200):
+                radius[pending] = np.maximum(
+                    np.floor(radius[pending] * 0.5), min_radius[pending])
+            elif attempts >= 250:
+                if self.__min_radius:
+                    break
+                radius[pending] = 0
+        displaced = np.ones(len(x), dtype=bool)
+        displaced[pending] = False
+        return random_x, random_y, displaced
+
+    def offsets(self, rng, radius, min_radius):
+        """Random offsets, area-uniform in a ring with a minimum radius."""
+        if self.__min_radius:
+            return donut_offsets(rng, min_radius, radius)
+        return random_offsets(rng, radius)
+
+    def blur_batch(
+            self,
+            x,
+            y,
+            attributes=None,
+            feature_ids=None,
+            rng=None,
+            chunk_size=10000,
+            radius=None,
+            buffer_radius=None):
+        """Blur points given as coordinate arrays, yielding chunks of features.
+
+        Offsets come from a NumPy ``Generator`` and the buffers are built from
+        a unit circle template, so no geometry operation runs per point
+        without envelope. Output features have the fields of ``blur``, with
+        the random point as centroid in both. With a minimum radius, the
+        offsets are drawn in a ring (``donut_offsets``).
+        As in ``blur``, points outside the envelope are skipped, and so are
+        the points which can not be moved by the minimum radius inside it.
+
+        :param x: x coordinates of the points.
+        :type x: numpy.ndarray
+
+        :param y: y coordinates of the points.
+        :type y: numpy.ndarray
+
+        :param attributes: Optional attribute list of each point.
+        :type attributes: list
+
+        :param feature_ids: Optional id of each point, to report the
+            skipped points.
+        :type feature_ids: list
+
+        :param rng: A ``numpy.random.Generator``, a new one if None.
+
+        :param chunk_size: Number of features yielded at once.
+        :type chunk_size: int
+
+        :param radius: Optional radius of each point, e.g. from
+            ``k_anonymity_radius``, instead of the blur radius.
+        :type radius: numpy.ndarray
+
+        :param buffer_radius: Optional buffer radius of each point, e.g. from
+            ``covering_buffer_radius``, the radius of the point if None.
+        :type buffer_radius: numpy.ndarray
+
+        :return: For each chunk, the list of blurred QgsFeature, in the order
+            of the points, and the list of the ids of the skipped points.
+        """
+        x = np.asarray(x, dtype=float).reshape(-1)
+        y = np.asarray(y, dtype=float).reshape(-1)
+        if rng is None:
+            rng = np.random.default_rng()
+        if feature_ids is None:
+            feature_ids = range(len(x))
+        template = circle_template()
+        if radius is None:
+            radii = np.full(len(x), float(self.__radius))
+        else:
+            radii = np.asarray(radius, dtype=float).reshape(-1)
+        if buffer_radius is None:
+            buffer_radii = radii
+        else:
+            buffer_radii = np.asarray(buffer_radius, dtype=float).reshape(-1)
+
+        for start in range(0, len(x), chunk_size):
+            positions = np.arange(start, min(start + chunk_size, len(x)))
+            skipped_ids = []
+
+            if self.__polygon_envelope is not None:
+                # We have to be sure that every initial point intersect the layer
+                inside = self.__polygon_envelope.contains_many(
+                    np.column_stack((x[positions], y[positions])))
+                skipped_ids = [feature_ids[p] for p in positions[~inside]]
+                positions = positions[inside]
+                if not len(positions):
+                    yield [], skipped_ids
+                    continue
+
+            chunk_x = x[positions]
+            chunk_y = y[positions]
+            chunk_radius = radii[positions]
+            chunk_buffer_radius = buffer_radii[positions]
+
+            if self.__polygon_envelope is not None:
+                if self.__sample_in_envelope:
+                    uniforms = rng.random((len(chunk_x), 3))
+                    points = [
+                        self.random_point_in_clipped_disk(
+                            chunk_x[index], chunk_y[index], uniforms[index],
+                            chunk_radius[index])
+                        for index in range(len(chunk_x))]
+                    displaced = np.array([p is not None for p in points])
+                    random_x, random_y = np.array([
+                        p if p is not None else (np.nan, np.nan)
+                        for p in points]).reshape(-1, 2).T
+                else:
+                    random_x, random_y, displaced = (
+                        self.random_points_in_envelope(
+                            chunk_x, chunk_y, rng, chunk_radius))
+                if not displaced.all():
+                    skipped_ids.extend(
+                        feature_ids[p] for p in positions[~displaced])
+                    positions = positions[displaced]
+                    random_x = random_x[displaced]
+                    random_y = random_y[displaced]
+                    chunk_radius = chunk_radius[displaced]
+                    chunk_buffer_radius = chunk_buffer_radius[displaced]
+            else:
+                dx, dy = self.offsets(
+                    rng, chunk_radius, self.min_radius(chunk_radius))
+                random_x = chunk_x + dx
+                random_y = chunk_y + dy
+
+            polygons = circle_polygons_wkb(
+                random_x, random_y, chunk_buffer_radius, template)
+
+            features = []
+            for index, (position, wkb) in enumerate(zip(positions, polygons)):
+                buffer_geom = QgsGeometry()
+                buffer_geom.fromWkb(wkb)
+                buffer_feature = QgsFeature()
+                buffer_feature.setGeometry(buffer_geom)
+
+                if attributes is not None:
+                    feature_attributes = list(attributes[position])
+                else:
+                    feature_attributes = []
+                if self.__add_radius_to_attributes:
+                    if radius is None and buffer_radius is None:
+                        feature_attributes.append(self.__radius)
+                    else:
+                        feature_attributes.append(
+                            float(chunk_buffer_radius[index]))
+                if self.__add_centroid_to_attributes:
+                    feature_attributes.append(int(random_x[index]))
+                    feature_attributes.append(int(random_y[index]))
+
+                buffer_feature.setAttributes(feature_attributes)
+                features.append(buffer_feature)
+            yield features, skipped_ids
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+METRIC_DISPLACEMENT = "displacement"
+METRIC_ANONYMITY = "k_anonymity"
+METRIC_RISK = "risk"
+METRIC_LINKED = "linked"
+
+
+def _kd_tree(coordinates: np.ndarray):
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError as exc:
+        raise ImportError("scipy is required to evaluate the blurring") from exc
+    return cKDTree(coordinates)
+
+
+def _as_coordinates(values) -> np.ndarray:
+    return np.asarray(values, dtype=float).reshape(-1, 2)
+
+
+def anonymity_counts(centers, radius, reference) -> np.ndarray:
+    """Number of reference points inside each blurred buffer.
+
+    Every reference point of the buffer is a possible location of the case,
+    so the count is the k-anonymity achieved by the feature.
+
+    :param centers: (n, 2) centers of the blurred buffers.
+    :type centers: numpy.ndarray
+
+    :param radius: Radius of every buffer, or of each one.
+    :type radius: float or numpy.ndarray
+
+    :param reference: (m, 2) population reference points.
+    :type reference: numpy.ndarray
+
+    :return: Count of each buffer, 0 for buffers without center.
+    :rtype: numpy.ndarray
+    """
+    centers = _as_coordinates(centers)
+    reference = _as_coordinates(reference)
+    reference = reference[np.isfinite(reference).all(axis=1)]
+    radius = np.broadcast_to(np.asarray(radius, dtype=float), len(centers))
+
+    counts = np.zeros(len(centers), dtype=np.int64)
+    valid = np.isfinite(centers).all(axis=1) & np.isfinite(radius)
+    if valid.any() and len(reference):
+        counts[valid] = _kd_tree(reference).query_ball_point(
+            centers[valid], radius[valid], return_length=True, workers=-1
+        )
+    return counts
+
+
+def linkage_hits(original, centers) -> np.ndarray:
+    """True when the nearest original case of a blurred center is its own.
+
+    This is the nearest-neighbour attack of someone knowing the original
+    case locations, the share of hits is the re-identification rate.
+
+    :param original: (n, 2) original case locations.
+    :type original: numpy.ndarray
+
+    :param centers: (n, 2) centers of the blurred buffers, same order.
+    :type centers: numpy.ndarray
+
+    :rtype: numpy.ndarray
+    """
+    original = _as_coordinates(original)
+    centers = _as_coordinates(centers)
+    if len(original) != len(centers):
+        raise ValueError("One blurred feature is required per original case.")
+
+    hits = np.zeros(len(centers), dtype=bool)
+    known = np.flatnonzero(np.isfinite(original).all(axis=1))
+    valid = np.isfinite(centers).all(axis=1)
+    if not len(known) or not valid.any():
+        return hits
+
+    __, nearest = _kd_tree(original[known]).query(centers[valid], k=1, workers=-1)
+    hits[valid] = known[nearest] == np.flatnonzero(valid)
+    return hits
+
+
+def evaluate_blurring(
+    original, centers, radius, reference=None
+) -> Dict[str, np.ndarray]:
+    """Privacy metrics of each blurred feature.
+
+    :param original: (n, 2) original case locations.
+    :type original: numpy.ndarray
+
+    :param centers: (n, 2) centers of the blurred buffers, same order.
+    :type centers: numpy.ndarray
+
+    :param radius: Radius of every buffer, or of each one.
+    :type radius: float or numpy.ndarray
+
+    :param reference: Optional (m, 2) population reference points. Without
+        it, the other original cases are the reference.
+    :type reference: numpy.ndarray
+
+    :return: Displacement, k-anonymity, risk (1 / k) and linkage hit of each
+        feature, by metric name.
+    :rtype: dict
+    """
+    original = _as_coordinates(original)
+    centers = _as_coordinates(centers)
+    if reference is None:
+        reference = original
+
+    anonymity = anonymity_counts(centers, radius, reference)
+    return {
+        METRIC_DISPLACEMENT: np.hypot(*(centers - original).T),
+        METRIC_ANONYMITY: anonymity,
+        # No reference point in the buffer: the location is fully disclosed.
+        METRIC_RISK: 1.0 / np.maximum(anonymity, 1),
+        METRIC_LINKED: linkage_hits(original, centers),
+    }
+
+
+def summary(
+    metrics: Dict[str, np.ndarray], k: Optional[int] = None
+) -> List[Tuple[str, str]]:
+    """Summary rows of the metrics, as (label, value) strings.
+
+    :param k: Optional k-anonymity target, the share of features below it
+        is added.
+    :type k: int
+
+    :rtype: list
+    """
+    displacement = metrics[METRIC_DISPLACEMENT]
+    displacement = displacement[np.isfinite(displacement)]
+    anonymity = metrics[METRIC_ANONYMITY]
+    rows = [("Count", str(len(anonymity)))]
+    if len(displacement):
+        quartiles = np.percentile(displacement, [25, 50, 75])
+        rows += [
+            ("Displacement mean", "%.6f" % displacement.mean()),
+            ("Displacement Q1", "%.6f" % quartiles[0]),
+            ("Displacement median", "%.6f" % quartiles[1]),
+            ("Displacement Q3", "%.6f" % quartiles[2]),
+            ("Displacement max", "%.6f" % displacement.max()),
+        ]
+    if len(anonymity):
+        rows += [
+            ("k-anonymity min", str(int(anonymity.min()))),
+            ("k-anonymity median", "%.1f" % np.median(anonymity)),
+            ("Expected re-identification risk", "%.6f" % metrics[METRIC_RISK].mean()),
+            ("Nearest-neighbour linkage rate", "%.6f" % metrics[METRIC_LINKED].mean()),
+        ]
+        if k is not None:
+            rows.append(("Share below k = %d" % k, "%.6f" % (anonymity < k).mean()))
+    return rows
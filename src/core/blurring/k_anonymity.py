@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def k_anonymity_radius(
+    points,
+    reference,
+    k: int,
+    min_radius: float = 0.0,
+    max_radius: Optional[float] = None,
+) -> np.ndarray:
+    """Smallest radius around each point covering k reference points.
+
+    The radius is the distance to the k-th nearest reference point (a
+    reference point at the location of the case counts), found with a
+    single k-nearest-neighbour query on a KD-tree for all the points.
+
+    :param points: (n, 2) coordinates of the points to blur.
+    :type points: numpy.ndarray
+
+    :param reference: (m, 2) coordinates of the reference points, such as
+        households or population points. NaN coordinates are ignored.
+    :type reference: numpy.ndarray
+
+    :param k: Number of reference points each radius must cover.
+    :type k: int
+
+    :param min_radius: Lower bound of the radii.
+    :type min_radius: float
+
+    :param max_radius: Optional upper bound of the radii. Capped points no
+        longer cover k reference points.
+    :type max_radius: float
+
+    :return: Radius of each point, NaN for points without coordinates.
+    :rtype: numpy.ndarray
+    """
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError as exc:
+        raise ImportError("scipy is required for k-anonymity radii") from exc
+
+    if k < 1:
+        raise ValueError("k must be at least 1.")
+
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    reference = np.asarray(reference, dtype=float).reshape(-1, 2)
+    reference = reference[np.isfinite(reference).all(axis=1)]
+    if len(reference) < k:
+        raise ValueError(
+            "The reference layer has {} points, fewer than k = {}.".format(
+                len(reference), k
+            )
+        )
+
+    radii = np.full(len(points), np.nan)
+    finite = np.isfinite(points).all(axis=1)
+    if finite.any():
+        distances, __ = cKDTree(reference).query(points[finite], k=[k], workers=-1)
+        radii[finite] = distances[:, 0]
+
+    radii = np.maximum(radii, min_radius)
+    if max_radius is not None:
+        radii = np.minimum(radii, max_radius)
+    return radii
+
+
+def covering_buffer_radius(radius) -> np.ndarray:
+    """Buffer radius still covering the k-anonymity disk after displacement.
+
+    A point displaced by at most its radius stays within that radius of its
+    original location, so a buffer of twice the radius around the displaced
+    point contains the disk of the radius around the original one, and the k
+    reference points in it.
+
+    :param radius: k-anonymity radius of each point, which is also the
+        maximum displacement.
+    :type radius: numpy.ndarray
+
+    :return: Buffer radius of each point.
+    :rtype: numpy.ndarray
+    """
+    return 2.0 * np.asarray(radius, dtype=float)
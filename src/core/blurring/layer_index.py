@@ -22,42 +22,215 @@
 """
 
 from builtins import object
-from qgis.core import QgsSpatialIndex, QgsFeatureRequest, QgsGeometry, Qgis
+from collections import OrderedDict
+import os
+import threading
+
+import numpy as np
+from qgis.core import (
+    QgsFeatureRequest,
+    QgsGeometry,
+    QgsRectangle,
+    QgsSpatialIndex,
+)
+
+from geopublichealth.src.core.gis.point_in_polygon import (
+    PointInPolygonAssigner,
+    layer_fingerprint,
+)
 
 
 class LayerIndex(object):
-    """Check an intersection between a QgsGeometry and a QgsVectorLayer."""
+    """Check an intersection between a QgsGeometry and a QgsVectorLayer.
+
+    Geometries are read once and kept in the spatial index. Each geometry
+    is prepared with a QgsGeometryEngine the first time it is tested, so
+    repeated tests against the same polygons do not read the layer again.
+    With an extent, only the features intersecting it are read.
+    """
 
-    def __init__(self, layer):
+    def __init__(self, layer, extent=None):
         self.__layer = layer
+        self.__engines = {}
+        self.extent = extent
 
-        if Qgis.QGIS_VERSION_INT >= 20700:
-            self.__index = QgsSpatialIndex(layer.getFeatures())
-        else:
-            self.__index = QgsSpatialIndex()
-            for ft in layer.getFeatures():
-                self.__index.insertFeature(ft)
+        request = QgsFeatureRequest().setNoAttributes()
+        if extent is not None:
+            request.setFilterRect(extent)
+        self.__index = QgsSpatialIndex(
+            layer.getFeatures(request),
+            flags=QgsSpatialIndex.FlagStoreFeatureGeometries)
+
+    def copy(self):
+        """Return an index sharing the geometries, with its own engines.
+
+        Prepared engines are not shared between threads, each worker should
+        use its own copy.
+        """
+        index = LayerIndex.__new__(LayerIndex)
+        index.__layer = self.__layer
+        index.__engines = {}
+        index.__index = QgsSpatialIndex(self.__index)
+        index.extent = self.extent
+        return index
+
+    def geometry(self, feature_id):
+        """Return the cached geometry of a feature."""
+        return self.__index.geometry(feature_id)
+
+    def engine(self, feature_id):
+        """Return the prepared geometry engine of a feature."""
+        engine = self.__engines.get(feature_id)
+        if engine is None:
+            engine = QgsGeometry.createGeometryEngine(
+                self.geometry(feature_id).constGet())
+            engine.prepareGeometry()
+            self.__engines[feature_id] = engine
+        return engine
 
     def contains(self, point):
         """Return true if the point intersects the layer."""
         intersects = self.__index.intersects(point.boundingBox())
         for i in intersects:
-            request = QgsFeatureRequest().setFilterFid(i)
-            feat = next(self.__layer.getFeatures(request))
-            if point.intersects(QgsGeometry(feat.geometry())):
+            if self.engine(i).intersects(point.constGet()):
                 return True
         return False
 
+    def contains_many(self, points):
+        """Return, for each point, true if it intersects the layer.
+
+        Points are sorted once and each candidate polygon is tested against
+        the points of its bounding box only, with its prepared geometry.
+
+        :param points: (n, 2) point coordinates.
+        :type points: numpy.ndarray
+
+        :return: Boolean array.
+        :rtype: numpy.ndarray
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        finite = np.isfinite(points).all(axis=1)
+        if not finite.any():
+            return np.zeros(len(points), dtype=bool)
+
+        x_min, y_min = points[finite].min(axis=0)
+        x_max, y_max = points[finite].max(axis=0)
+        assigner = PointInPolygonAssigner(points)
+        extent = QgsRectangle(x_min, y_min, x_max, y_max)
+        for position, i in enumerate(self.__index.intersects(extent)):
+            assigner.assign(position, self.geometry(i), engine=self.engine(i))
+        return assigner.assignment >= 0
+
+    def clip(self, geometry):
+        """Return the part of the geometry inside the layer.
+
+        The geometry itself is returned when a single polygon contains it,
+        None when it does not intersect the layer.
+        """
+        intersects = self.__index.intersects(geometry.boundingBox())
+        parts = []
+        for i in intersects:
+            engine = self.engine(i)
+            if engine.contains(geometry.constGet()):
+                return geometry
+            if engine.intersects(geometry.constGet()):
+                parts.append(geometry.intersection(self.geometry(i)))
+        if not parts:
+            return None
+        if len(parts) == 1:
+            return parts[0]
+        return QgsGeometry.unaryUnion(parts)
+
     def count_intersection(self, buffer_geom, nb):
         """Return true if the buffer intersects enough entities."""
         count = 0
         intersects = self.__index.intersects(buffer_geom.boundingBox())
-        for i in intersects:
-            request = QgsFeatureRequest().setFilterFid(i)
-            feat = next(self.__layer.getFeatures(request))
+        if not intersects:
+            return False
 
-            if buffer_geom.intersects(QgsGeometry(feat.geometry())):
+        # The buffer changes on each call: prepare it instead of the layer.
+        engine = QgsGeometry.createGeometryEngine(buffer_geom.constGet())
+        engine.prepareGeometry()
+        for i in intersects:
+            if engine.intersects(self.geometry(i).constGet()):
                 count += 1
                 if count >= nb:
                     return True
         return False
+
+
+class LayerIndexCache(object):
+    """Keep the last envelope indexes, keyed on the layer and the extent.
+
+    An index built over an extent is reused for any extent inside it, and
+    an index of the whole layer for any extent. Running the blurring again
+    on unchanged layers then skips reading the envelope. Each call returns
+    a copy, so runs in different threads do not share the geometry engines.
+
+    Only layers whose content is stamped by a file are cached: edits in the
+    edit buffer, memory layers and database layers change without changing
+    the fingerprint of the layer, their index is built on each call.
+    """
+
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @staticmethod
+    def cacheable(layer):
+        """Return true if the index of the layer can be reused.
+
+        :param layer: The envelope QgsVectorLayer.
+        """
+        path = layer.source().split("|")[0]
+        return os.path.isfile(path) and not layer.isModified()
+
+    def get(self, layer, extent=None):
+        """Return an index of the layer covering the extent, built if needed.
+
+        :param layer: The envelope QgsVectorLayer.
+
+        :param extent: Area of the points to blur, grown by the radius, or
+            None for the whole layer.
+        :type extent: QgsRectangle
+
+        :rtype: LayerIndex
+        """
+        if not self.cacheable(layer):
+            return LayerIndex(layer, extent)
+
+        fingerprint = layer_fingerprint(layer)
+        with self.__lock:
+            for key in reversed(self.__entries):
+                if key[0] != fingerprint:
+                    continue
+                cached_extent = self.__entries[key].extent
+                if cached_extent is None or (
+                        extent is not None and cached_extent.contains(extent)):
+                    self.__entries.move_to_end(key)
+                    return self.__entries[key].copy()
+
+        index = LayerIndex(layer, extent)
+        if extent is None:
+            key = (fingerprint, None)
+        else:
+            key = (fingerprint, extent.toString())
+        with self.__lock:
+            self.__entries[key] = index
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+        return index.copy()
+
+    def clear(self):
+        """Drop all the cached indexes."""
+        with self.__lock:
+            self.__entries.clear()
+
+
+# Envelope indexes of the session, shared by the dialog and Processing.
+LAYER_INDEX_CACHE = LayerIndexCache()
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+
+# Segments per quarter circle of the blurred buffers, as in Blur.blur.
+BUFFER_SEGMENTS = 20
+
+_WKB_POLYGON = 3
+
+_MASK_64 = (1 << 64) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _splitmix64(value: int) -> int:
+    """SplitMix64 finalizer of a 64 bits integer."""
+    value = (value + _GOLDEN_GAMMA) & _MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return value ^ (value >> 31)
+
+
+class FeatureRandom(object):
+    """Counter-based random stream of one feature.
+
+    The n-th number only depends on the seed, the feature id and n, so
+    features can be blurred in any order, or concurrently, with the same
+    result. The ``uniform`` method mirrors ``random.uniform``.
+    """
+
+    def __init__(self, seed: int, feature_id: int):
+        self.__key = _splitmix64(_splitmix64(seed & _MASK_64) ^ (feature_id & _MASK_64))
+        self.__counter = 0
+
+    def random(self) -> float:
+        """Next number in [0, 1), with 53 random bits."""
+        self.__counter += 1
+        value = _splitmix64((self.__key + self.__counter * _GOLDEN_GAMMA) & _MASK_64)
+        return (value >> 11) * 2.0**-53
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * self.random()
+
+
+def random_offsets(rng, radius) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw one random offset per radius, in a single call per coordinate.
+
+    The angle and the distance are uniform, as in
+    ``Blur.random_point_around_geom_point``.
+
+    :param rng: A ``numpy.random.Generator``.
+
+    :param radius: Maximum distance of each offset.
+    :type radius: numpy.ndarray
+
+    :return: x and y offsets.
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+    radius = np.asarray(radius, dtype=float).reshape(-1)
+    angle = rng.uniform(0.0, 2 * np.pi, len(radius))
+    distance = rng.uniform(0.0, 1.0, len(radius)) * radius
+    return distance * np.cos(angle), distance * np.sin(angle)
+
+
+def donut_offsets(rng, min_radius, max_radius) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw one area-uniform offset per radius, between two distances.
+
+    The distance is ``sqrt(u * (max_radius ** 2 - min_radius ** 2) +
+    min_radius ** 2)``, so the offsets are uniform over the ring and never
+    shorter than ``min_radius``.
+
+    :param rng: A ``numpy.random.Generator``.
+
+    :param min_radius: Minimum distance of every offset, or of each one.
+    :type min_radius: float or numpy.ndarray
+
+    :param max_radius: Maximum distance of each offset.
+    :type max_radius: numpy.ndarray
+
+    :return: x and y offsets.
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+    max_radius = np.asarray(max_radius, dtype=float).reshape(-1)
+    min_radius = np.broadcast_to(np.asarray(min_radius, dtype=float), max_radius.shape)
+    angle = rng.uniform(0.0, 2 * np.pi, len(max_radius))
+    distance = np.sqrt(
+        rng.uniform(0.0, 1.0, len(max_radius)) * (max_radius**2 - min_radius**2)
+        + min_radius**2
+    )
+    return distance * np.cos(angle), distance * np.sin(angle)
+
+
+def circle_template(segments: int = BUFFER_SEGMENTS) -> np.ndarray:
+    """Closed unit circle ring, clockwise from (1, 0) like a GEOS buffer.
+
+    :param segments: Segments per quarter circle.
+    :type segments: int
+
+    :return: (4 * segments + 1, 2) coordinates.
+    :rtype: numpy.ndarray
+    """
+    angles = -np.linspace(0.0, 2 * np.pi, 4 * segments + 1)
+    ring = np.column_stack((np.cos(angles), np.sin(angles)))
+    ring[-1] = ring[0]
+    return ring
+
+
+def circle_polygons_wkb(x, y, radius, template: np.ndarray) -> List[bytes]:
+    """Translate and scale a ring template into one WKB polygon per center.
+
+    The WKB of the whole batch is built as one NumPy record array, so no
+    geometry operation is needed per polygon.
+
+    :param x: x coordinates of the centers.
+    :type x: numpy.ndarray
+
+    :param y: y coordinates of the centers.
+    :type y: numpy.ndarray
+
+    :param radius: Radius of every polygon, or of each one.
+    :type radius: float or numpy.ndarray
+
+    :param template: Closed unit ring, see ``circle_template``.
+    :type template: numpy.ndarray
+
+    :return: Little endian WKB of each polygon.
+    :rtype: List[bytes]
+    """
+    x = np.asarray(x, dtype=float).reshape(-1, 1, 1)
+    y = np.asarray(y, dtype=float).reshape(-1, 1, 1)
+    radius = np.asarray(radius, dtype=float)
+    if radius.ndim:
+        radius = radius.reshape(-1, 1, 1)
+
+    vertex_count = len(template)
+    record = np.dtype(
+        [
+            ("byte_order", "u1"),
+            ("geometry_type", "<u4"),
+            ("ring_count", "<u4"),
+            ("vertex_count", "<u4"),
+            ("coordinates", "<f8", (vertex_count, 2)),
+        ]
+    )
+    records = np.empty(len(x), dtype=record)
+    records["byte_order"] = 1
+    records["geometry_type"] = _WKB_POLYGON
+    records["ring_count"] = 1
+    records["vertex_count"] = vertex_count
+    records["coordinates"] = template * radius + np.concatenate((x, y), axis=2)
+
+    data = records.tobytes()
+    size = record.itemsize
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+def sample_in_disk(radius: float, uniforms) -> Tuple[float, float]:
+    """Area-uniform offset inside a disk, from two uniform numbers in [0, 1)."""
+    distance = radius * np.sqrt(uniforms[0])
+    angle = 2 * np.pi * uniforms[1]
+    return distance * np.cos(angle), distance * np.sin(angle)
+
+
+def sample_in_donut(
+    min_radius: float, max_radius: float, uniforms
+) -> Tuple[float, float]:
+    """Area-uniform offset between two distances, see ``donut_offsets``."""
+    distance = np.sqrt(uniforms[0] * (max_radius**2 - min_radius**2) + min_radius**2)
+    angle = 2 * np.pi * uniforms[1]
+    return distance * np.cos(angle), distance * np.sin(angle)
+
+
+def _open_ring(ring) -> np.ndarray:
+    """Ring coordinates without closing point nor repeated vertices."""
+    coordinates = np.asarray(ring, dtype=float).reshape(-1, 2)
+    if len(coordinates) > 1:
+        repeated = (coordinates == np.roll(coordinates, 1, axis=0)).all(axis=1)
+        coordinates = coordinates[~repeated]
+    return coordinates
+
+
+def _signed_area(coordinates: np.ndarray) -> float:
+    x, y = coordinates[:, 0], coordinates[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def _segments_cross(p1, p2, q1, q2) -> bool:
+    """True if two segments cross, touching at an end point excluded."""
+
+    def side(a, b, c):
+        return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+    if p1 in (q1, q2) or p2 in (q1, q2):
+        return False
+    d1 = side(q1, q2, p1)
+    d2 = side(q1, q2, p2)
+    d3 = side(p1, p2, q1)
+    d4 = side(p1, p2, q2)
+    return d1 * d2 < 0 and d3 * d4 < 0
+
+
+def _bridge_hole(outer: list, hole: list, others: List[list]) -> list:
+    """Merge a hole into the outer ring through a visible bridge."""
+    start = max(range(len(hole)), key=lambda index: hole[index])
+    corner = hole[start]
+    rings = [outer, hole] + others
+    edges = [
+        (ring[index - 1], ring[index]) for ring in rings for index in range(len(ring))
+    ]
+    candidates = sorted(
+        range(len(outer)),
+        key=lambda index: (outer[index][0] - corner[0]) ** 2
+        + (outer[index][1] - corner[1]) ** 2,
+    )
+    bridge = candidates[0]
+    for index in candidates:
+        if not any(
+            _segments_cross(corner, outer[index], first, second)
+            for first, second in edges
+        ):
+            bridge = index
+            break
+    return outer[: bridge + 1] + hole[start:] + hole[: start + 1] + outer[bridge:]
+
+
+def _ear_clip(points: np.ndarray) -> List[np.ndarray]:
+    """Triangulate a counter-clockwise simple ring by ear clipping."""
+    remaining = list(range(len(points)))
+    triangles = []
+    position = 0
+    while len(remaining) > 3:
+        count = len(remaining)
+        ear = None
+        flattest = None
+        for offset in range(count):
+            middle = (position + offset) % count
+            a = points[remaining[middle - 1]]
+            b = points[remaining[middle]]
+            c = points[remaining[(middle + 1) % count]]
+            cross = (b[0] - a[0]) * (c[1] - b[1]) - (b[1] - a[1]) * (c[0] - b[0])
+            if flattest is None or abs(cross) < flattest[1]:
+                flattest = (middle, abs(cross))
+            if cross <= 0:
+                continue
+
+            others = points[remaining]
+            coincident = (
+                (others == a).all(axis=1)
+                | (others == b).all(axis=1)
+                | (others == c).all(axis=1)
+            )
+            inside = np.ones(len(others), dtype=bool)
+            for first, second in ((a, b), (b, c), (c, a)):
+                edge = second - first
+                relative = others - first
+                inside &= edge[0] * relative[:, 1] - edge[1] * relative[:, 0] >= 0
+            if not (inside & ~coincident).any():
+                ear = middle
+                break
+
+        if ear is None:
+            # Degenerate ring: drop the flattest vertex to keep going.
+            del remaining[flattest[0]]
+            position = flattest[0] % len(remaining)
+            continue
+
+        triangles.append(
+            points[[remaining[ear - 1], remaining[ear], remaining[(ear + 1) % count]]]
+        )
+        del remaining[ear]
+        position = ear % len(remaining)
+
+    if len(remaining) == 3:
+        triangles.append(points[remaining])
+    return triangles
+
+
+def triangulate_polygon(rings) -> np.ndarray:
+    """Split a polygon, holes included, into triangles.
+
+    Holes are merged into the exterior ring through bridges, then the ring
+    is triangulated by ear clipping.
+
+    :param rings: Exterior ring then holes, as sequences of (x, y).
+    :type rings: list
+
+    :return: (t, 3, 2) triangle coordinates.
+    :rtype: numpy.ndarray
+    """
+    rings = [_open_ring(ring) for ring in rings]
+    if not rings or len(rings[0]) < 3:
+        return np.empty((0, 3, 2))
+
+    outer = rings[0]
+    if _signed_area(outer) < 0:
+        outer = outer[::-1]
+    holes = []
+    for hole in rings[1:]:
+        if len(hole) < 3:
+            continue
+        if _signed_area(hole) > 0:
+            hole = hole[::-1]
+        holes.append([tuple(point) for point in hole.tolist()])
+
+    merged = [tuple(point) for point in outer.tolist()]
+    holes.sort(key=lambda hole: max(hole)[0], reverse=True)
+    for index, hole in enumerate(holes):
+        merged = _bridge_hole(merged, hole, holes[index + 1 :])
+
+    triangles = _ear_clip(np.array(merged, dtype=float))
+    if not triangles:
+        return np.empty((0, 3, 2))
+    return np.array(triangles, dtype=float)
+
+
+def triangle_areas(triangles: np.ndarray) -> np.ndarray:
+    """Area of each (3, 2) triangle."""
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    return 0.5 * np.abs(
+        (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1])
+        - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    )
+
+
+def sample_in_triangles(triangles: np.ndarray, uniforms) -> Tuple[float, float]:
+    """Area-uniform point inside a set of triangles.
+
+    A triangle is picked with a probability proportional to its area, then
+    a point is drawn uniformly inside it.
+
+    :param triangles: (t, 3, 2) triangle coordinates.
+    :type triangles: numpy.ndarray
+
+    :param uniforms: Three uniform numbers in [0, 1).
+
+    :return: The point, None if the triangles have no area.
+    :rtype: Tuple[float, float]
+    """
+    areas = triangle_areas(triangles) if len(triangles) else np.empty(0)
+    total = areas.sum()
+    if not total > 0:
+        return None
+
+    cumulative = np.cumsum(areas)
+    index = min(
+        int(np.searchsorted(cumulative, uniforms[0] * total, side="right")),
+        len(triangles) - 1,
+    )
+    s, t = uniforms[1], uniforms[2]
+    if s + t > 1:
+        s, t = 1 - s, 1 - t
+    a, b, c = triangles[index]
+    point = a + s * (b - a) + t * (c - a)
+    return float(point[0]), float(point[1])
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import csv
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+
+class Diagnostics(object):
+    """Collect data issues by category instead of logging each of them.
+
+    Every offending feature id is kept, so they can be exported, but the
+    summary only quotes the first examples of each category.
+    """
+
+    def __init__(self, max_examples: int = 10):
+        """Constructor.
+
+        :param max_examples: Feature ids quoted per category in the summary.
+        :type max_examples: int
+        """
+        self.max_examples = max_examples
+        self.__issues = OrderedDict()
+
+    def add(self, category: str, feature_id, value=None):
+        """Record one issue.
+
+        :param category: Kind of issue, e.g. "invalid_case".
+        :type category: str
+
+        :param feature_id: Id of the offending feature.
+
+        :param value: Optional offending value, exported in the CSV.
+        """
+        self.__issues.setdefault(category, []).append((feature_id, value))
+
+    def add_many(self, category: str, feature_ids: Iterable):
+        """Record one issue for each of the given feature ids."""
+        issues = [(feature_id, None) for feature_id in feature_ids]
+        if issues:
+            self.__issues.setdefault(category, []).extend(issues)
+
+    def __len__(self) -> int:
+        return sum(len(issues) for issues in self.__issues.values())
+
+    def categories(self) -> List[str]:
+        """Categories with at least one issue, in recording order."""
+        return list(self.__issues)
+
+    def count(self, category: str) -> int:
+        """Number of issues of a category."""
+        return len(self.__issues.get(category, []))
+
+    def examples(self, category: str) -> list:
+        """First feature ids of a category."""
+        issues = self.__issues.get(category, [])
+        return [feature_id for feature_id, __ in issues[: self.max_examples]]
+
+    def summary(self, labels: Optional[Dict[str, str]] = None) -> List[str]:
+        """One line per category: label, count and example feature ids.
+
+        :param labels: Optional readable label of each category.
+        :type labels: dict
+
+        :return: Summary lines.
+        :rtype: List[str]
+        """
+        labels = labels or {}
+        lines = []
+        for category in self.__issues:
+            count = self.count(category)
+            examples = ", ".join(str(item) for item in self.examples(category))
+            if count > self.max_examples:
+                examples += ", ..."
+            lines.append(
+                "{}: {} ({})".format(labels.get(category, category), count, examples)
+            )
+        return lines
+
+    def write_csv(self, path: str):
+        """Write every issue to a CSV file (category, feature_id, value)."""
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(("category", "feature_id", "value"))
+            for category, issues in self.__issues.items():
+                for feature_id, value in issues:
+                    writer.writerow(
+                        (category, feature_id, "" if value is None else value)
+                    )
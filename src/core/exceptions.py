@@ -69,6 +69,16 @@ class PointOutsideEnvelopeException(GeoPublicHealthException):
         GeoPublicHealthException.__init__(self, msg)
 
 
+class MinimumDisplacementException(GeoPublicHealthException):
+    def __init__(self, msg=None, number=None):
+        if not msg:
+            msg = tr(
+                "Point number %d can not be moved by the minimum displacement "
+                "inside the envelope." % number
+            )
+        GeoPublicHealthException.__init__(self, msg)
+
+
 class DifferentCrsException(GeoPublicHealthException):
     def __init__(self, msg=None, epsg1=None, epsg2=None):
         if not msg:
@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from qgis.core import QgsFeatureRequest, QgsGeometry, QgsPoint
+except ImportError:
+    QgsFeatureRequest = None
+    QgsGeometry = None
+    QgsPoint = None
+
+
+def _point_coordinates(geometry) -> Tuple[float, float]:
+    """Coordinates of a point (first point of a multipoint), NaN if empty."""
+    if geometry is None or geometry.isNull() or geometry.isEmpty():
+        return np.nan, np.nan
+    if geometry.isMultipart():
+        point = geometry.asMultiPoint()[0]
+    else:
+        point = geometry.asPoint()
+    return point.x(), point.y()
+
+
+def read_point_coordinates(source) -> Tuple[np.ndarray, np.ndarray]:
+    """Read the coordinates of a point layer in a single pass.
+
+    Attributes are not fetched. Multipoint features are located by their
+    first point, features without geometry get NaN coordinates.
+
+    :param source: A QgsVectorLayer or any QgsFeatureSource.
+
+    :return: Feature ids and (n, 2) coordinates, in iteration order.
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+    if QgsFeatureRequest is None:
+        raise ImportError("QGIS core is required to read layer geometries")
+
+    fids = []
+    coordinates = []
+    request = QgsFeatureRequest().setNoAttributes()
+    for feature in source.getFeatures(request):
+        fids.append(feature.id())
+        coordinates.append(_point_coordinates(feature.geometry()))
+
+    return (
+        np.array(fids, dtype=np.int64),
+        np.array(coordinates, dtype=float).reshape(-1, 2),
+    )
+
+
+def read_point_records(source, field_name: str) -> Tuple[np.ndarray, np.ndarray, list]:
+    """Read the coordinates and one attribute of a point layer in one pass.
+
+    :param source: A QgsVectorLayer or any QgsFeatureSource.
+
+    :param field_name: Name of the attribute.
+    :type field_name: str
+
+    :return: Feature ids, (n, 2) coordinates and values, in iteration order.
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray, list]
+    """
+    if QgsFeatureRequest is None:
+        raise ImportError("QGIS core is required to read layer geometries")
+
+    fids = []
+    coordinates = []
+    values = []
+    request = QgsFeatureRequest().setSubsetOfAttributes([field_name], source.fields())
+    for feature in source.getFeatures(request):
+        fids.append(feature.id())
+        coordinates.append(_point_coordinates(feature.geometry()))
+        values.append(feature[field_name])
+
+    return (
+        np.array(fids, dtype=np.int64),
+        np.array(coordinates, dtype=float).reshape(-1, 2),
+        values,
+    )
+
+
+def read_point_values(source, field_name: str) -> Tuple[np.ndarray, list]:
+    """Read the values of one attribute of a layer, without geometries.
+
+    :param source: A QgsVectorLayer or any QgsFeatureSource.
+
+    :param field_name: Name of the attribute.
+    :type field_name: str
+
+    :return: Feature ids and values, in iteration order.
+    :rtype: Tuple[numpy.ndarray, list]
+    """
+    if QgsFeatureRequest is None:
+        raise ImportError("QGIS core is required to read layer attributes")
+
+    request = QgsFeatureRequest().setFlags(QgsFeatureRequest.NoGeometry)
+    request.setSubsetOfAttributes([field_name], source.fields())
+    fids = []
+    values = []
+    for feature in source.getFeatures(request):
+        fids.append(feature.id())
+        values.append(feature[field_name])
+    return np.array(fids, dtype=np.int64), values
+
+
+def category_codes(
+    values: Iterable, selected: Optional[Iterable] = None
+) -> Tuple[np.ndarray, List[str]]:
+    """Code category values as integers, values being compared as text.
+
+    :param values: Category of each point, None or NULL when missing.
+    :type values: Iterable
+
+    :param selected: Categories to keep, in output order. Every category
+        found, sorted, if None.
+    :type selected: Iterable
+
+    :return: Code of each point (-1 when missing or not selected) and the
+        label of each code.
+    :rtype: Tuple[numpy.ndarray, List[str]]
+    """
+    labels = [
+        None
+        if value is None or (hasattr(value, "isNull") and value.isNull())
+        else str(value)
+        for value in values
+    ]
+    if selected is None:
+        categories = sorted(set(label for label in labels if label is not None))
+    else:
+        categories = list(OrderedDict.fromkeys(str(value) for value in selected))
+
+    lookup = {label: code for code, label in enumerate(categories)}
+    codes = np.array([lookup.get(label, -1) for label in labels], dtype=np.int64)
+    return codes, categories
+
+
+def category_counts(
+    assignment, codes, polygon_count: int, category_count: int
+) -> np.ndarray:
+    """Count the points of each category in each polygon, in a single pass.
+
+    :param assignment: Polygon position of each point, -1 if outside.
+    :type assignment: numpy.ndarray
+
+    :param codes: Category code of each point, -1 to skip the point.
+    :type codes: numpy.ndarray
+
+    :return: (polygons, categories) counts.
+    :rtype: numpy.ndarray
+    """
+    assignment = np.asarray(assignment, dtype=np.int64)
+    codes = np.asarray(codes, dtype=np.int64)
+    if len(assignment) != len(codes):
+        raise ValueError("One category code is required per point.")
+
+    valid = (assignment >= 0) & (codes >= 0)
+    keys = assignment[valid] * category_count + codes[valid]
+    counts = np.bincount(keys, minlength=polygon_count * category_count)
+    return counts.reshape(polygon_count, category_count)
+
+
+class PointInPolygonAssigner(object):
+    """Assign points to the polygons containing them, one polygon at a time.
+
+    Points are sorted once along x, so the candidates of a polygon are found
+    with a binary search on its bounding box instead of a feature request.
+    Each polygon is prepared once with ``QgsGeometryEngine`` and each point
+    belongs to at most one polygon: the first one containing it (points on
+    a shared boundary are not counted twice).
+    """
+
+    def __init__(self, coordinates):
+        """Constructor.
+
+        :param coordinates: (n, 2) point coordinates, NaN for empty points.
+        :type coordinates: numpy.ndarray
+        """
+        self.coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        valid = np.flatnonzero(np.isfinite(self.coordinates).all(axis=1))
+        self.__order = valid[np.argsort(self.coordinates[valid, 0], kind="stable")]
+        self.__sorted_x = self.coordinates[self.__order, 0]
+
+        # Position of the polygon of each point, -1 when outside all of them.
+        self.assignment = np.full(len(self.coordinates), -1, dtype=np.int64)
+
+    def candidates(self, x_min, y_min, x_max, y_max, unassigned=True):
+        """Points inside a rectangle, boundary included.
+
+        :param unassigned: Skip the points already assigned to a polygon.
+        :type unassigned: bool
+
+        :return: Point positions.
+        :rtype: numpy.ndarray
+        """
+        start = np.searchsorted(self.__sorted_x, x_min, side="left")
+        end = np.searchsorted(self.__sorted_x, x_max, side="right")
+        points = self.__order[start:end]
+        y_values = self.coordinates[points, 1]
+        points = points[(y_values >= y_min) & (y_values <= y_max)]
+        if unassigned:
+            points = points[self.assignment[points] == -1]
+        return points
+
+    def hits(self, geometry, unassigned=False, engine=None) -> np.ndarray:
+        """Points intersecting a polygon, tested with a prepared engine.
+
+        Without ``unassigned``, the assignment is not read, so several
+        threads can look for the points of different polygons at once.
+
+        :param geometry: The polygon.
+        :type geometry: QgsGeometry
+
+        :param unassigned: Skip the points already assigned to a polygon.
+        :type unassigned: bool
+
+        :param engine: Optional prepared QgsGeometryEngine of the polygon,
+            created for this call if None.
+
+        :return: Point positions.
+        :rtype: numpy.ndarray
+        """
+        empty = np.empty(0, dtype=np.int64)
+        if geometry is None or geometry.isNull() or geometry.isEmpty():
+            return empty
+
+        box = geometry.boundingBox()
+        points = self.candidates(
+            box.xMinimum(),
+            box.yMinimum(),
+            box.xMaximum(),
+            box.yMaximum(),
+            unassigned=unassigned,
+        )
+        if not len(points):
+            return empty
+
+        if engine is None:
+            engine = QgsGeometry.createGeometryEngine(geometry.constGet())
+            engine.prepareGeometry()
+        inside = [
+            point
+            for point, (x, y) in zip(
+                points.tolist(), self.coordinates[points].tolist()
+            )
+            if engine.intersects(QgsPoint(x, y))
+        ]
+        return np.array(inside, dtype=np.int64)
+
+    def assign_points(self, position: int, points) -> int:
+        """Assign the given points to a polygon, unless already assigned.
+
+        :return: Number of points assigned to this polygon.
+        :rtype: int
+        """
+        points = np.asarray(points, dtype=np.int64)
+        points = points[self.assignment[points] == -1]
+        self.assignment[points] = position
+        return len(points)
+
+    def assign(self, position: int, geometry, engine=None) -> int:
+        """Assign the unassigned points intersecting a polygon.
+
+        :param position: Position of the polygon, stored in the assignment.
+        :type position: int
+
+        :param geometry: The polygon.
+        :type geometry: QgsGeometry
+
+        :param engine: Optional prepared QgsGeometryEngine of the polygon.
+
+        :return: Number of points assigned to this polygon.
+        :rtype: int
+        """
+        return self.assign_points(
+            position, self.hits(geometry, unassigned=True, engine=engine)
+        )
+
+    def counts(self, polygon_count: int) -> np.ndarray:
+        """Number of points assigned to each polygon position."""
+        assigned = self.assignment[self.assignment >= 0]
+        return np.bincount(assigned, minlength=polygon_count)
+
+
+def assign_points_to_polygons(polygon_source, point_source, feedback=None):
+    """Assign every point of a layer to its polygon in a single pass.
+
+    :param polygon_source: Polygon QgsVectorLayer or QgsFeatureSource.
+
+    :param point_source: Point QgsVectorLayer or QgsFeatureSource, in the
+        same CRS as the polygons.
+
+    :param feedback: Optional object with an ``isCanceled`` method (a
+        QgsTask or QgsFeedback), polled between polygons.
+
+    :return: "counts" (points per polygon), "polygon_fids", "point_fids"
+        and "assignment" (polygon position of each point, -1 if outside).
+        None if cancelled.
+    :rtype: dict
+    """
+    if QgsFeatureRequest is None:
+        raise ImportError("QGIS core is required to read layer geometries")
+
+    point_fids, coordinates = read_point_coordinates(point_source)
+    assigner = PointInPolygonAssigner(coordinates)
+
+    polygon_fids = []
+    request = QgsFeatureRequest().setNoAttributes()
+    for position, feature in enumerate(polygon_source.getFeatures(request)):
+        if feedback is not None and feedback.isCanceled():
+            return None
+        polygon_fids.append(feature.id())
+        assigner.assign(position, feature.geometry())
+
+    return {
+        "counts": assigner.counts(len(polygon_fids)),
+        "polygon_fids": np.array(polygon_fids, dtype=np.int64),
+        "point_fids": point_fids,
+        "assignment": assigner.assignment,
+    }
+
+
+def layer_fingerprint(layer) -> tuple:
+    """Identify the content of a layer, to reuse results computed from it.
+
+    The fingerprint changes with the source, the subset filter, the feature
+    count and, for file based layers, the size and modification time of the
+    file (and of its GeoPackage/SQLite write-ahead log).
+
+    :param layer: A QgsVectorLayer.
+
+    :rtype: tuple
+    """
+    source = layer.source()
+    stamps = []
+    path = source.split("|")[0]
+    for file_path in (path, path + "-wal"):
+        if os.path.isfile(file_path):
+            stat = os.stat(file_path)
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+    return (
+        layer.providerType(),
+        source,
+        layer.subsetString(),
+        layer.featureCount(),
+        tuple(stamps),
+    )
+
+
+class AssignmentCache(object):
+    """Keep the last point to polygon assignments, keyed on both layers.
+
+    Entries are the assignment results (see ``assign_points_to_polygons``):
+    re-running an analysis on unchanged layers then skips the spatial join.
+    The least recently used entry is dropped when the cache is full.
+    """
+
+    def __init__(self, max_entries: int = 4):
+        """Constructor.
+
+        :param max_entries: Number of assignments kept.
+        :type max_entries: int
+        """
+        self.max_entries = max_entries
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key, polygon_fids=None) -> Optional[dict]:
+        """Cached assignment, None if missing.
+
+        :param key: Fingerprints of the polygon and point layers.
+        :type key: tuple
+
+        :param polygon_fids: Optional polygon ids in iteration order, the
+            entry is only returned if they match the cached ones.
+        :type polygon_fids: Iterable
+
+        :return: "counts", "polygon_fids", "point_fids" and "assignment".
+        :rtype: dict
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            self.__entries.move_to_end(key)
+
+        if polygon_fids is not None and not np.array_equal(
+            entry["polygon_fids"], np.asarray(polygon_fids, dtype=np.int64)
+        ):
+            return None
+        return entry
+
+    def put(self, key, polygon_fids, counts, point_fids, assignment):
+        """Store an assignment, arrays are copied."""
+        entry = {
+            "counts": np.array(counts, dtype=np.int64),
+            "polygon_fids": np.array(polygon_fids, dtype=np.int64),
+            "point_fids": np.array(point_fids, dtype=np.int64),
+            "assignment": np.array(assignment, dtype=np.int64),
+        }
+        with self.__lock:
+            self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached assignment."""
+        with self.__lock:
+            self.__entries.clear()
@@ -21,7 +21,9 @@
  ***************************************************************************/
 """
 
-from typing import Dict, Iterable, Optional, Tuple
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
 
 try:
     import libpysal
@@ -154,3 +156,575 @@ def moran_rate(
         events, population, weights, permutations=permutations
     )
     return global_rate, local_rate
+
+
+BATCH_STATISTICS = ("moran", "g_local", "geary")
+
+ProgressCallback = Optional[Callable[[int, int], None]]
+CancelCallback = Optional[Callable[[], bool]]
+
+# Upper bound (in float64 values) of the simulated lags held in memory at once.
+PERMUTATION_CHUNK_VALUES = 4000000
+
+
+def _as_sparse(weights, star: bool = False):
+    """Return the row-standardized CSR matrix of W (or W + I for star)."""
+    try:
+        from scipy import sparse
+    except ImportError as exc:
+        raise ImportError("scipy is required for batch autocorrelation") from exc
+
+    matrix = weights.sparse if hasattr(weights, "sparse") else weights
+    matrix = sparse.csr_matrix(matrix, dtype=float)
+    matrix.setdiag(1.0 if star else 0.0)
+    matrix.eliminate_zeros()
+
+    row_sums = np.asarray(matrix.sum(axis=1)).ravel()
+    scale = np.zeros_like(row_sums)
+    np.divide(1.0, row_sums, out=scale, where=row_sums > 0)
+    return sparse.csr_matrix(sparse.diags(scale) @ matrix)
+
+
+def _split_diagonal(matrix):
+    """Split a CSR matrix into its diagonal and its off-diagonal part."""
+    diagonal = matrix.diagonal()
+    off_diagonal = matrix.copy()
+    off_diagonal.setdiag(0.0)
+    off_diagonal.eliminate_zeros()
+    return diagonal, off_diagonal
+
+
+def _standardize(values: np.ndarray) -> np.ndarray:
+    """Standardize each column with its mean and population std."""
+    std = values.std(axis=0)
+    std[std == 0] = np.nan
+    return (values - values.mean(axis=0)) / std
+
+
+def _randomization_moments(matrix, pool_sum, pool_square_sum, pool_size):
+    """Mean and variance of sum_j w_ij x_j when the x_j are drawn at random.
+
+    Neighbor values are sampled without replacement from a pool of
+    ``pool_size`` values (the other observations), which is the
+    conditional randomization null used by the permutation tests.
+    """
+    w1 = np.asarray(matrix.sum(axis=1)).reshape(-1, 1)
+    w2 = np.asarray(matrix.multiply(matrix).sum(axis=1)).reshape(-1, 1)
+    mean = pool_sum / pool_size
+    variance = np.maximum(pool_square_sum / pool_size - mean**2, 0.0)
+    if pool_size > 1:
+        spread = w2 - (w1**2 - w2) / (pool_size - 1)
+    else:
+        spread = w2
+    return w1 * mean, variance * spread
+
+
+def _z_scores(observed, expected, variance):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_values = (observed - expected) / np.sqrt(variance)
+    # No spread at all (e.g. islands): the observed value is the expected one.
+    z_values[(variance <= 0) & np.isfinite(observed)] = 0.0
+    return z_values
+
+
+def _normal_p_values(z_values):
+    """One-sided (folded) p-values of standard normal z-scores."""
+    try:
+        from scipy.special import ndtr
+    except ImportError as exc:
+        raise ImportError("scipy is required for batch autocorrelation") from exc
+    return ndtr(-np.abs(z_values))
+
+
+def _random_neighbor_lags(matrix, columns, draws):
+    """Yield simulated spatial lags, one cardinality group chunk at a time.
+
+    ``draws`` holds, for each permutation, the positions of random
+    neighbors among the n - 1 other observations. Every unit with k
+    neighbors reuses the first k positions of each draw, shifted to skip the
+    unit itself, so that all columns share the same random neighbors.
+
+    :return: Tuples of (unit ids, lags of shape (units, permutations, columns)).
+    """
+    permutations = draws.shape[0]
+    indptr = matrix.indptr
+    cardinality = np.diff(indptr)
+    budget = max(1, PERMUTATION_CHUNK_VALUES // (permutations * columns.shape[1]))
+
+    for size in np.unique(cardinality):
+        if size == 0:
+            continue
+        units = np.flatnonzero(cardinality == size)
+        for start in range(0, len(units), budget):
+            chunk = units[start : start + budget]
+            weights = matrix.data[indptr[chunk][:, None] + np.arange(size)]
+            lags = np.zeros((len(chunk), permutations, columns.shape[1]))
+            for position in range(size):
+                ids = draws[None, :, position] + (
+                    draws[None, :, position] >= chunk[:, None]
+                )
+                lags += weights[:, position, None, None] * columns[ids]
+            yield chunk, lags
+
+
+def _pseudo_p_values(observed, simulated):
+    """Folded pseudo p-values and z-scores of simulated statistics.
+
+    Missing observed values (NaN) get a NaN p-value and z-score.
+
+    :param observed: Observed values, shape (units, columns).
+    :param simulated: Simulated values, shape (units, permutations, columns).
+    """
+    permutations = simulated.shape[1]
+    larger = (simulated >= observed[:, None, :]).sum(axis=1)
+    larger = np.minimum(larger, permutations - larger)
+    p_values = (larger + 1.0) / (permutations + 1.0)
+    p_values[np.isnan(observed)] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_values = (observed - simulated.mean(axis=1)) / simulated.std(axis=1)
+    return p_values, z_values
+
+
+def batch_local_statistics(
+    values,
+    weights,
+    statistics: Sequence[str] = BATCH_STATISTICS,
+    permutations: int = 0,
+    star: bool = False,
+    seed: Optional[int] = None,
+    progress_callback: ProgressCallback = None,
+    cancel_callback: CancelCallback = None,
+) -> Optional[Dict[str, Dict[str, np.ndarray]]]:
+    """Compute local statistics for many fields sharing one weights object.
+
+    Spatial lags of all the fields are computed at once as a sparse matrix
+    product on row-standardized weights. Statistics follow esda: Local
+    Moran's I (``Moran_Local``), Getis-Ord G (``G_Local``) and Local Geary
+    (``Geary_Local``).
+
+    Without permutations, z-scores use the exact mean and variance of each
+    local statistic under conditional randomization. With permutations, the
+    same random neighbor sets are shared by every field and statistic.
+    P-values are one-sided (folded) in both cases.
+
+    A field with a missing value (NaN) or without variance has NaN results
+    for every unit, p-values and quadrants included.
+
+    :param values: Field values, shape (n, k), one column per field.
+    :type values: array-like
+
+    :param weights: libpysal W or scipy sparse matrix (n, n).
+
+    :param statistics: Any of "moran", "g_local" and "geary".
+    :type statistics: Sequence[str]
+
+    :param permutations: Number of conditional permutations (0: analytic).
+    :type permutations: int
+
+    :param star: Include the unit itself in Getis-Ord G (G*).
+    :type star: bool
+
+    :param seed: Seed of the permutation draws.
+    :type seed: int
+
+    :param progress_callback: Called with (units done, total units) after
+        each permutation chunk.
+    :type progress_callback: Callable
+
+    :param cancel_callback: Polled between permutation chunks, the run
+        stops when it returns True.
+    :type cancel_callback: Callable
+
+    :return: For each statistic, arrays of shape (n, k): "stat", "z" and "p"
+        ("q" with the Moran quadrants, 1 HH, 2 LH, 3 LL, 4 HL, as floats),
+        or None if the run was cancelled.
+    :rtype: Dict[str, Dict[str, numpy.ndarray]]
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    if values.ndim != 2 or not values.size:
+        raise ValueError("Values must be a non-empty (n, k) array.")
+
+    unknown = set(statistics) - set(BATCH_STATISTICS)
+    if unknown or not statistics:
+        raise ValueError(f"Unsupported statistics: {sorted(unknown)}")
+
+    count = values.shape[0]
+    if count < 3:
+        raise ValueError("At least 3 observations are required.")
+
+    matrix = _as_sparse(weights)
+    if matrix.shape != (count, count):
+        raise ValueError("Weights and values sizes must match.")
+    pool_size = count - 1
+
+    results = {}
+    z_scores = _standardize(values)
+    lag_z = matrix @ z_scores
+
+    if "moran" in statistics:
+        scale = pool_size * z_scores / count
+        local_i = scale * lag_z
+        expected, variance = _randomization_moments(
+            matrix, -z_scores, count - z_scores**2, pool_size
+        )
+        z_values = _z_scores(local_i, scale * expected, scale**2 * variance)
+        quadrants = np.where(
+            z_scores > 0, np.where(lag_z > 0, 1.0, 4.0), np.where(lag_z > 0, 2.0, 3.0)
+        )
+        quadrants[np.isnan(local_i)] = np.nan
+        results["moran"] = {
+            "stat": local_i,
+            "z": z_values,
+            "p": _normal_p_values(z_values),
+            "q": quadrants,
+        }
+
+    if "geary" in statistics:
+        w1 = np.asarray(matrix.sum(axis=1)).reshape(-1, 1)
+        lag_square = matrix @ (z_scores**2)
+        local_c = w1 * z_scores**2 - 2 * z_scores * lag_z + lag_square
+
+        # Moments of (z_i - z_j)**2 over the other observations j.
+        power_sums = [(z_scores**power).sum(axis=0) for power in range(5)]
+        others = [total - z_scores**power for power, total in enumerate(power_sums)]
+        pool_sum = (
+            others[0] * z_scores**2 - 2 * z_scores * others[1] + others[2]
+        )
+        pool_square_sum = (
+            others[0] * z_scores**4
+            - 4 * z_scores**3 * others[1]
+            + 6 * z_scores**2 * others[2]
+            - 4 * z_scores * others[3]
+            + others[4]
+        )
+        expected, variance = _randomization_moments(
+            matrix, pool_sum, pool_square_sum, pool_size
+        )
+        z_values = _z_scores(local_c, expected, variance)
+        results["geary"] = {
+            "stat": local_c,
+            "z": z_values,
+            "p": _normal_p_values(z_values),
+        }
+
+    if "g_local" in statistics:
+        g_matrix = _as_sparse(weights, star=True) if star else matrix
+        self_weight, g_random = _split_diagonal(g_matrix)
+        self_weight = self_weight.reshape(-1, 1)
+        total = values.sum(axis=0)
+        if star:
+            denominator = np.broadcast_to(total, values.shape)
+        else:
+            denominator = total - values
+        fixed = self_weight * values
+        lag_x = fixed + g_random @ values
+        expected, variance = _randomization_moments(
+            g_random, total - values, (values**2).sum(axis=0) - values**2, pool_size
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            local_g = lag_x / denominator
+        z_values = _z_scores(lag_x, fixed + expected, variance)
+        results["g_local"] = {
+            "stat": local_g,
+            "z": z_values,
+            "p": _normal_p_values(z_values),
+        }
+
+    if permutations:
+        completed = _permutation_inference(
+            results,
+            matrix,
+            z_scores,
+            values,
+            weights,
+            permutations,
+            star,
+            seed,
+            progress_callback,
+            cancel_callback,
+        )
+        if not completed:
+            return None
+
+    return results
+
+
+def _permutation_inference(
+    results,
+    matrix,
+    z_scores,
+    values,
+    weights,
+    permutations,
+    star,
+    seed,
+    progress_callback=None,
+    cancel_callback=None,
+) -> bool:
+    """Replace analytic z-scores and p-values with conditional permutations.
+
+    :return: False if the run was cancelled.
+    """
+    count, fields = values.shape
+    max_cardinality = int(np.diff(matrix.indptr).max(initial=0))
+    if not max_cardinality:
+        return True
+
+    passes = int("moran" in results or "geary" in results)
+    passes += int("g_local" in results)
+    total = passes * count
+    done = 0
+    cancelled = False
+
+    def chunks(chunk_matrix, columns):
+        nonlocal done, cancelled
+        for chunk, lags in _random_neighbor_lags(chunk_matrix, columns, draws):
+            if cancel_callback is not None and cancel_callback():
+                cancelled = True
+                return
+            yield chunk, lags
+            done += len(chunk)
+            if progress_callback:
+                progress_callback(done, total)
+
+    rng = np.random.default_rng(seed)
+    draws = np.stack(
+        [
+            rng.choice(count - 1, size=max_cardinality, replace=False)
+            for __ in range(permutations)
+        ]
+    )
+
+    def store(statistic, chunk, simulated):
+        p_values, z_values = _pseudo_p_values(
+            results[statistic]["stat"][chunk], simulated
+        )
+        results[statistic]["p"][chunk] = p_values
+        results[statistic]["z"][chunk] = z_values
+
+    if "moran" in results or "geary" in results:
+        w1 = np.asarray(matrix.sum(axis=1)).ravel()
+        columns = np.hstack((z_scores, z_scores**2))
+        for chunk, lags in chunks(matrix, columns):
+            z_chunk = z_scores[chunk][:, None, :]
+            lag_z = lags[:, :, :fields]
+            if "moran" in results:
+                store("moran", chunk, (count - 1) * z_chunk / count * lag_z)
+            if "geary" in results:
+                store(
+                    "geary",
+                    chunk,
+                    w1[chunk, None, None] * z_chunk**2
+                    - 2 * z_chunk * lag_z
+                    + lags[:, :, fields:],
+                )
+
+    if "g_local" in results and not cancelled:
+        g_matrix = _as_sparse(weights, star=True) if star else matrix
+        self_weight, g_random = _split_diagonal(g_matrix)
+        value_total = values.sum(axis=0)
+        for chunk, lags in chunks(g_random, values):
+            fixed = (self_weight[chunk, None] * values[chunk])[:, None, :]
+            if star:
+                denominator = value_total
+            else:
+                denominator = (value_total - values[chunk])[:, None, :]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                store("g_local", chunk, (fixed + lags) / denominator)
+
+    return not cancelled
+
+
+GLOBAL_STATISTICS = ("moran", "geary")
+
+
+def _weights_sums(matrix):
+    """Return the S0, S1 and S2 sums and the margins of a sparse matrix.
+
+    Margins are the row sums plus the column sums of each unit.
+    """
+    symmetric = matrix + matrix.T
+    margins = np.asarray(matrix.sum(axis=1)).ravel()
+    margins = margins + np.asarray(matrix.sum(axis=0)).ravel()
+    s0 = float(matrix.sum())
+    s1 = float(symmetric.multiply(symmetric).sum()) / 2.0
+    s2 = float((margins**2).sum())
+    return s0, s1, s2, margins
+
+
+def _global_moments(statistic, count, kurtosis, s0, s1, s2):
+    """Expected value and variances (normality, randomization) under H0."""
+    n = float(count)
+    n2 = n * n
+    s02 = s0 * s0
+    if statistic == "moran":
+        expected = -1.0 / (n - 1)
+        variance_norm = (n2 * s1 - n * s2 + 3 * s02) / (
+            (n - 1) * (n + 1) * s02
+        ) - expected**2
+        first = n * ((n2 - 3 * n + 3) * s1 - n * s2 + 3 * s02)
+        second = kurtosis * ((n2 - n) * s1 - 2 * n * s2 + 6 * s02)
+        variance_rand = (first - second) / (
+            (n - 1) * (n - 2) * (n - 3) * s02
+        ) - expected**2
+        return expected, variance_norm, variance_rand
+
+    variance_norm = ((2 * s1 + s2) * (n - 1) - 4 * s02) / (2 * (n + 1) * s02)
+    first = (n - 1) * s1 * (n2 - 3 * n + 3 - (n - 1) * kurtosis)
+    second = 0.25 * (n - 1) * s2 * (n2 + 3 * n - 6 - (n2 - n + 2) * kurtosis)
+    third = s02 * (n2 - 3 - (n - 1) ** 2 * kurtosis)
+    variance_rand = (first - second + third) / (n * (n - 2) * (n - 3) * s02)
+    return 1.0, variance_norm, variance_rand
+
+
+def _global_values(statistic, matrix, margins, deviations, square_sum, s0):
+    """Global Moran's I or Geary's C of one or several value columns.
+
+    Only sparse matrix-vector products are used, so the memory is linear in
+    the number of units and neighbor links.
+
+    :param margins: Row sums plus column sums of the weights.
+    :param deviations: Centered values, shape (n, k).
+    :return: One statistic per column.
+    """
+    count = deviations.shape[0]
+    cross = (deviations * (matrix @ deviations)).sum(axis=0)
+    if statistic == "moran":
+        return count / s0 * cross / square_sum
+
+    # sum_ij w_ij (x_i - x_j)**2, without forming the differences.
+    squared_distance = margins @ deviations**2 - 2 * cross
+    return (count - 1) * squared_distance / (2 * s0 * square_sum)
+
+
+def global_autocorrelation(
+    values,
+    weights,
+    statistic: str = "moran",
+    permutations: int = 0,
+    two_tailed: Optional[bool] = None,
+    seed: Optional[int] = None,
+    progress_callback: ProgressCallback = None,
+    cancel_callback: CancelCallback = None,
+) -> Optional[Dict[str, float]]:
+    """Compute global Moran's I or Geary's C with bounded memory.
+
+    Results match esda ``Moran`` and ``Geary`` on row-standardized weights,
+    but the statistic is computed with sparse matrix-vector products and the
+    inference is analytical (normality and randomization assumptions), so
+    it scales to layers with millions of units. Permutations are optional
+    and simulated in chunks of at most ``PERMUTATION_CHUNK_VALUES`` values.
+
+    :param values: One value per unit.
+    :type values: array-like
+
+    :param weights: libpysal W or scipy sparse matrix (n, n).
+
+    :param statistic: "moran" or "geary".
+    :type statistic: str
+
+    :param permutations: Number of random permutations (0: none).
+    :type permutations: int
+
+    :param two_tailed: Double the analytical p-values. By default, as in
+        esda: two-tailed for Moran's I, one-tailed (folded) for Geary's C.
+    :type two_tailed: bool
+
+    :param seed: Seed of the permutations.
+    :type seed: int
+
+    :param progress_callback: Called with (permutations done, total) after
+        each permutation chunk.
+    :type progress_callback: Callable
+
+    :param cancel_callback: Polled between permutation chunks, the run
+        stops when it returns True.
+    :type cancel_callback: Callable
+
+    :return: "stat", "expected", "variance_norm", "z_norm", "p_norm",
+        "variance_rand", "z_rand" and "p_rand", plus "expected_sim",
+        "variance_sim", "z_sim" and "p_sim" with permutations, or None if
+        the run was cancelled.
+    :rtype: Dict[str, float]
+    """
+    if statistic not in GLOBAL_STATISTICS:
+        raise ValueError(f"Unsupported statistic: {statistic}")
+
+    values = np.asarray(values, dtype=float).ravel()
+    count = len(values)
+    if count < 4:
+        raise ValueError("At least 4 observations are required.")
+    if not np.isfinite(values).all():
+        raise ValueError("Values must not contain NULL or infinite values.")
+
+    matrix = _as_sparse(weights)
+    if matrix.shape != (count, count):
+        raise ValueError("Weights and values sizes must match.")
+
+    s0, s1, s2, margins = _weights_sums(matrix)
+    if not s0:
+        raise ValueError("Weights must include at least one connection.")
+
+    deviations = (values - values.mean()).reshape(-1, 1)
+    square_sum = float((deviations**2).sum())
+    if not square_sum:
+        raise ValueError("Values must not be constant.")
+    kurtosis = count * float((deviations**4).sum()) / square_sum**2
+
+    observed = float(
+        _global_values(statistic, matrix, margins, deviations, square_sum, s0)[0]
+    )
+    expected, variance_norm, variance_rand = _global_moments(
+        statistic, count, kurtosis, s0, s1, s2
+    )
+    z_values = _z_scores(
+        np.full(2, observed), expected, np.array([variance_norm, variance_rand])
+    )
+    if two_tailed is None:
+        two_tailed = statistic == "moran"
+    p_values = _normal_p_values(z_values) * (2.0 if two_tailed else 1.0)
+
+    result = {
+        "stat": observed,
+        "expected": expected,
+        "variance_norm": variance_norm,
+        "z_norm": float(z_values[0]),
+        "p_norm": float(p_values[0]),
+        "variance_rand": variance_rand,
+        "z_rand": float(z_values[1]),
+        "p_rand": float(p_values[1]),
+    }
+    if not permutations:
+        return result
+
+    rng = np.random.default_rng(seed)
+    chunk_size = max(1, PERMUTATION_CHUNK_VALUES // count)
+    simulated = np.empty(permutations)
+    for start in range(0, permutations, chunk_size):
+        if cancel_callback is not None and cancel_callback():
+            return None
+        size = min(chunk_size, permutations - start)
+        shuffled = np.empty((count, size))
+        for column in range(size):
+            shuffled[:, column] = rng.permutation(deviations[:, 0])
+        simulated[start : start + size] = _global_values(
+            statistic, matrix, margins, shuffled, square_sum, s0
+        )
+        if progress_callback:
+            progress_callback(start + size, permutations)
+
+    larger = int((simulated >= observed).sum())
+    larger = min(larger, permutations - larger)
+    result["expected_sim"] = float(simulated.mean())
+    result["variance_sim"] = float(simulated.var())
+    result["z_sim"] = float(
+        _z_scores(
+            np.array([observed]),
+            result["expected_sim"],
+            np.array([result["variance_sim"]]),
+        )[0]
+    )
+    result["p_sim"] = (larger + 1.0) / (permutations + 1.0)
+    return result
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from qgis.core import QgsFeatureRequest
+except ImportError:
+    QgsFeatureRequest = None
+
+
+Ring = Sequence[Tuple[float, float]]
+
+
+def _polygon_keys(rings: Iterable[Ring], rook: bool) -> np.ndarray:
+    """Return the hashable keys (vertices or edges) of one polygon."""
+    keys = []
+    for ring in rings:
+        coords = np.asarray(ring, dtype=float).reshape(-1, 2)
+        if not len(coords):
+            continue
+        if not rook:
+            keys.append(coords)
+            continue
+
+        start = coords[:-1]
+        end = coords[1:]
+        # Edges are undirected: order both end points lexicographically.
+        swap = (start[:, 0] > end[:, 0]) | (
+            (start[:, 0] == end[:, 0]) & (start[:, 1] > end[:, 1])
+        )
+        first = np.where(swap[:, None], end, start)
+        second = np.where(swap[:, None], start, end)
+        edges = np.hstack((first, second))
+        degenerate = (edges[:, 0] == edges[:, 2]) & (edges[:, 1] == edges[:, 3])
+        keys.append(edges[~degenerate])
+
+    width = 4 if rook else 2
+    if not keys:
+        return np.empty((0, width))
+    return np.vstack(keys)
+
+
+def contiguity_pairs(
+    polygons: Iterable[Iterable[Ring]],
+    rook: bool = False,
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Find contiguous polygons by hashing shared vertices or edges.
+
+    Queen contiguity links polygons sharing at least one vertex, Rook
+    contiguity links polygons sharing at least one edge. Keys are sorted
+    once, so the cost is dominated by a single O(m log m) sort over the m
+    vertices of the layer.
+
+    :param polygons: For each polygon, its rings as sequences of (x, y).
+    :type polygons: Iterable
+
+    :param rook: Use Rook (shared edge) instead of Queen (shared vertex).
+    :type rook: bool
+
+    :return: Number of polygons and the symmetric (i, j) neighbor pairs.
+    :rtype: Tuple[int, numpy.ndarray, numpy.ndarray]
+    """
+    keys = []
+    owners = []
+    count = 0
+    for index, rings in enumerate(polygons):
+        polygon_keys = _polygon_keys(rings, rook)
+        keys.append(polygon_keys)
+        owners.append(np.full(len(polygon_keys), index, dtype=np.int64))
+        count = index + 1
+
+    empty = np.empty(0, dtype=np.int64)
+    if not count or not any(len(item) for item in keys):
+        return count, empty, empty
+
+    keys = np.vstack(keys)
+    owners = np.concatenate(owners)
+
+    __, key_ids = np.unique(keys, axis=0, return_inverse=True)
+    key_ids = key_ids.reshape(-1).astype(np.int64)
+
+    # One entry per (key, polygon), sorted by key then polygon.
+    codes = np.unique(key_ids * count + owners)
+    key_ids = codes // count
+    owners = codes % count
+
+    first = []
+    second = []
+    offset = 1
+    while offset < len(codes):
+        same_key = key_ids[:-offset] == key_ids[offset:]
+        if not same_key.any():
+            break
+        first.append(owners[:-offset][same_key])
+        second.append(owners[offset:][same_key])
+        offset += 1
+
+    if not first:
+        return count, empty, empty
+
+    first = np.concatenate(first)
+    second = np.concatenate(second)
+    pair_codes = np.unique(
+        np.concatenate((first * count + second, second * count + first))
+    )
+    return count, pair_codes // count, pair_codes % count
+
+
+def neighbors_from_pairs(
+    count: int,
+    first: np.ndarray,
+    second: np.ndarray,
+) -> Dict[int, List[int]]:
+    """Convert neighbor pairs to a neighbor dictionary (islands included)."""
+    neighbors = {index: [] for index in range(count)}
+    if not len(first):
+        return neighbors
+
+    order = np.lexsort((second, first))
+    first = first[order]
+    second = second[order]
+    bounds = np.flatnonzero(np.diff(first)) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(first)]))
+    for start, end in zip(starts, ends):
+        neighbors[int(first[start])] = second[start:end].tolist()
+    return neighbors
+
+
+def sparse_from_pairs(count: int, first: np.ndarray, second: np.ndarray):
+    """Build a binary scipy CSR matrix from neighbor pairs."""
+    try:
+        from scipy import sparse
+    except ImportError as exc:
+        raise ImportError("scipy is required for sparse weights") from exc
+
+    data = np.ones(len(first), dtype=float)
+    return sparse.csr_matrix((data, (first, second)), shape=(count, count))
+
+
+def contiguity_neighbors(
+    polygons: Iterable[Iterable[Ring]],
+    rook: bool = False,
+) -> Dict[int, List[int]]:
+    """Compute a Queen or Rook neighbor dictionary from polygon rings.
+
+    :param polygons: For each polygon, its rings as sequences of (x, y).
+    :type polygons: Iterable
+
+    :param rook: Use Rook (shared edge) instead of Queen (shared vertex).
+    :type rook: bool
+
+    :return: Neighbors keyed by the position of the polygon in the input.
+    :rtype: Dict[int, List[int]]
+    """
+    return neighbors_from_pairs(*contiguity_pairs(polygons, rook=rook))
+
+
+def geometry_rings(geometry) -> List[List[Tuple[float, float]]]:
+    """Return the rings of every part of a QgsGeometry polygon."""
+    if geometry is None or geometry.isNull() or geometry.isEmpty():
+        return []
+
+    if geometry.isMultipart():
+        parts = geometry.asMultiPolygon()
+    else:
+        parts = [geometry.asPolygon()]
+
+    rings = []
+    for part in parts:
+        for ring in part:
+            rings.append([(point.x(), point.y()) for point in ring])
+    return rings
+
+
+def layer_polygons(source, geometry_cache: Optional[list] = None):
+    """Stream the rings of each feature of a polygon layer or feature source.
+
+    Attributes are not fetched. Features are yielded in the iteration order
+    of the source, which is the order used for the analysis outputs.
+
+    :param source: A QgsVectorLayer or any QgsFeatureSource.
+
+    :param geometry_cache: Optional list receiving each QgsGeometry, so the
+        geometries do not have to be read again when writing outputs.
+    :type geometry_cache: list
+    """
+    if QgsFeatureRequest is None:
+        raise ImportError("QGIS core is required to read layer geometries")
+
+    request = QgsFeatureRequest().setNoAttributes()
+    for feature in source.getFeatures(request):
+        geometry = feature.geometry()
+        if geometry_cache is not None:
+            geometry_cache.append(geometry)
+        yield geometry_rings(geometry)
+
+
+def neighbors_from_layer(
+    source,
+    rook: bool = False,
+    geometry_cache: Optional[list] = None,
+) -> Dict[int, List[int]]:
+    """Compute Queen or Rook neighbors straight from a QGIS polygon layer.
+
+    :param source: A QgsVectorLayer or any QgsFeatureSource.
+
+    :param rook: Use Rook (shared edge) instead of Queen (shared vertex).
+    :type rook: bool
+
+    :param geometry_cache: Optional list receiving each QgsGeometry.
+    :type geometry_cache: list
+
+    :return: Neighbors keyed by the feature position in the layer.
+    :rtype: Dict[int, List[int]]
+    """
+    return contiguity_neighbors(
+        layer_polygons(source, geometry_cache=geometry_cache), rook=rook
+    )
@@ -105,6 +105,335 @@ def compute_density(
     return _compute_rate(cases, area, ratio)
 
 
+def _as_float_array(series: Iterable):
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise ImportError("numpy is required for rate arrays") from exc
+
+    try:
+        return np.array(series, dtype=float).reshape(-1)
+    except (TypeError, ValueError):
+        # Mixed content (e.g. text values): convert one value at a time.
+        values = _validate_series(series)
+        return np.array([np.nan if value is None else value for value in values])
+
+
+def _compute_rate_array(numerator: Iterable, denominator: Iterable, ratio: float):
+    import numpy as np
+
+    num_values = _as_float_array(numerator)
+    den_values = _as_float_array(denominator)
+
+    if len(num_values) != len(den_values):
+        raise ValueError("Numerator and denominator lengths must match.")
+
+    # NaN comparisons are False, so missing values are invalid as well.
+    valid = (den_values > 0) & (num_values >= 0)
+    results = np.full(len(num_values), np.nan)
+    np.divide(num_values, den_values, out=results, where=valid)
+    results[valid] *= ratio
+    return results
+
+
+def compute_incidence_array(
+    cases: Iterable,
+    population: Iterable,
+    ratio: float = 1.0,
+):
+    """Compute incidence rates of whole columns at once.
+
+    :param cases: Case counts per unit (None or NaN when missing).
+    :type cases: Iterable or numpy.ndarray
+
+    :param population: Population counts per unit.
+    :type population: Iterable or numpy.ndarray
+
+    :param ratio: Scaling ratio (e.g., 100000).
+    :type ratio: float
+
+    :return: Incidence values, NaN when invalid.
+    :rtype: numpy.ndarray
+    """
+    return _compute_rate_array(cases, population, ratio)
+
+
+def compute_density_array(
+    cases: Iterable,
+    area: Iterable,
+    ratio: float = 1.0,
+):
+    """Compute density rates of whole columns at once.
+
+    :param cases: Case counts per unit (None or NaN when missing).
+    :type cases: Iterable or numpy.ndarray
+
+    :param area: Area values per unit.
+    :type area: Iterable or numpy.ndarray
+
+    :param ratio: Scaling ratio.
+    :type ratio: float
+
+    :return: Density values, NaN when invalid.
+    :rtype: numpy.ndarray
+    """
+    return _compute_rate_array(cases, area, ratio)
+
+
+CI_GARWOOD = "garwood"
+CI_BYAR = "byar"
+
+
+def poisson_confidence_limits(
+    counts: Iterable,
+    confidence: float = 0.95,
+    method: str = CI_GARWOOD,
+):
+    """Compute confidence limits of Poisson counts, for whole columns at once.
+
+    Garwood limits are exact: they are the gamma (chi-square) quantiles of
+    the counts. Byar limits are the Wilson-Hilferty approximation of them.
+
+    :param counts: Observed counts (None or NaN when missing).
+    :type counts: Iterable or numpy.ndarray
+
+    :param confidence: Confidence level, between 0 and 1.
+    :type confidence: float
+
+    :param method: "garwood" (exact) or "byar".
+    :type method: str
+
+    :return: Lower and upper limits of the counts, NaN when invalid.
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+    try:
+        from scipy import special
+    except ImportError as exc:
+        raise ImportError("scipy is required for confidence intervals") from exc
+    import numpy as np
+
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence level must be between 0 and 1.")
+    if method not in (CI_GARWOOD, CI_BYAR):
+        raise ValueError("Unknown confidence interval method: {}".format(method))
+
+    observed = _as_float_array(counts)
+    valid = observed >= 0
+    alpha = 1.0 - confidence
+    lower = np.full(len(observed), np.nan)
+    upper = np.full(len(observed), np.nan)
+    positive = valid & (observed > 0)
+    lower[valid] = 0.0
+
+    if method == CI_GARWOOD:
+        lower[positive] = special.gammaincinv(observed[positive], alpha / 2)
+        upper[valid] = special.gammaincinv(observed[valid] + 1, 1 - alpha / 2)
+    else:
+        z = special.ndtri(1 - alpha / 2)
+        low = observed[positive]
+        lower[positive] = low * (1 - 1 / (9 * low) - z / (3 * np.sqrt(low))) ** 3
+        high = observed[valid] + 1
+        upper[valid] = high * (1 - 1 / (9 * high) + z / (3 * np.sqrt(high))) ** 3
+
+    return lower, upper
+
+
+def rate_confidence_intervals(
+    cases: Iterable,
+    denominator: Iterable,
+    ratio: float = 1.0,
+    confidence: float = 0.95,
+    method: str = CI_GARWOOD,
+):
+    """Compute confidence intervals of incidence or density rates.
+
+    The limits of the case counts are divided by the denominator, so the
+    bounds are consistent with ``compute_incidence_array`` and
+    ``compute_density_array``.
+
+    :param cases: Case counts per unit (None or NaN when missing).
+    :type cases: Iterable or numpy.ndarray
+
+    :param denominator: Population or area per unit.
+    :type denominator: Iterable or numpy.ndarray
+
+    :param ratio: Scaling ratio (e.g., 100000).
+    :type ratio: float
+
+    :param confidence: Confidence level, between 0 and 1.
+    :type confidence: float
+
+    :param method: "garwood" (exact) or "byar".
+    :type method: str
+
+    :return: Lower and upper rate limits, NaN when invalid.
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+    lower, upper = poisson_confidence_limits(cases, confidence, method)
+    return (
+        _compute_rate_array(lower, denominator, ratio),
+        _compute_rate_array(upper, denominator, ratio),
+    )
+
+
+def _as_float_matrix(table: Iterable):
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise ImportError("numpy is required for standardized rates") from exc
+
+    try:
+        matrix = np.array(table, dtype=float)
+    except (TypeError, ValueError):
+        matrix = np.array([_as_float_array(row) for row in table], dtype=float)
+    if matrix.ndim != 2:
+        raise ValueError("Strata values must be a (units, strata) table.")
+    return matrix
+
+
+def _strata_tables(cases: Iterable, population: Iterable):
+    case_values = _as_float_matrix(cases)
+    population_values = _as_float_matrix(population)
+    if case_values.shape != population_values.shape:
+        raise ValueError("Cases and population strata shapes must match.")
+    return case_values, population_values
+
+
+def direct_standardized_rates(
+    cases: Iterable,
+    population: Iterable,
+    standard_population: Iterable,
+    ratio: float = 1.0,
+):
+    """Compute directly age-standardized rates for every unit.
+
+    Stratum rates of each unit are weighted by the share of each stratum in
+    the standard population, as a single (units x strata) matrix product.
+    Empty strata (no population and no case) contribute a zero rate.
+
+    :param cases: Case counts, one row per unit and one column per stratum.
+    :type cases: Iterable or numpy.ndarray
+
+    :param population: Population counts, same shape as the cases.
+    :type population: Iterable or numpy.ndarray
+
+    :param standard_population: Standard population of each stratum.
+    :type standard_population: Iterable
+
+    :param ratio: Scaling ratio (e.g., 100000).
+    :type ratio: float
+
+    :return: Standardized rates, NaN when a stratum is missing or invalid.
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+
+    case_values, population_values = _strata_tables(cases, population)
+    standard = _as_float_array(standard_population)
+    if len(standard) != case_values.shape[1]:
+        raise ValueError("One standard population value is required per stratum.")
+    if not np.isfinite(standard).all() or (standard < 0).any() or not standard.sum():
+        raise ValueError("Standard population must be positive.")
+    weights = standard / standard.sum()
+
+    valid = (population_values > 0) & (case_values >= 0)
+    empty = (population_values == 0) & (case_values == 0)
+    stratum_rates = np.zeros(case_values.shape)
+    np.divide(case_values, population_values, out=stratum_rates, where=valid)
+
+    results = (stratum_rates @ weights) * ratio
+    invalid = ~(valid | empty).all(axis=1) | ~valid.any(axis=1)
+    results[invalid] = np.nan
+    return results
+
+
+def stratum_reference_rates(cases: Iterable, population: Iterable):
+    """Rate of each stratum over all the units with complete, valid data.
+
+    :return: One reference rate per stratum (NaN without population).
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+
+    case_values, population_values = _strata_tables(cases, population)
+    complete = (
+        np.isfinite(case_values).all(axis=1)
+        & np.isfinite(population_values).all(axis=1)
+        & (case_values >= 0).all(axis=1)
+        & (population_values >= 0).all(axis=1)
+    )
+    case_totals = case_values[complete].sum(axis=0)
+    population_totals = population_values[complete].sum(axis=0)
+    reference = np.full(len(case_totals), np.nan)
+    np.divide(
+        case_totals, population_totals, out=reference, where=population_totals > 0
+    )
+    return reference
+
+
+def indirect_standardization(
+    cases: Iterable,
+    population: Iterable,
+    reference_rates: Optional[Iterable] = None,
+) -> Dict[str, object]:
+    """Compute expected counts and standardized morbidity/mortality ratios.
+
+    Expected counts apply the reference stratum rates to the population of
+    each unit, as a single (units x strata) matrix product.
+
+    :param cases: Case counts, one row per unit and one column per stratum.
+        A single column of totals is accepted when reference rates are given.
+    :type cases: Iterable or numpy.ndarray
+
+    :param population: Population counts, one column per stratum.
+    :type population: Iterable or numpy.ndarray
+
+    :param reference_rates: Rate of each stratum in the reference
+        population. Internal standardization (rates of all the units
+        together) is used if None.
+    :type reference_rates: Iterable
+
+    :return: "observed", "expected" and "smr" arrays (NaN when invalid), and
+        the "reference_rates" used.
+    :rtype: Dict[str, numpy.ndarray]
+    """
+    import numpy as np
+
+    population_values = _as_float_matrix(population)
+    if reference_rates is None:
+        case_values, population_values = _strata_tables(cases, population)
+        reference = stratum_reference_rates(case_values, population_values)
+    else:
+        if np.ndim(cases) == 2:
+            case_values = _as_float_matrix(cases)
+        else:
+            case_values = _as_float_array(cases)
+        reference = _as_float_array(reference_rates)
+        if len(reference) != population_values.shape[1]:
+            raise ValueError("One reference rate is required per stratum.")
+
+    if case_values.ndim == 2:
+        if case_values.shape[0] != population_values.shape[0]:
+            raise ValueError("Cases and population must have the same units.")
+        observed = case_values.sum(axis=1)
+    else:
+        if len(case_values) != population_values.shape[0]:
+            raise ValueError("Cases and population must have the same units.")
+        observed = case_values
+    observed[observed < 0] = np.nan
+
+    population_values = np.where(population_values < 0, np.nan, population_values)
+    expected = population_values @ np.nan_to_num(reference)
+    smr = np.full(len(expected), np.nan)
+    np.divide(observed, expected, out=smr, where=expected > 0)
+    return {
+        "observed": observed,
+        "expected": expected,
+        "smr": smr,
+        "reference_rates": reference,
+    }
+
+
 def summarize_rates(
     values: Iterable,
     sample_variance: bool = False,
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import datetime
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+PERIOD_DAY = "day"
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+PERIOD_YEAR = "year"
+PERIODS = (PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH, PERIOD_YEAR)
+
+# Handling of the values which are not dates
+ERRORS_RAISE = "raise"
+ERRORS_COERCE = "coerce"
+
+# Weeks start on Monday, 1970-01-05 is the first Monday after the epoch.
+_FIRST_MONDAY = np.datetime64("1970-01-05", "D")
+
+
+def _parse_date(value) -> np.datetime64:
+    """Day of a date value, NaT when missing.
+
+    :raises: ValueError if the value is not a date.
+    """
+    if value is None or (hasattr(value, "isNull") and value.isNull()):
+        return np.datetime64("NaT", "D")
+    if hasattr(value, "toPyDateTime"):
+        value = value.toPyDateTime()
+    elif hasattr(value, "toPyDate"):
+        value = value.toPyDate()
+
+    if isinstance(value, (datetime.date, np.datetime64)):
+        return np.datetime64(value).astype("datetime64[D]")
+    if not isinstance(value, str):
+        raise ValueError("Not a date: {!r}".format(value))
+
+    text = value.strip()
+    if not text:
+        return np.datetime64("NaT", "D")
+    try:
+        # Date and time, with a "T" or a space, the day is kept as written.
+        return np.datetime64(datetime.datetime.fromisoformat(text).date())
+    except ValueError:
+        # Partial dates such as "2024-01" or "2024"
+        return np.datetime64(text).astype("datetime64[D]")
+
+
+def as_datetime64(values: Iterable, errors: str = ERRORS_RAISE) -> np.ndarray:
+    """Convert dates to a datetime64[D] array, NaT when missing.
+
+    ISO date strings are converted at once. Strings with a time part,
+    Python dates and datetimes, QDate and QDateTime values are converted
+    one at a time. Numbers are not dates.
+
+    :param values: Date of each record.
+    :type values: Iterable
+
+    :param errors: "raise" to raise a ValueError on the first value which
+        is not a date, "coerce" to convert it to NaT.
+    :type errors: str
+
+    :rtype: numpy.ndarray
+    """
+    if errors not in (ERRORS_RAISE, ERRORS_COERCE):
+        raise ValueError("Unknown error handling: {}".format(errors))
+
+    values = list(values)
+    if all(isinstance(value, str) and len(value) == 10 for value in values):
+        try:
+            return np.array(values, dtype="datetime64[D]")
+        except ValueError:
+            pass
+
+    dates = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[D]")
+    for index, value in enumerate(values):
+        try:
+            dates[index] = _parse_date(value)
+        except (TypeError, ValueError) as exc:
+            if errors == ERRORS_COERCE:
+                continue
+            raise ValueError(
+                "Invalid date {!r} in record {}.".format(value, index)
+            ) from exc
+    return dates
+
+
+def _period_units(dates: np.ndarray, period: str) -> np.ndarray:
+    """Index of the period of each date, counted from the epoch."""
+    if period == PERIOD_DAY:
+        return dates.astype(np.int64)
+    if period == PERIOD_WEEK:
+        return (dates - _FIRST_MONDAY).astype(np.int64) // 7
+    if period == PERIOD_MONTH:
+        return dates.astype("datetime64[M]").astype(np.int64)
+    if period == PERIOD_YEAR:
+        return dates.astype("datetime64[Y]").astype(np.int64)
+    raise ValueError("Unknown period: {}".format(period))
+
+
+def _unit_starts(units: np.ndarray, period: str) -> np.ndarray:
+    """First day of each period index."""
+    if period == PERIOD_DAY:
+        return units.astype("datetime64[D]")
+    if period == PERIOD_WEEK:
+        return _FIRST_MONDAY + 7 * units
+    if period == PERIOD_MONTH:
+        return units.astype("datetime64[M]").astype("datetime64[D]")
+    return units.astype("datetime64[Y]").astype("datetime64[D]")
+
+
+def date_bins(
+    dates: Iterable,
+    period: str = PERIOD_WEEK,
+    step: int = 1,
+    start: Optional[object] = None,
+    errors: str = ERRORS_RAISE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Assign each date to a time bin of ``step`` periods.
+
+    Bins are contiguous from the first date (or ``start``) to the last one,
+    empty bins included, so series of different polygons line up.
+
+    :param dates: Date of each record (see ``as_datetime64``).
+    :type dates: Iterable
+
+    :param period: "day", "week" (starting on Monday), "month" or "year".
+    :type period: str
+
+    :param step: Number of periods in each bin.
+    :type step: int
+
+    :param start: Optional date of the first bin, earlier dates are skipped.
+
+    :param errors: "raise" or "coerce" (see ``as_datetime64``).
+    :type errors: str
+
+    :return: Bin of each record (-1 when skipped) and first day of each bin.
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+    if step < 1:
+        raise ValueError("The bin size must be at least one period.")
+
+    dates = as_datetime64(dates, errors)
+    units = _period_units(dates, period)
+    valid = ~np.isnat(dates)
+    if start is not None:
+        first = _period_units(as_datetime64([start]), period)[0]
+        valid &= units >= first
+    elif valid.any():
+        first = units[valid].min()
+
+    codes = np.full(len(dates), -1, dtype=np.int64)
+    if not valid.any():
+        return codes, np.empty(0, dtype="datetime64[D]")
+
+    codes[valid] = (units[valid] - first) // step
+    bin_units = first + step * np.arange(codes.max() + 1, dtype=np.int64)
+    return codes, _unit_starts(bin_units, period)
+
+
+def bin_labels(bin_starts: np.ndarray, period: str) -> List[str]:
+    """Readable label of each bin: ISO date, "YYYY-MM" or "YYYY"."""
+    if period == PERIOD_MONTH:
+        bin_starts = bin_starts.astype("datetime64[M]")
+    elif period == PERIOD_YEAR:
+        bin_starts = bin_starts.astype("datetime64[Y]")
+    return np.datetime_as_string(bin_starts).tolist()
+
+
+def space_time_counts(
+    assignment, codes, bin_count: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Count the records of each polygon in each time bin, in a single pass.
+
+    Only the polygon and bin pairs with records are returned, so the memory
+    used does not grow with the number of polygons times the number of bins.
+
+    :param assignment: Polygon position of each record, -1 if outside.
+    :type assignment: numpy.ndarray
+
+    :param codes: Time bin of each record, -1 to skip it.
+    :type codes: numpy.ndarray
+
+    :param bin_count: Number of time bins.
+    :type bin_count: int
+
+    :return: Polygon position, bin and count of each non-empty pair, by
+        polygon and bin.
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+    """
+    assignment = np.asarray(assignment, dtype=np.int64)
+    codes = np.asarray(codes, dtype=np.int64)
+    if len(assignment) != len(codes):
+        raise ValueError("One time bin is required per record.")
+
+    valid = (assignment >= 0) & (codes >= 0)
+    keys = assignment[valid] * bin_count + codes[valid]
+    keys, counts = np.unique(keys, return_counts=True)
+    return keys // bin_count, keys % bin_count, counts
+
+
+def count_matrix(
+    polygons, bins, counts, polygon_count: int, bin_count: int
+) -> np.ndarray:
+    """Convert (polygon, bin, count) rows to a (polygons, bins) count array.
+
+    :return: Counts, zero for the pairs without row.
+    :rtype: numpy.ndarray
+    """
+    matrix = np.zeros((polygon_count, bin_count), dtype=np.int64)
+    matrix[polygons, bins] = counts
+    return matrix
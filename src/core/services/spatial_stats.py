@@ -21,67 +21,135 @@
  ***************************************************************************/
 """
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Callable, List, Optional, Tuple
 
+from geopublichealth.src.core.gis.point_in_polygon import (
+    PointInPolygonAssigner,
+    read_point_coordinates,
+)
 from geopublichealth.src.core.stats import Stats
 
 try:
-    from qgis.core import QgsFeatureRequest, QgsSpatialIndex
+    from qgis.core import QgsFeatureRequest, QgsGeometry, QgsSpatialIndex, QgsWkbTypes
 except ImportError:
     QgsFeatureRequest = None
+    QgsGeometry = None
     QgsSpatialIndex = None
+    QgsWkbTypes = None
 
 
 ProgressCallback = Optional[Callable[[int, int], None]]
 
 
-def build_spatial_index(
-    stats_layer,
-    progress_callback: ProgressCallback = None,
-    use_fast: bool = False,
-):
-    if QgsSpatialIndex is None:
-        raise ImportError("QGIS core is required to build spatial index")
+def _stats_counter(stats_layer) -> Callable:
+    """Read the stats geometries once and return a counting function.
+
+    Single points are kept as a coordinate array sorted along x, other
+    geometries in a spatial index storing them. The function counts the
+    stats features intersecting a blurred geometry, given with its prepared
+    engine, and can be called from several threads.
+    """
+    point_layer = stats_layer.geometryType() == QgsWkbTypes.PointGeometry
+    if point_layer and not QgsWkbTypes.isMultiType(stats_layer.wkbType()):
+        __, coordinates = read_point_coordinates(stats_layer)
+        assigner = PointInPolygonAssigner(coordinates)
 
-    if use_fast:
-        return QgsSpatialIndex(stats_layer.getFeatures())
+        def count_points(geometry, engine):
+            return len(assigner.hits(geometry, engine=engine))
 
-    features = stats_layer.getFeatures()
-    index = QgsSpatialIndex()
-    total = stats_layer.featureCount()
+        return count_points
 
-    for i, feature in enumerate(features):
-        index.insertFeature(feature)
-        if progress_callback:
-            progress_callback(i + 1, total)
+    request = QgsFeatureRequest().setNoAttributes()
+    index = QgsSpatialIndex(
+        stats_layer.getFeatures(request),
+        flags=QgsSpatialIndex.FlagStoreFeatureGeometries,
+    )
+
+    def count_geometries(geometry, engine):
+        count = 0
+        for unique_id in index.intersects(geometry.boundingBox()):
+            if engine.intersects(index.geometry(unique_id).constGet()):
+                count += 1
+        return count
 
-    return index
+    return count_geometries
+
+
+def _count_chunk(counter, geometries) -> List[int]:
+    """Count the stats features of each blurred geometry of a chunk."""
+    counts = []
+    for geometry in geometries:
+        if geometry is None or geometry.isNull() or geometry.isEmpty():
+            counts.append(0)
+            continue
+        # Each blurred buffer is prepared once for all its candidates.
+        engine = QgsGeometry.createGeometryEngine(geometry.constGet())
+        engine.prepareGeometry()
+        counts.append(counter(geometry, engine))
+    return counts
 
 
 def compute_intersection_counts(
     blurred_layer,
     stats_layer,
-    index,
     progress_callback: ProgressCallback = None,
+    workers: int = 1,
+    chunk_size: int = 1000,
 ) -> List[int]:
+    """Count the stats features intersecting each blurred feature.
+
+    The stats geometries are read once, then each blurred buffer is prepared
+    and tested against the stats features of its bounding box only. Chunks
+    of blurred features can be counted by a pool of threads.
+
+    :param blurred_layer: The blurred polygon layer.
+
+    :param stats_layer: Stats layer (points or polygons).
+
+    :param progress_callback: Called with (done, total) after each chunk,
+        in the calling thread.
+
+    :param workers: Number of threads counting chunks at once.
+    :type workers: int
+
+    :param chunk_size: Blurred features counted by a thread at once.
+    :type chunk_size: int
+
+    :return: Count of each blurred feature, in the layer order.
+    :rtype: list
+    """
     if QgsFeatureRequest is None:
         raise ImportError("QGIS core is required to compute intersections")
 
-    counts = []
+    counter = _stats_counter(stats_layer)
     total = blurred_layer.featureCount()
+    request = QgsFeatureRequest().setNoAttributes()
+    geometries = (feature.geometry() for feature in blurred_layer.getFeatures(request))
+    chunks = iter(lambda: list(islice(geometries, chunk_size)), [])
 
-    for i, feature in enumerate(blurred_layer.getFeatures()):
-        count = 0
-        ids = index.intersects(feature.geometry().boundingBox())
-        for unique_id in ids:
-            request = QgsFeatureRequest().setFilterFid(unique_id)
-            f = next(stats_layer.getFeatures(request))
-            if f.geometry().intersects(feature.geometry()):
-                count += 1
-        counts.append(count)
-
-        if progress_callback:
-            progress_callback(i + 1, total)
+    counts = []
+    if workers > 1:
+        # Results are read in order, with a bounded read-ahead of chunks.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_count_chunk, counter, chunk))
+                if len(pending) >= 2 * workers:
+                    counts.extend(pending.popleft().result())
+                    if progress_callback:
+                        progress_callback(len(counts), total)
+            while pending:
+                counts.extend(pending.popleft().result())
+                if progress_callback:
+                    progress_callback(len(counts), total)
+    else:
+        for chunk in chunks:
+            counts.extend(_count_chunk(counter, chunk))
+            if progress_callback:
+                progress_callback(len(counts), total)
 
     return counts
 
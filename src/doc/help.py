@@ -160,7 +160,10 @@ def help_density():
         tr("Ratio"),
         tr("New column"),
     ]
-    outputs = [tr("New polygon layer with the density")]
+    outputs = [
+        tr("New polygon layer with the density"),
+        tr("Optional: ci_lo and ci_hi, exact Poisson 95% confidence limits"),
+    ]
     more = [
         tr(
             "This algorithm will count the number of points inside each "
@@ -180,8 +183,16 @@ def help_density_point():
         tr("Polygon layer : administrative boundary with two fields pop and case"),
         tr("Ratio"),
         tr("New column"),
+        tr(
+            "Category field (optional): a count (n_0, n_1, ...) and a rate "
+            "(r_0, r_1, ...) column for each value, or for the comma-separated "
+            "values given, with the value in the column alias"
+        ),
+    ]
+    outputs = [
+        tr("New polygon layer with the density"),
+        tr("Optional: ci_lo and ci_hi, exact Poisson 95% confidence limits"),
     ]
-    outputs = [tr("New polygon layer with the density")]
     more = [
         tr(
             "This algorithm will count the number of points inside each "
@@ -273,14 +284,27 @@ def help_incidence():
         tr("Population field"),
         tr("Ratio"),
         tr("New column"),
+        tr(
+            "Standardization (optional): age-band case and population fields, "
+            "and the standard population of each age band"
+        ),
+    ]
+    outputs = [
+        tr("New polygon layer with the incidence"),
+        tr("Indirect standardization: obs_ct and exp_ct, observed and expected cases"),
+        tr("Optional: ci_lo and ci_hi, exact Poisson 95% confidence limits"),
     ]
-    outputs = [tr("New polygon layer with the incidence")]
     more = [
         tr(
             "This algorithm will count the number of points inside each "
             "polygons and run a formula to get the incidence."
         ),
         tr("number of cases / population * ratio"),
+        tr(
+            "Direct: age-band rates weighted by the standard population. "
+            "Indirect: SMR = observed / expected cases, expected cases use "
+            "the reference rates (per ratio) or the rates of the whole layer."
+        ),
     ]
     html = html_table(title, intro, inputs, outputs, more)
     return html
@@ -295,8 +319,16 @@ def help_incidence_point():
         tr("Population field"),
         tr("Ratio"),
         tr("New column"),
+        tr(
+            "Category field (optional): a count (n_0, n_1, ...) and a rate "
+            "(r_0, r_1, ...) column for each value, or for the comma-separated "
+            "values given, with the value in the column alias"
+        ),
+    ]
+    outputs = [
+        tr("New polygon layer with the incidence"),
+        tr("Optional: ci_lo and ci_hi, exact Poisson 95% confidence limits"),
     ]
-    outputs = [tr("New polygon layer with the incidence")]
     more = [
         tr(
             "This algorithm will count the number of points inside each "
@@ -377,6 +409,46 @@ def help_autocorrelation(statistic=None):
             tr("MORAN_S = significance flag"),
         ]
         more = [tr("Global Moran's I summarizes overall spatial autocorrelation.")]
+    elif stat == "moran_global_large":
+        intro = tr("Moran (Global, large layers)")
+        inputs = [
+            tr("Polygon layer : administrative boundary with the indicators fields"),
+            tr("Field: for global autocorrelation, without NULL values"),
+            tr("Contiguity: Rook or Queen weights"),
+            tr("Output: shapefile or GeoPackage for results"),
+        ]
+        outputs = [
+            tr("New polygon layer with:"),
+            tr("MORAN_I = global Moran's I"),
+            tr("MORAN_Z = z-score under randomization"),
+            tr("MORAN_P = analytical p-values"),
+            tr("MORAN_S = significance flag"),
+        ]
+        more = [
+            tr(
+                "Sparse weights and analytical inference, without permutations, for layers with millions of units."
+            )
+        ]
+    elif stat == "geary_global_large":
+        intro = tr("Geary (Global, large layers)")
+        inputs = [
+            tr("Polygon layer : administrative boundary with the indicators fields"),
+            tr("Field: for global autocorrelation, without NULL values"),
+            tr("Contiguity: Rook or Queen weights"),
+            tr("Output: shapefile or GeoPackage for results"),
+        ]
+        outputs = [
+            tr("New polygon layer with:"),
+            tr("GEARY_C = global Geary's C"),
+            tr("GEARY_Z = z-score under randomization"),
+            tr("GEARY_P = analytical p-values"),
+            tr("GEARY_S = significance flag"),
+        ]
+        more = [
+            tr(
+                "Sparse weights and analytical inference, without permutations, for layers with millions of units."
+            )
+        ]
     elif stat == "moran_bv_global":
         intro = tr("Moran Bivariate (Global)")
         inputs = [
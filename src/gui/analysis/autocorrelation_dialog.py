@@ -32,13 +32,14 @@ import traceback
 from tempfile import NamedTemporaryFile
 from typing import Dict, List, Optional, Union, Any, Tuple
 
-from qgis.PyQt.QtWidgets import QDialog, QDialogButtonBox, QApplication
-from qgis.PyQt.QtCore import QVariant, Qt, pyqtSignal, QSettings
+from qgis.PyQt.QtWidgets import QDialog, QDialogButtonBox
+from qgis.PyQt.QtCore import QVariant, pyqtSignal, QSettings
 from qgis.PyQt.QtGui import QColor
 
 from qgis.utils import Qgis
 from qgis.core import (
     QgsField,
+    QgsFeatureRequest,
     QgsRendererCategory,
     QgsCategorizedSymbolRenderer,
     QgsGradientColorRamp,
@@ -48,7 +49,6 @@ from qgis.core import (
     QgsFeature,
     QgsVectorLayer,
     QgsProject,
-    QgsGeometry,
     QgsMapLayerProxyModel,
     QgsFieldProxyModel,
     QgsWkbTypes,
@@ -56,6 +56,8 @@ from qgis.core import (
     QgsClassificationMethod,
     QgsCoordinateTransformContext,
     QgsMessageLog,
+    QgsTask,
+    QgsVectorLayerFeatureSource,
 )
 from qgis.gui import QgsFieldComboBox, QgsMapLayerComboBox
 
@@ -146,6 +148,7 @@ from geopublichealth.src.core.exceptions import (
 )
 from geopublichealth.src.core.stats import Stats
 from geopublichealth.src.core.services import autocorrelation as autocorrelation_service
+from geopublichealth.src.core.services import contiguity
 from geopublichealth.src.doc.help import help_autocorrelation
 from geopublichealth.src.utilities.resources import get_ui_class
 
@@ -162,6 +165,631 @@ STAT_MORAN_BV_GLOBAL = "moran_bv_global"
 STAT_MORAN_BV_LOCAL = "moran_bv_local"
 STAT_JOIN_COUNTS_GLOBAL = "join_counts_global"
 STAT_JOIN_COUNTS_LOCAL = "join_counts_local"
+STAT_MORAN_GLOBAL_LARGE = "moran_global_large"
+STAT_GEARY_GLOBAL_LARGE = "geary_global_large"
+STAT_BATCH = "batch"
+
+# Global statistics computed with sparse weights and analytical inference.
+LARGE_STATISTICS = {
+    STAT_MORAN_GLOBAL_LARGE: "moran",
+    STAT_GEARY_GLOBAL_LARGE: "geary",
+}
+
+# Number of features handed to the file writer at once.
+OUTPUT_BATCH_SIZE = 5000
+
+PERMUTATIONS = 999
+
+# Output columns (name, result key) of each statistic in batch mode.
+BATCH_OUTPUT_FIELDS = {
+    STAT_MORAN: (
+        ("LISA_P", "p"),
+        ("LISA_Z", "z"),
+        ("LISA_Q", "q"),
+        ("LISA_I", "stat"),
+        ("LISA_C", "sig"),
+    ),
+    STAT_G_LOCAL: (
+        ("G_LOC", "stat"),
+        ("G_Z", "z"),
+        ("G_P", "p"),
+        ("G_HOT", "sig"),
+    ),
+    STAT_GEARY: (
+        ("GEARY_G", "stat"),
+        ("GEARY_P", "p"),
+        ("GEARY_S", "sig"),
+    ),
+}
+
+
+def _column_values(values, integer=False):
+    """Convert a result array to a list of Python values (NaN as NULL)."""
+    values = np.asarray(values, dtype=float)
+    missing = np.isnan(values)
+    if integer:
+        column = np.where(missing, 0, values).astype(int).tolist()
+    else:
+        column = values.tolist()
+    for index in np.flatnonzero(missing).tolist():
+        column[index] = None
+    return column
+
+
+def _hotspot_classes(z_values, p_values):
+    """Hotspot (1), coldspot (-1) or not significant (0) per unit."""
+    classes = np.where(np.asarray(z_values) > 0, 1, -1)
+    return np.where(np.asarray(p_values) > 0.05, 0, classes)
+
+
+def _batch_column_values(results, statistic, key, position):
+    """Return one batch output column as a list (NaN as NULL).
+
+    Units without a p-value (missing field values) have no significance.
+    """
+    result = results[statistic]
+    if key == "sig":
+        p_values = result["p"][:, position]
+        if statistic == STAT_MORAN:
+            values = result["q"][:, position] * (p_values <= 0.05)
+        elif statistic == STAT_G_LOCAL:
+            values = _hotspot_classes(result["z"][:, position], p_values)
+        else:
+            values = p_values <= 0.05
+        values = np.where(np.isnan(p_values), np.nan, values)
+        return _column_values(values, integer=True)
+    if key == "q":
+        return _column_values(result["q"][:, position], integer=True)
+    return _column_values(result[key][:, position])
+
+
+def _output_columns(statistic_type, stats, count, sig_q=None):
+    """
+    Build each output column once, in the order of the output fields.
+
+    Global statistics are repeated on every feature.
+
+    Returns:
+        list: One list of values per output field
+    """
+    if statistic_type in (STAT_MORAN, STAT_MORAN_RATE, STAT_MORAN_BV_LOCAL):
+        columns = [
+            (stats.p_sim, False),
+            (stats.z_sim, False),
+            (stats.q, True),
+            (stats.Is, False),
+            (sig_q, True),
+        ]
+    elif statistic_type == STAT_GEARY:
+        columns = [
+            (stats.localG, False),
+            (stats.p_sim, False),
+            (stats.p_sim <= 0.05, True),
+        ]
+    elif statistic_type == STAT_G_LOCAL:
+        columns = [
+            (stats.Gs, False),
+            (stats.Zs, False),
+            (stats.p_sim, False),
+            (_hotspot_classes(stats.Zs, stats.p_sim), True),
+        ]
+    elif statistic_type in (STAT_MORAN_GLOBAL, STAT_MORAN_BV_GLOBAL):
+        columns = [
+            (np.full(count, stats.I), False),
+            (np.full(count, stats.z_sim), False),
+            (np.full(count, stats.p_sim), False),
+            (np.full(count, stats.p_sim <= 0.05), True),
+        ]
+    elif statistic_type in LARGE_STATISTICS:
+        columns = [
+            (np.full(count, stats["stat"]), False),
+            (np.full(count, stats["z_rand"]), False),
+            (np.full(count, stats["p_rand"]), False),
+            (np.full(count, stats["p_rand"] <= 0.05), True),
+        ]
+    elif statistic_type == STAT_JOIN_COUNTS_GLOBAL:
+        columns = [
+            (np.full(count, stats.bb), False),
+            (np.full(count, stats.ww), False),
+            (np.full(count, stats.bw), False),
+            (np.full(count, stats.p_sim_bb), False),
+            (np.full(count, stats.p_sim_bw), False),
+            (np.full(count, stats.p_sim_bb <= 0.05), True),
+        ]
+    elif statistic_type == STAT_JOIN_COUNTS_LOCAL:
+        columns = [
+            (stats.LJC, False),
+            (stats.p_sim, False),
+            (stats.p_sim <= 0.05, True),
+        ]
+    else:
+        columns = []
+
+    return [_column_values(values, integer) for values, integer in columns]
+
+
+class AutocorrelationTask(QgsTask):
+    """Background task running the read, weights, statistic and write stages."""
+
+    autocorrelationFinished = pyqtSignal(bool, object, str)  # success, results, message
+    autocorrelationProgress = pyqtSignal(float)  # Current progress (0-100)
+
+    # Result data keys
+    RESULT_SUMMARY = "summary"
+
+    # Progress (0-100) reached at the end of each stage
+    PROGRESS_READ = 10.0
+    PROGRESS_WEIGHTS = 35.0
+    PROGRESS_STATISTIC = 80.0
+
+    def __init__(
+        self,
+        description: str,
+        source: Any,
+        output_fields: Any,
+        crs: Any,
+        transform_context: QgsCoordinateTransformContext,
+        output_file_path: str,
+        output_layer_name: str,
+        statistic_type: str,
+        field_names: List[str],
+        rook: bool = False,
+        batch_statistics: Optional[List[str]] = None,
+        batch_columns: Optional[List[Tuple]] = None,
+        binary_auto: bool = False,
+        binary_threshold: Optional[float] = None,
+        weights_fallback: Optional[Any] = None,
+    ):
+        """Initialize the task with necessary parameters.
+
+        Args:
+            source: QgsVectorLayerFeatureSource of the polygon layer
+            output_fields: Source fields followed by the new result fields
+            field_names: Indicator field, then the population or second field
+            batch_columns: Output columns from get_batch_columns (batch mode)
+            weights_fallback: Callable building weights if the native
+                builder fails
+        """
+        super().__init__(description, QgsTask.CanCancel)
+
+        # Input parameters
+        self.source = source
+        self.output_fields = output_fields
+        self.crs = crs
+        self.transform_context = transform_context
+        self.output_file_path = output_file_path
+        self.output_layer_name = output_layer_name
+        self.statistic_type = statistic_type
+        self.field_names = field_names
+        self.rook = rook
+        self.batch_statistics = batch_statistics or []
+        self.batch_columns = batch_columns or []
+        self.binary_auto = binary_auto
+        self.binary_threshold = binary_threshold
+        self.weights_fallback = weights_fallback
+
+        # Output/state variables
+        self.exception = None
+        self.geometry_cache = None
+        self.summary = ""
+
+    def run(self) -> bool:
+        """Main processing logic executed in the background thread."""
+        QgsMessageLog.logMessage(
+            f"Task '{self.description()}' started for {self.output_file_path}",
+            "GeoPublicHealth",
+            Qgis.Info,
+        )
+
+        try:
+            values = self.read_values()
+            self.autocorrelationProgress.emit(self.PROGRESS_READ)
+            if self.isCanceled():
+                return False
+
+            weights = self.build_weights()
+            self.autocorrelationProgress.emit(self.PROGRESS_WEIGHTS)
+            if self.isCanceled():
+                return False
+
+            columns = self.compute_columns(values, weights)
+            if columns is None or self.isCanceled():
+                return False
+            self.autocorrelationProgress.emit(self.PROGRESS_STATISTIC)
+
+            if not self.write_output(columns):
+                self.remove_output()
+                return False
+            return True
+
+        except Exception as e:
+            self.exception = e
+            QgsMessageLog.logMessage(
+                f"Task '{self.description()}' failed: {str(e)}\n{traceback.format_exc()}",
+                "GeoPublicHealth",
+                Qgis.Critical,
+            )
+            self.remove_output()
+            return False
+
+    def read_values(self):
+        """
+        Read the indicator fields in a single pass over the layer.
+
+        Returns:
+            numpy.ndarray: (features, fields) array of values (NULL as NaN)
+        """
+        source_fields = self.source.fields()
+        field_indexes = []
+        for field in self.field_names:
+            field_index = source_fields.lookupField(field)
+            if field_index == -1:
+                raise GeoPublicHealthException(
+                    msg=tr("Field not found in layer:") + f" {field}"
+                )
+            field_indexes.append(field_index)
+
+        request = QgsFeatureRequest()
+        request.setFlags(QgsFeatureRequest.NoGeometry)
+        request.setSubsetOfAttributes(field_indexes)
+
+        rows = []
+        for feature in self.source.getFeatures(request):
+            attributes = feature.attributes()
+            row = []
+            for field_index in field_indexes:
+                try:
+                    row.append(float(attributes[field_index]))
+                except (TypeError, ValueError):
+                    row.append(np.nan)
+            rows.append(row)
+        return np.array(rows, dtype=float).reshape(-1, len(field_indexes))
+
+    def build_weights(self):
+        """
+        Get spatial weights by hashing shared vertices or edges of the layer.
+
+        Geometries read here are reused when writing the output layer. The
+        GeoPandas and legacy shapefile readers are only used if the native
+        builder fails.
+
+        Large global statistics get a scipy sparse matrix straight from the
+        neighbor pairs, without the libpysal neighbor dictionaries. Their
+        geometries are streamed and not kept, the output layer reads them
+        again.
+
+        Returns:
+            libpysal.weights.W: Spatial weights matrix
+        """
+        try:
+            if self.statistic_type in LARGE_STATISTICS:
+                self.geometry_cache = None
+                return contiguity.sparse_from_pairs(
+                    *contiguity.contiguity_pairs(
+                        contiguity.layer_polygons(self.source), rook=self.rook
+                    )
+                )
+            self.geometry_cache = []
+            neighbors = contiguity.neighbors_from_layer(
+                self.source, rook=self.rook, geometry_cache=self.geometry_cache
+            )
+            return libpysal.weights.W(
+                neighbors,
+                id_order=list(range(len(neighbors))),
+                silence_warnings=True,
+            )
+        except Exception as e:
+            self.geometry_cache = None
+            if self.weights_fallback is None:
+                raise
+            QgsMessageLog.logMessage(
+                f"Native weights approach failed, falling back: {str(e)}",
+                "GeoPublicHealth",
+                Qgis.Warning,
+            )
+            return self.weights_fallback()
+
+    def compute_columns(self, values, w):
+        """
+        Run the statistic and build the output columns.
+
+        Returns:
+            list: One list of values per output field, None if cancelled
+        """
+        y = values[:, 0]
+        self.summary = tr("Local statistic; see output layer fields.")
+        sig_q = None
+
+        if self.statistic_type == STAT_BATCH:
+            missing = np.isnan(values).any(axis=0)
+            if missing.any():
+                QgsMessageLog.logMessage(
+                    tr("Fields with NULL values are left empty:")
+                    + " "
+                    + ", ".join(np.array(self.field_names)[missing]),
+                    "GeoPublicHealth",
+                    Qgis.Warning,
+                )
+
+            results = autocorrelation_service.batch_local_statistics(
+                values,
+                w,
+                statistics=self.batch_statistics,
+                permutations=PERMUTATIONS,
+                progress_callback=self.statistic_progress,
+                cancel_callback=self.isCanceled,
+            )
+            if results is None:
+                return None
+
+            self.summary = (
+                tr("Batch local statistics")
+                + f"\n{len(self.field_names)} "
+                + tr("fields")
+                + f", {len(self.batch_statistics)} "
+                + tr("statistics")
+                + f", {len(self.batch_columns)} "
+                + tr("output columns")
+            )
+            return [
+                _batch_column_values(results, statistic, key, position)
+                for __, statistic, key, position in self.batch_columns
+            ]
+
+        if self.statistic_type == STAT_MORAN:
+            stats = autocorrelation_service.moran_local(
+                y, w, permutations=PERMUTATIONS, transformation="r"
+            )
+            sig_q = stats.q * (stats.p_sim <= 0.05)
+        elif self.statistic_type == STAT_GEARY:
+            stats = autocorrelation_service.geary_local(
+                y, w, permutations=PERMUTATIONS, n_jobs=1
+            )
+        elif self.statistic_type == STAT_G_LOCAL:
+            stats = autocorrelation_service.g_local(
+                y, w, permutations=PERMUTATIONS, n_jobs=1
+            )
+        elif self.statistic_type == STAT_MORAN_RATE:
+            rate_global, stats = autocorrelation_service.moran_rate(
+                y, values[:, 1], w, permutations=PERMUTATIONS
+            )
+            QgsMessageLog.logMessage(
+                f"Moran Rate I: {rate_global.I:.4f}, p={rate_global.p_sim:.4f}",
+                "GeoPublicHealth",
+                Qgis.Info,
+            )
+            sig_q = stats.q * (stats.p_sim <= 0.05)
+            self.summary = (
+                tr("Moran Rate (Global)")
+                + f"\nI={rate_global.I:.4f}"
+                + f"\nZ={rate_global.z_sim:.4f}"
+                + f"\nP={rate_global.p_sim:.4f}"
+            )
+        elif self.statistic_type == STAT_MORAN_GLOBAL:
+            stats = autocorrelation_service.moran_global(
+                y, w, permutations=PERMUTATIONS, transformation="r"
+            )
+            QgsMessageLog.logMessage(
+                f"Moran I: {stats.I:.4f}, p={stats.p_sim:.4f}",
+                "GeoPublicHealth",
+                Qgis.Info,
+            )
+            self.summary = (
+                tr("Moran (Global)")
+                + f"\nI={stats.I:.4f}"
+                + f"\nZ={stats.z_sim:.4f}"
+                + f"\nP={stats.p_sim:.4f}"
+            )
+        elif self.statistic_type == STAT_MORAN_BV_GLOBAL:
+            stats = autocorrelation_service.moran_bv_global(
+                y, values[:, 1], w, permutations=PERMUTATIONS, transformation="r"
+            )
+            QgsMessageLog.logMessage(
+                f"Moran BV I: {stats.I:.4f}, p={stats.p_sim:.4f}",
+                "GeoPublicHealth",
+                Qgis.Info,
+            )
+            self.summary = (
+                tr("Moran BV (Global)")
+                + f"\nI={stats.I:.4f}"
+                + f"\nZ={stats.z_sim:.4f}"
+                + f"\nP={stats.p_sim:.4f}"
+            )
+        elif self.statistic_type == STAT_MORAN_BV_LOCAL:
+            stats = autocorrelation_service.moran_bv_local(
+                y, values[:, 1], w, permutations=PERMUTATIONS, transformation="r"
+            )
+            sig_q = stats.q * (stats.p_sim <= 0.05)
+        elif self.statistic_type in LARGE_STATISTICS:
+            statistic = LARGE_STATISTICS[self.statistic_type]
+            stats = autocorrelation_service.global_autocorrelation(
+                y, w, statistic=statistic
+            )
+            name = "I" if statistic == "moran" else "C"
+            QgsMessageLog.logMessage(
+                f"Global {statistic} {name}: {stats['stat']:.4f}, "
+                f"p={stats['p_rand']:.4f}",
+                "GeoPublicHealth",
+                Qgis.Info,
+            )
+            self.summary = (
+                (tr("Moran (Global)") if statistic == "moran" else tr("Geary (Global)"))
+                + f"\n{name}={stats['stat']:.4f}"
+                + f"\nE[{name}]={stats['expected']:.4f}"
+                + f"\nZ={stats['z_rand']:.4f}"
+                + f"\nP={stats['p_rand']:.4f}"
+                + "\n"
+                + tr("Analytical inference under randomization.")
+            )
+        elif self.statistic_type == STAT_JOIN_COUNTS_GLOBAL:
+            stats = autocorrelation_service.join_counts_global(
+                self.binarize_values(y), w, permutations=PERMUTATIONS
+            )
+            QgsMessageLog.logMessage(
+                f"Join Counts BB: {stats.bb:.4f}, p={stats.p_sim_bb:.4f}",
+                "GeoPublicHealth",
+                Qgis.Info,
+            )
+            self.summary = (
+                tr("Join Counts (Global)")
+                + f"\nBB={stats.bb:.4f} (p={stats.p_sim_bb:.4f})"
+                + f"\nWW={stats.ww:.4f}"
+                + f"\nBW={stats.bw:.4f} (p={stats.p_sim_bw:.4f})"
+            )
+        elif self.statistic_type == STAT_JOIN_COUNTS_LOCAL:
+            stats = autocorrelation_service.join_counts_local(
+                self.binarize_values(y), w, permutations=PERMUTATIONS, n_jobs=1
+            )
+        else:
+            raise GeoPublicHealthException(
+                msg=tr("Unknown statistic:") + f" {self.statistic_type}"
+            )
+
+        return _output_columns(self.statistic_type, stats, len(y), sig_q)
+
+    def statistic_progress(self, done: int, total: int):
+        """Report progress of the statistic stage (permutation chunks)."""
+        if total:
+            span = self.PROGRESS_STATISTIC - self.PROGRESS_WEIGHTS
+            self.autocorrelationProgress.emit(
+                self.PROGRESS_WEIGHTS + span * done / total
+            )
+
+    def binarize_values(self, values):
+        if self.binary_auto:
+            values_array = np.asarray(values)
+            valid = values_array[np.isfinite(values_array)]
+            unique_values = np.unique(valid)
+            if set(unique_values.tolist()).issubset({0, 1}):
+                return (values_array == 1).astype(int)
+
+            QgsMessageLog.logMessage(
+                tr("Binary auto-detect failed; using threshold."),
+                "GeoPublicHealth",
+                Qgis.Warning,
+            )
+
+        if self.binary_threshold is None:
+            return (values > 0).astype(int)
+        return (values >= self.binary_threshold).astype(int)
+
+    def write_output(self, columns) -> bool:
+        """
+        Append the result columns to the source attributes and write them.
+
+        Features are written in batches. When the weights builder cached the
+        geometries, the layer is read again without geometries.
+
+        Returns:
+            bool: False if the task was cancelled while writing
+        """
+        save_options = QgsVectorFileWriter.SaveVectorOptions()
+        save_options.driverName = self.driver_name()
+        save_options.encoding = "UTF-8"
+        if save_options.driverName == "GPKG":
+            save_options.layerName = self.output_layer_name
+
+        file_writer = QgsVectorFileWriter.create(
+            self.output_file_path,
+            self.output_fields,
+            QgsWkbTypes.Polygon,
+            self.crs,
+            self.transform_context,
+            save_options,
+        )
+        if file_writer.hasError():
+            raise GeoPublicHealthException(
+                msg=f"Error creating output file: {file_writer.errorMessage()}"
+            )
+
+        count = len(columns[0]) if columns else 0
+        geometries = self.geometry_cache
+        if geometries is not None and len(geometries) != count:
+            geometries = None
+
+        request = QgsFeatureRequest()
+        if geometries is not None:
+            request.setFlags(QgsFeatureRequest.NoGeometry)
+
+        span = 100.0 - self.PROGRESS_STATISTIC
+        batch = []
+        try:
+            features = self.source.getFeatures(request)
+            for i, (feature, row) in enumerate(zip(features, zip(*columns))):
+                attributes = feature.attributes()
+                attributes.extend(row)
+
+                new_feature = QgsFeature()
+                new_feature.setAttributes(attributes)
+                if geometries is not None:
+                    new_feature.setGeometry(geometries[i])
+                else:
+                    new_feature.setGeometry(feature.geometry())
+                batch.append(new_feature)
+
+                if len(batch) >= OUTPUT_BATCH_SIZE:
+                    if self.isCanceled():
+                        return False
+                    self._add_output_features(file_writer, batch)
+                    batch = []
+                    self.autocorrelationProgress.emit(
+                        self.PROGRESS_STATISTIC + span * (i + 1) / count
+                    )
+
+            if batch:
+                self._add_output_features(file_writer, batch)
+        finally:
+            del file_writer
+
+        self.autocorrelationProgress.emit(100.0)
+        return not self.isCanceled()
+
+    @staticmethod
+    def _add_output_features(file_writer, features):
+        if not file_writer.addFeatures(features):
+            raise GeoPublicHealthException(
+                msg=tr("Error writing output features:")
+                + f" {file_writer.errorMessage()}"
+            )
+
+    def driver_name(self) -> str:
+        output_ext = os.path.splitext(self.output_file_path)[1].lower()
+        return "GPKG" if output_ext == ".gpkg" else "ESRI Shapefile"
+
+    def remove_output(self):
+        """Remove a partially written output file (Shapefile or GeoPackage)."""
+        if not self.output_file_path or not os.path.exists(self.output_file_path):
+            return
+        if self.driver_name() == "ESRI Shapefile":
+            QgsVectorFileWriter.deleteShapeFile(self.output_file_path)
+            return
+        try:
+            os.remove(self.output_file_path)
+        except OSError:
+            pass
+
+    def finished(self, result: bool):
+        """Called when the task's run() method finishes."""
+        if result:
+            results_dict = {self.RESULT_SUMMARY: self.summary}
+            self.autocorrelationFinished.emit(True, results_dict, self.output_file_path)
+            QgsMessageLog.logMessage(
+                f"Task '{self.description()}' finished successfully.",
+                "GeoPublicHealth",
+                Qgis.Info,
+            )
+        else:
+            error_msg = (
+                f"{tr('Task failed:')} {str(self.exception)}"
+                if self.exception
+                else tr("Task cancelled or failed.")
+            )
+            self.autocorrelationFinished.emit(False, None, error_msg)
+            QgsMessageLog.logMessage(
+                f"Task '{self.description()}' finished with error or cancellation.",
+                "GeoPublicHealth",
+                Qgis.Warning,
+            )
 
 
 class CommonAutocorrelationDialog(QDialog):
@@ -191,6 +819,15 @@ class CommonAutocorrelationDialog(QDialog):
         self.output_layer = None
         self.use_area = None
         self.layer = None
+        self.current_task = None
+        self.statistic_type = None
+        self.output_label = None
+        self.output_columns = None
+
+        # Layer settings captured before the task starts
+        self.layer_source = None
+        self.layer_crs = None
+        self.contiguity_index = 0
 
         # Log dependency availability
         QgsMessageLog.logMessage(
@@ -225,10 +862,9 @@ class CommonAutocorrelationDialog(QDialog):
                 if ok_button:
                     ok_button.clicked.connect(self.run_stats)
                 if cancel_button:
-                    cancel_button.clicked.connect(self.hide)
-                    cancel_button.clicked.connect(
-                        lambda: self.signalAskCloseWindow.emit(0)
-                    )
+                    cancel_button.clicked.connect(self.cancel_task_and_close)
+
+            self.set_progress_visible(False)
 
             # Set up layer and field selectors
             if hasattr(self, "cbx_aggregation_layer"):
@@ -278,6 +914,17 @@ class CommonAutocorrelationDialog(QDialog):
             if hasattr(self, "cbx_binary_auto"):
                 self.cbx_binary_auto.toggled.connect(self.update_statistic_controls)
 
+            if hasattr(self, "cbx_batch_fields") and hasattr(
+                self, "cbx_aggregation_layer"
+            ):
+                self.update_batch_fields(self.cbx_aggregation_layer.currentLayer())
+                self.cbx_aggregation_layer.layerChanged.connect(
+                    self.update_batch_fields
+                )
+
+            if hasattr(self, "cbx_batch_mode"):
+                self.cbx_batch_mode.toggled.connect(self.update_statistic_controls)
+
             # LISA categories with colors and labels
             self.lisa = {
                 1: ("#b92815", "High - High"),
@@ -288,7 +935,11 @@ class CommonAutocorrelationDialog(QDialog):
 
             # Display information about available libraries
             if hasattr(self, "label_library_info"):
-                if GEOPANDAS_AVAILABLE:
+                if PYSAL_AVAILABLE:
+                    self.label_library_info.setText(
+                        tr("Using native QGIS contiguity builder")
+                    )
+                elif GEOPANDAS_AVAILABLE:
                     self.label_library_info.setText(
                         tr("Using modern GeoPandas approach")
                     )
@@ -335,6 +986,10 @@ class CommonAutocorrelationDialog(QDialog):
                 self.cbx_binary_auto.setToolTip(
                     tr("Auto-detect 0/1 binary fields for Join Counts.")
                 )
+            if hasattr(self, "cbx_batch_fields"):
+                self.cbx_batch_fields.setToolTip(
+                    tr("Numeric fields analysed together with the same weights.")
+                )
 
         except Exception as e:
             display_message_bar(
@@ -383,7 +1038,7 @@ class CommonAutocorrelationDialog(QDialog):
             )
 
     def run_stats(self):
-        """Main analysis function."""
+        """Validate the inputs and start the analysis in a background task."""
         if not autocorrelation_service.PYSAL_AVAILABLE:
             display_message_bar(
                 tr(
@@ -394,169 +1049,182 @@ class CommonAutocorrelationDialog(QDialog):
             )
             return
 
-        try:
-            # Prepare UI for processing
-            self.prepare_run()
-            self.set_summary_text(tr("Running analysis..."))
+        if self.current_task is not None:
+            return
 
+        try:
             # Get input parameters
             self.admin_layer = self.cbx_aggregation_layer.currentLayer()
-            input_name = self.admin_layer.name()
-            field = self.cbx_indicator_field.currentField()
-            self.statistic_type = self.get_statistic_type()
-            population_field = None
-            secondary_field = None
-            if self.statistic_type == STAT_MORAN_RATE:
-                if hasattr(self, "cbx_population_field"):
-                    population_field = self.cbx_population_field.currentField()
-                if not population_field:
-                    raise GeoPublicHealthException(
-                        msg=tr("Population field is required for Moran Rate.")
-                    )
-            if self.statistic_type in (STAT_MORAN_BV_GLOBAL, STAT_MORAN_BV_LOCAL):
-                if hasattr(self, "cbx_secondary_field"):
-                    secondary_field = self.cbx_secondary_field.currentField()
-                if not secondary_field:
-                    raise GeoPublicHealthException(
-                        msg=tr("Second field is required for bivariate Moran.")
-                    )
-
-            # Get the layer from the project
-            self.layer = QgsProject.instance().mapLayersByName(input_name)[0]
+            self.layer = self.admin_layer
             self.output_file_path = self.le_output_filepath.text()
 
             # Validate input parameters
             self.check_layer_and_file_path()
-            crs_admin_layer = self.admin_layer.crs()
 
             # Get field structure and add new fields
-            admin_layer_provider = self.layer.dataProvider()
-            fields = admin_layer_provider.fields()
-            self.check_existing_field(fields)
-            self.append_new_fields(fields)
-
-            # Prepare file writer
-            file_writer = self.prepare_file_writer(fields, crs_admin_layer)
+            fields = self.admin_layer.fields()
+            batch_statistics = None
+            self.output_columns = None
+
+            if self.is_batch_mode():
+                self.statistic_type = STAT_BATCH
+                field_names = self.get_batch_fields()
+                batch_statistics = self.get_batch_statistics()
+                if not field_names:
+                    raise GeoPublicHealthException(
+                        msg=tr("Select at least one field for batch mode.")
+                    )
+                if not batch_statistics:
+                    raise GeoPublicHealthException(
+                        msg=tr("Select at least one statistic for batch mode.")
+                    )
 
-            # Calculate spatial weights and local Moran's I
-            # Use modern approach if available, fall back to legacy approach
-            if GEOPANDAS_AVAILABLE:
-                QgsMessageLog.logMessage(
-                    "Using modern GeoPandas approach for spatial weights",
-                    "GeoPublicHealth",
-                    Qgis.Info,
+                self.output_columns = self.get_batch_columns(
+                    field_names, batch_statistics
                 )
-                w = self.get_weights_modern()
-                y = self.get_indicator_values_modern(field)
+                for name, statistic, key, __ in self.output_columns:
+                    if fields.indexOf(name) != -1:
+                        raise FieldExistingException(field=name)
+                    if key in ("q", "sig"):
+                        fields.append(QgsField(name, 2, "Integer", 1, 0))
+                    else:
+                        fields.append(QgsField(name, 6, "Real", 10, 6))
+                self.output_label = f"{len(field_names)}_fields"
             else:
-                QgsMessageLog.logMessage(
-                    "Using legacy PySAL approach for spatial weights",
-                    "GeoPublicHealth",
-                    Qgis.Info,
-                )
-                w = self.get_weights_legacy()
-                y = self.get_indicator_values_legacy(field)
-
-            # Calculate statistics based on selection
-            if self.statistic_type == STAT_MORAN:
-                lm = self.calculate_moran_local(y, w)
-                sig_q = lm.q * (lm.p_sim <= 0.05)
-                self.create_output_features(file_writer, lm, sig_q)
-                self.set_summary_text(tr("Local statistic; see output layer fields."))
-            elif self.statistic_type == STAT_GEARY:
-                geary = self.calculate_geary_local(y, w)
-                self.create_output_features(file_writer, geary)
-                self.set_summary_text(tr("Local statistic; see output layer fields."))
-            elif self.statistic_type == STAT_G_LOCAL:
-                g_local = self.calculate_g_local(y, w)
-                self.create_output_features(file_writer, g_local)
-                self.set_summary_text(tr("Local statistic; see output layer fields."))
-            elif self.statistic_type == STAT_MORAN_RATE:
-                if GEOPANDAS_AVAILABLE:
-                    population = self.get_indicator_values_modern(population_field)
-                else:
-                    population = self.get_indicator_values_legacy(population_field)
-                rate_global, rate_local = self.calculate_moran_rate(y, population, w)
-                QgsMessageLog.logMessage(
-                    f"Moran Rate I: {rate_global.I:.4f}, p={rate_global.p_sim:.4f}",
-                    "GeoPublicHealth",
-                    Qgis.Info,
-                )
-                sig_q = rate_local.q * (rate_local.p_sim <= 0.05)
-                self.create_output_features(file_writer, rate_local, sig_q)
-                self.set_summary_text(
-                    tr("Moran Rate (Global)")
-                    + f"\nI={rate_global.I:.4f}"
-                    + f"\nZ={rate_global.z_sim:.4f}"
-                    + f"\nP={rate_global.p_sim:.4f}"
-                )
-            elif self.statistic_type == STAT_MORAN_GLOBAL:
-                moran_global = self.calculate_moran_global(y, w)
-                QgsMessageLog.logMessage(
-                    f"Moran I: {moran_global.I:.4f}, p={moran_global.p_sim:.4f}",
-                    "GeoPublicHealth",
-                    Qgis.Info,
-                )
-                self.create_output_features(file_writer, moran_global)
-                self.set_summary_text(
-                    tr("Moran (Global)")
-                    + f"\nI={moran_global.I:.4f}"
-                    + f"\nZ={moran_global.z_sim:.4f}"
-                    + f"\nP={moran_global.p_sim:.4f}"
-                )
-            elif self.statistic_type == STAT_MORAN_BV_GLOBAL:
-                if GEOPANDAS_AVAILABLE:
-                    y_secondary = self.get_indicator_values_modern(secondary_field)
-                else:
-                    y_secondary = self.get_indicator_values_legacy(secondary_field)
-                moran_bv = self.calculate_moran_bv_global(y, y_secondary, w)
-                QgsMessageLog.logMessage(
-                    f"Moran BV I: {moran_bv.I:.4f}, p={moran_bv.p_sim:.4f}",
-                    "GeoPublicHealth",
-                    Qgis.Info,
-                )
-                self.create_output_features(file_writer, moran_bv)
-                self.set_summary_text(
-                    tr("Moran BV (Global)")
-                    + f"\nI={moran_bv.I:.4f}"
-                    + f"\nZ={moran_bv.z_sim:.4f}"
-                    + f"\nP={moran_bv.p_sim:.4f}"
-                )
-            elif self.statistic_type == STAT_MORAN_BV_LOCAL:
-                if GEOPANDAS_AVAILABLE:
-                    y_secondary = self.get_indicator_values_modern(secondary_field)
-                else:
-                    y_secondary = self.get_indicator_values_legacy(secondary_field)
-                moran_bv_local = self.calculate_moran_bv_local(y, y_secondary, w)
-                sig_q = moran_bv_local.q * (moran_bv_local.p_sim <= 0.05)
-                self.create_output_features(file_writer, moran_bv_local, sig_q)
-                self.set_summary_text(tr("Local statistic; see output layer fields."))
-            elif self.statistic_type == STAT_JOIN_COUNTS_GLOBAL:
-                y_binary = self.binarize_values(y)
-                jc = self.calculate_join_counts_global(y_binary, w)
-                QgsMessageLog.logMessage(
-                    f"Join Counts BB: {jc.bb:.4f}, p={jc.p_sim_bb:.4f}",
-                    "GeoPublicHealth",
-                    Qgis.Info,
-                )
-                self.create_output_features(file_writer, jc)
-                self.set_summary_text(
-                    tr("Join Counts (Global)")
-                    + f"\nBB={jc.bb:.4f} (p={jc.p_sim_bb:.4f})"
-                    + f"\nWW={jc.ww:.4f}"
-                    + f"\nBW={jc.bw:.4f} (p={jc.p_sim_bw:.4f})"
-                )
-            elif self.statistic_type == STAT_JOIN_COUNTS_LOCAL:
-                y_binary = self.binarize_values(y)
-                jc_local = self.calculate_join_counts_local(y_binary, w)
-                self.create_output_features(file_writer, jc_local)
-                self.set_summary_text(tr("Local statistic; see output layer fields."))
-            del file_writer
+                self.statistic_type = self.get_statistic_type()
+                field = self.cbx_indicator_field.currentField()
+                field_names = [field]
+                if self.statistic_type == STAT_MORAN_RATE:
+                    population_field = None
+                    if hasattr(self, "cbx_population_field"):
+                        population_field = self.cbx_population_field.currentField()
+                    if not population_field:
+                        raise GeoPublicHealthException(
+                            msg=tr("Population field is required for Moran Rate.")
+                        )
+                    field_names.append(population_field)
+                if self.statistic_type in (STAT_MORAN_BV_GLOBAL, STAT_MORAN_BV_LOCAL):
+                    secondary_field = None
+                    if hasattr(self, "cbx_secondary_field"):
+                        secondary_field = self.cbx_secondary_field.currentField()
+                    if not secondary_field:
+                        raise GeoPublicHealthException(
+                            msg=tr("Second field is required for bivariate Moran.")
+                        )
+                    field_names.append(secondary_field)
+
+                self.check_existing_field(fields)
+                self.append_new_fields(fields)
+                self.output_label = field
+
+            self.start_task(fields, field_names, batch_statistics)
+
+        except GeoPublicHealthException as e:
+            display_message_bar(msg=e.msg, level=e.level, duration=e.duration)
+        except Exception as e:
+            display_message_bar(
+                f"{tr('Error processing autocorrelation:')} {str(e)}",
+                level=Qgis.Critical,
+            )
+            traceback.print_exc()
+
+    def start_task(self, fields, field_names, batch_statistics=None):
+        """
+        Start the read, weights, statistic and write stages in a QgsTask.
+
+        Widgets and the layer are only read here, on the GUI thread.
+
+        Args:
+            fields: Source fields followed by the new result fields
+            field_names: Indicator field, then the population or second field
+            batch_statistics: Statistics of a batch run
+        """
+        # Used by the fallback weights builders from the task
+        self.layer_source = self.admin_layer.source()
+        self.layer_crs = self.admin_layer.crs()
+        self.contiguity_index = 0  # Default to Queen
+        if hasattr(self, "cbx_contiguity"):
+            self.contiguity_index = self.cbx_contiguity.currentIndex()
+
+        binary_auto = False
+        if hasattr(self, "cbx_binary_auto"):
+            binary_auto = self.cbx_binary_auto.isChecked()
+        binary_threshold = None
+        if hasattr(self, "sbx_binary_threshold"):
+            binary_threshold = self.sbx_binary_threshold.value()
+
+        self.current_task = AutocorrelationTask(
+            tr("Spatial autocorrelation for ") + self.admin_layer.name(),
+            QgsVectorLayerFeatureSource(self.admin_layer),
+            fields,
+            self.layer_crs,
+            QgsProject.instance().transformContext(),
+            self.output_file_path,
+            self.get_output_layer_name(self.output_label),
+            self.statistic_type,
+            field_names,
+            rook=self.contiguity_index != 0,
+            batch_statistics=batch_statistics,
+            batch_columns=self.output_columns,
+            binary_auto=binary_auto,
+            binary_threshold=binary_threshold,
+            weights_fallback=self.get_weights_fallback,
+        )
+
+        # Connect signals
+        self.current_task.autocorrelationProgress.connect(self.update_progress)
+        self.current_task.autocorrelationFinished.connect(self.task_finished)
+
+        self.prepare_run()
+        self.set_summary_text(tr("Running analysis..."))
+
+        # Add to task manager
+        QgsApplication.taskManager().addTask(self.current_task)
+
+    def update_progress(self, value: float):
+        """Slot to update progress UI elements.
+
+        Args:
+            value: Progress value (0-100)
+        """
+        if hasattr(self, "progressBar"):
+            self.progressBar.setValue(int(value))
+        if hasattr(self, "label_progress"):
+            self.label_progress.setText(f"{tr('Processing...')} {int(value)}%")
+
+    def task_finished(
+        self, success: bool, result_data: Optional[Dict[str, Any]], message: str
+    ):
+        """Slot executed when the background task completes.
+
+        Args:
+            success: Whether the task completed successfully
+            result_data: Result data dictionary or None on failure
+            message: Output file path, or error message
+        """
+        self.current_task = None
+        self.end_run()
+
+        if not success:
+            self.set_summary_text(message)
+            display_message_bar(
+                f"{tr('Processing failed or cancelled:')}\n{message}",
+                level=Qgis.Critical,
+            )
+            return
+
+        try:
+            self.output_file_path = message
 
             # Create output layer and add symbology
-            self.output_layer = self.create_output_layer(field)
+            self.output_layer = self.create_output_layer(self.output_label)
             QgsProject.instance().addMapLayer(self.output_layer)
-            self.add_symbology()
+            if self.statistic_type == STAT_BATCH:
+                self.add_batch_symbology(self.output_columns)
+            else:
+                self.add_symbology()
+
+            self.set_summary_text(result_data[AutocorrelationTask.RESULT_SUMMARY])
 
             # Success message
             self.signalStatus.emit(3, tr("Successful process"))
@@ -569,22 +1237,46 @@ class CommonAutocorrelationDialog(QDialog):
                 level=Qgis.Critical,
             )
             traceback.print_exc()
-        finally:
-            self.end_run()
+
+    def cancel_task_and_close(self):
+        """Handles Cancel button click: cancels task if running, else closes."""
+        if self.current_task is not None and self.current_task.isActive():
+            display_message_bar(
+                tr("Attempting to cancel running task..."), level=Qgis.Info
+            )
+            self.current_task.cancel()
+            return
+
+        self.hide()
+        self.signalAskCloseWindow.emit(0)
 
     def prepare_run(self):
-        """Prepare UI for processing."""
+        """Prepare UI while the task is running."""
         if hasattr(self, "button_box_ok"):
-            self.button_box_ok.setDisabled(True)
-        QApplication.setOverrideCursor(Qt.WaitCursor)
-        QApplication.processEvents()
+            ok_button = self.button_box_ok.button(QDialogButtonBox.Ok)
+            cancel_button = self.button_box_ok.button(QDialogButtonBox.Cancel)
+            if ok_button:
+                ok_button.setEnabled(False)
+            if cancel_button:
+                cancel_button.setText(tr("Cancel Task"))
+        self.set_progress_visible(True)
+        self.update_progress(0)
 
     def end_run(self):
         """Reset UI after processing."""
         if hasattr(self, "button_box_ok"):
-            self.button_box_ok.setDisabled(False)
-        QApplication.restoreOverrideCursor()
-        QApplication.processEvents()
+            ok_button = self.button_box_ok.button(QDialogButtonBox.Ok)
+            cancel_button = self.button_box_ok.button(QDialogButtonBox.Cancel)
+            if ok_button:
+                ok_button.setEnabled(True)
+            if cancel_button:
+                cancel_button.setText(tr("Cancel"))
+        self.set_progress_visible(False)
+
+    def set_progress_visible(self, visible):
+        for widget_name in ("progressBar", "label_progress"):
+            if hasattr(self, widget_name):
+                getattr(self, widget_name).setVisible(visible)
 
     def check_layer_and_file_path(self):
         """Validate layer and output path."""
@@ -609,6 +1301,10 @@ class CommonAutocorrelationDialog(QDialog):
     def get_statistic_type(self):
         if hasattr(self, "cbx_statistic"):
             stat_text = self.cbx_statistic.currentText().strip().lower()
+            if "large" in stat_text and "geary" in stat_text:
+                return STAT_GEARY_GLOBAL_LARGE
+            if "large" in stat_text:
+                return STAT_MORAN_GLOBAL_LARGE
             if "geary" in stat_text:
                 return STAT_GEARY
             if "getis" in stat_text or "g (local)" in stat_text:
@@ -627,6 +1323,58 @@ class CommonAutocorrelationDialog(QDialog):
                 return STAT_MORAN_GLOBAL
         return STAT_MORAN
 
+    def is_batch_mode(self):
+        return hasattr(self, "cbx_batch_mode") and self.cbx_batch_mode.isChecked()
+
+    def get_batch_fields(self):
+        if not hasattr(self, "cbx_batch_fields"):
+            return []
+        return list(self.cbx_batch_fields.checkedItems())
+
+    def get_batch_statistics(self):
+        statistics = []
+        for statistic, widget_name in (
+            (STAT_MORAN, "chk_batch_moran"),
+            (STAT_G_LOCAL, "chk_batch_g_local"),
+            (STAT_GEARY, "chk_batch_geary"),
+        ):
+            widget = getattr(self, widget_name, None)
+            if widget is not None and widget.isChecked():
+                statistics.append(statistic)
+        return statistics
+
+    def get_batch_columns(self, field_names, statistics):
+        """
+        List the output columns of a batch run.
+
+        GeoPackage columns are prefixed with the field name, Shapefile
+        columns are suffixed with the field position to fit in 10 characters.
+
+        Returns:
+            list: (column name, statistic, result key, field position) tuples
+        """
+        is_gpkg = self.output_file_path.lower().endswith(".gpkg")
+        columns = []
+        for position, field_name in enumerate(field_names):
+            for statistic in statistics:
+                for name, key in BATCH_OUTPUT_FIELDS[statistic]:
+                    if is_gpkg:
+                        column = f"{field_name}_{name}"
+                    else:
+                        column = f"{name}{position + 1}"
+                    columns.append((column, statistic, key, position))
+        return columns
+
+    def update_batch_fields(self, layer):
+        if not hasattr(self, "cbx_batch_fields"):
+            return
+        self.cbx_batch_fields.clear()
+        if layer is None:
+            return
+        self.cbx_batch_fields.addItems(
+            [field.name() for field in layer.fields() if field.isNumeric()]
+        )
+
     def get_output_field_names(self):
         if self.statistic_type == STAT_MORAN:
             return ["LISA_P", "LISA_Z", "LISA_Q", "LISA_I", "LISA_C"]
@@ -646,6 +1394,10 @@ class CommonAutocorrelationDialog(QDialog):
             return ["JC_BB", "JC_WW", "JC_BW", "JC_PBB", "JC_PBW", "JC_S"]
         if self.statistic_type == STAT_JOIN_COUNTS_LOCAL:
             return ["LJC", "LJC_P", "LJC_S"]
+        if self.statistic_type == STAT_MORAN_GLOBAL_LARGE:
+            return ["MORAN_I", "MORAN_Z", "MORAN_P", "MORAN_S"]
+        if self.statistic_type == STAT_GEARY_GLOBAL_LARGE:
+            return ["GEARY_C", "GEARY_Z", "GEARY_P", "GEARY_S"]
         return ["LISA_P", "LISA_Z", "LISA_Q", "LISA_I", "LISA_C"]
 
     def get_output_layer_prefix(self):
@@ -667,6 +1419,12 @@ class CommonAutocorrelationDialog(QDialog):
             return "JC"
         if self.statistic_type == STAT_JOIN_COUNTS_LOCAL:
             return "LJC"
+        if self.statistic_type == STAT_MORAN_GLOBAL_LARGE:
+            return "MORAN"
+        if self.statistic_type == STAT_GEARY_GLOBAL_LARGE:
+            return "GEARYC"
+        if self.statistic_type == STAT_BATCH:
+            return "BATCH"
         return "LISA"
 
     def get_output_layer_title(self, field):
@@ -688,10 +1446,17 @@ class CommonAutocorrelationDialog(QDialog):
             return f"Join Counts Global - {field}"
         if self.statistic_type == STAT_JOIN_COUNTS_LOCAL:
             return f"Join Counts Local - {field}"
+        if self.statistic_type == STAT_MORAN_GLOBAL_LARGE:
+            return f"Moran Global - {field}"
+        if self.statistic_type == STAT_GEARY_GLOBAL_LARGE:
+            return f"Geary Global - {field}"
+        if self.statistic_type == STAT_BATCH:
+            return f"Batch autocorrelation - {field}"
         return f"LISA Moran's I - {field}"
 
     def update_statistic_controls(self):
         stat_type = self.get_statistic_type()
+        is_batch = self.is_batch_mode()
         is_rate = stat_type == STAT_MORAN_RATE
         is_bivariate = stat_type in (STAT_MORAN_BV_GLOBAL, STAT_MORAN_BV_LOCAL)
         is_join = stat_type in (STAT_JOIN_COUNTS_GLOBAL, STAT_JOIN_COUNTS_LOCAL)
@@ -711,7 +1476,9 @@ class CommonAutocorrelationDialog(QDialog):
 
         if hasattr(self, "label_statistic_hint"):
             hint = tr("(Local)")
-            if stat_type in (STAT_MORAN_GLOBAL, STAT_MORAN_BV_GLOBAL):
+            if stat_type in (STAT_MORAN_GLOBAL, STAT_MORAN_BV_GLOBAL) or (
+                stat_type in LARGE_STATISTICS
+            ):
                 hint = tr("(Global)")
             self.label_statistic_hint.setText(hint)
 
@@ -724,6 +1491,20 @@ class CommonAutocorrelationDialog(QDialog):
         if hasattr(self, "label_binary_auto"):
             self.label_binary_auto.setEnabled(is_join)
 
+        for widget_name in (
+            "cbx_batch_fields",
+            "label_batch_fields",
+            "label_batch_statistics",
+            "chk_batch_moran",
+            "chk_batch_g_local",
+            "chk_batch_geary",
+        ):
+            if hasattr(self, widget_name):
+                getattr(self, widget_name).setEnabled(is_batch)
+        for widget_name in ("cbx_indicator_field", "cbx_statistic"):
+            if hasattr(self, widget_name):
+                getattr(self, widget_name).setEnabled(not is_batch)
+
     def update_help_text(self):
         stat_type = self.get_statistic_type()
         help_map = {
@@ -736,6 +1517,8 @@ class CommonAutocorrelationDialog(QDialog):
             STAT_MORAN_BV_LOCAL: "moran_bv_local",
             STAT_JOIN_COUNTS_GLOBAL: "join_counts_global",
             STAT_JOIN_COUNTS_LOCAL: "join_counts_local",
+            STAT_MORAN_GLOBAL_LARGE: "moran_global_large",
+            STAT_GEARY_GLOBAL_LARGE: "geary_global_large",
         }
         help_key = help_map.get(stat_type, "moran")
         if hasattr(self, "label_stat_help"):
@@ -749,6 +1532,8 @@ class CommonAutocorrelationDialog(QDialog):
                 "moran_bv_local": tr("Moran BV (Local): co-location clusters."),
                 "join_counts_global": tr("Join Counts: global binary clustering."),
                 "join_counts_local": tr("Join Counts (Local): binary clusters."),
+                "moran_global_large": tr("Moran (Global): sparse, large layers."),
+                "geary_global_large": tr("Geary (Global): sparse, large layers."),
             }
             self.label_stat_help.setText(short_help.get(help_key, ""))
 
@@ -759,36 +1544,6 @@ class CommonAutocorrelationDialog(QDialog):
         if hasattr(self, "te_summary"):
             self.te_summary.setPlainText(text)
 
-    def binarize_values(self, values):
-        auto_binary = False
-        if hasattr(self, "cbx_binary_auto"):
-            auto_binary = self.cbx_binary_auto.isChecked()
-
-        if auto_binary:
-            values_array = np.asarray(values)
-            valid = values_array[np.isfinite(values_array)]
-            unique_values = np.unique(valid)
-            if set(unique_values.tolist()).issubset({0, 1}):
-                return (values_array == 1).astype(int)
-
-            QgsMessageLog.logMessage(
-                tr("Binary auto-detect failed; using threshold."),
-                "GeoPublicHealth",
-                Qgis.Warning,
-            )
-
-        if not hasattr(self, "sbx_binary_threshold"):
-            return (values > 0).astype(int)
-
-        threshold = self.sbx_binary_threshold.value()
-        return (values >= threshold).astype(int)
-
-    @staticmethod
-    def _hotspot_class(z_value, p_value):
-        if p_value > 0.05:
-            return 0
-        return 1 if z_value > 0 else -1
-
     def check_existing_field(self, fields):
         """Check if output fields already exist in the layer."""
         for field_name in self.get_output_field_names():
@@ -818,11 +1573,16 @@ class CommonAutocorrelationDialog(QDialog):
             fields.append(QgsField("G_Z", 6, "Real", 10, 6))
             fields.append(QgsField("G_P", 6, "Real", 10, 6))
             fields.append(QgsField("G_HOT", 2, "Integer", 1, 0))
-        elif self.statistic_type == STAT_MORAN_GLOBAL:
+        elif self.statistic_type in (STAT_MORAN_GLOBAL, STAT_MORAN_GLOBAL_LARGE):
             fields.append(QgsField("MORAN_I", 6, "Real", 10, 6))
             fields.append(QgsField("MORAN_Z", 6, "Real", 10, 6))
             fields.append(QgsField("MORAN_P", 6, "Real", 10, 6))
             fields.append(QgsField("MORAN_S", 2, "Integer", 1, 0))
+        elif self.statistic_type == STAT_GEARY_GLOBAL_LARGE:
+            fields.append(QgsField("GEARY_C", 6, "Real", 10, 6))
+            fields.append(QgsField("GEARY_Z", 6, "Real", 10, 6))
+            fields.append(QgsField("GEARY_P", 6, "Real", 10, 6))
+            fields.append(QgsField("GEARY_S", 2, "Integer", 1, 0))
         elif self.statistic_type == STAT_MORAN_BV_GLOBAL:
             fields.append(QgsField("MBV_I", 6, "Real", 10, 6))
             fields.append(QgsField("MBV_Z", 6, "Real", 10, 6))
@@ -846,40 +1606,23 @@ class CommonAutocorrelationDialog(QDialog):
             fields.append(QgsField("LJC_P", 6, "Real", 10, 6))
             fields.append(QgsField("LJC_S", 2, "Integer", 1, 0))
 
-    def prepare_file_writer(self, fields, crs_admin_layer):
-        """Prepare the output file writer."""
-        # Determine output format based on file extension
-        output_ext = os.path.splitext(self.output_file_path)[1].lower()
-        driver_name = "GPKG" if output_ext == ".gpkg" else "ESRI Shapefile"
-
-        # Setup save options
-        save_options = QgsVectorFileWriter.SaveVectorOptions()
-        save_options.driverName = driver_name
-        save_options.encoding = "UTF-8"
-
-        # If it's a GPKG, set the layer name
-        if driver_name == "GPKG":
-            field_name = self.cbx_indicator_field.currentField()
-            layer_prefix = self.get_output_layer_prefix()
-            save_options.layerName = f"{layer_prefix}_{field_name}".replace(" ", "_")
+    def get_output_layer_name(self, field):
+        """GeoPackage layer name of the output."""
+        return f"{self.get_output_layer_prefix()}_{field}".replace(" ", "_")
 
-        # Create the vector file writer
-        file_writer = QgsVectorFileWriter.create(
-            self.output_file_path,
-            fields,
-            QgsWkbTypes.Polygon,
-            crs_admin_layer,
-            QgsProject.instance().transformContext(),
-            save_options,
-        )
+    def get_weights_fallback(self):
+        """
+        Get spatial weights with the GeoPandas or legacy shapefile readers.
 
-        if file_writer.hasError():
-            error_message = file_writer.errorMessage()
-            raise GeoPublicHealthException(
-                msg=f"Error creating output file: {error_message}"
-            )
+        Only uses the layer settings captured in start_task, so it can be
+        called from the background task.
 
-        return file_writer
+        Returns:
+            libpysal.weights: Spatial weights matrix
+        """
+        if GEOPANDAS_AVAILABLE:
+            return self.get_weights_modern()
+        return self.get_weights_legacy()
 
     def get_weights_modern(self):
         """
@@ -889,11 +1632,9 @@ class CommonAutocorrelationDialog(QDialog):
             libpysal.weights: Spatial weights matrix
         """
         try:
-            contiguity_index = 0  # Default to Queen
-            if hasattr(self, "cbx_contiguity"):
-                contiguity_index = self.cbx_contiguity.currentIndex()
+            contiguity_index = self.contiguity_index
 
-            source = self.admin_layer.source()
+            source = self.layer_source
             gdf = self._read_geopandas_layer(source)
 
             # Create weights matrix
@@ -975,7 +1716,7 @@ class CommonAutocorrelationDialog(QDialog):
             )
 
         if gdf.crs is None:
-            layer_crs = self.admin_layer.crs()
+            layer_crs = self.layer_crs
             if layer_crs and layer_crs.isValid():
                 crs_value = layer_crs.authid() or layer_crs.toWkt()
                 self._set_geopandas_crs(gdf, crs_value)
@@ -1026,7 +1767,7 @@ class CommonAutocorrelationDialog(QDialog):
         gdf = self._ensure_geopandas_geometry(gdf)
 
         if gdf.crs is None:
-            layer_crs = self.admin_layer.crs()
+            layer_crs = self.layer_crs
             if layer_crs and layer_crs.isValid():
                 crs_value = layer_crs.authid() or layer_crs.toWkt()
 
@@ -1044,11 +1785,9 @@ class CommonAutocorrelationDialog(QDialog):
             libpysal.weights: Spatial weights matrix
         """
         try:
-            contiguity_index = 0  # Default to Queen
-            if hasattr(self, "cbx_contiguity"):
-                contiguity_index = self.cbx_contiguity.currentIndex()
+            contiguity_index = self.contiguity_index
 
-            source = self.admin_layer.source()
+            source = self.layer_source
 
             # Legacy approach only works with shapefiles
             if not source.lower().endswith(".shp"):
@@ -1084,7 +1823,7 @@ class CommonAutocorrelationDialog(QDialog):
             numpy.ndarray: Array of indicator values
         """
         try:
-            source = self.admin_layer.source()
+            source = self.layer_source
             gdf = self._read_geopandas_layer(source)
 
             # Get values of the specified field
@@ -1120,7 +1859,7 @@ class CommonAutocorrelationDialog(QDialog):
             numpy.ndarray: Array of indicator values
         """
         try:
-            source = self.admin_layer.source()
+            source = self.layer_source
 
             # Legacy approach only works with shapefiles
             if not source.lower().endswith(".shp"):
@@ -1145,208 +1884,6 @@ class CommonAutocorrelationDialog(QDialog):
             )
             raise
 
-    def calculate_moran_local(self, y, w):
-        """
-        Calculate Local Moran's I statistics.
-
-        Args:
-            y: Array of indicator values
-            w: Spatial weights matrix
-
-        Returns:
-            esda.moran.Moran_Local: Local Moran's I statistics
-        """
-        try:
-            return autocorrelation_service.moran_local(
-                y,
-                w,
-                permutations=999,
-                transformation="r",
-            )
-        except Exception as e:
-            error_msg = tr("Error calculating Local Moran's I:")
-            display_message_bar(f"{error_msg} {str(e)}", level=Qgis.Critical)
-            raise
-
-    def calculate_moran_global(self, y, w):
-        try:
-            return autocorrelation_service.moran_global(
-                y,
-                w,
-                permutations=999,
-                transformation="r",
-            )
-        except Exception as e:
-            error_msg = tr("Error calculating Global Moran's I:")
-            display_message_bar(f"{error_msg} {str(e)}", level=Qgis.Critical)
-            raise
-
-    def calculate_moran_bv_global(self, x, y, w):
-        try:
-            return autocorrelation_service.moran_bv_global(
-                x,
-                y,
-                w,
-                permutations=999,
-                transformation="r",
-            )
-        except Exception as e:
-            error_msg = tr("Error calculating Bivariate Moran's I:")
-            display_message_bar(f"{error_msg} {str(e)}", level=Qgis.Critical)
-            raise
-
-    def calculate_moran_bv_local(self, x, y, w):
-        try:
-            return autocorrelation_service.moran_bv_local(
-                x,
-                y,
-                w,
-                permutations=999,
-                transformation="r",
-            )
-        except Exception as e:
-            error_msg = tr("Error calculating Bivariate Local Moran's I:")
-            display_message_bar(f"{error_msg} {str(e)}", level=Qgis.Critical)
-            raise
-
-    def calculate_join_counts_global(self, y, w):
-        try:
-            return autocorrelation_service.join_counts_global(
-                y,
-                w,
-                permutations=999,
-            )
-        except Exception as e:
-            error_msg = tr("Error calculating Join Counts:")
-            display_message_bar(f"{error_msg} {str(e)}", level=Qgis.Critical)
-            raise
-
-    def calculate_join_counts_local(self, y, w):
-        try:
-            return autocorrelation_service.join_counts_local(
-                y,
-                w,
-                permutations=999,
-                n_jobs=1,
-            )
-        except Exception as e:
-            error_msg = tr("Error calculating Local Join Counts:")
-            display_message_bar(f"{error_msg} {str(e)}", level=Qgis.Critical)
-            raise
-
-    def calculate_geary_local(self, y, w):
-        try:
-            return autocorrelation_service.geary_local(
-                y,
-                w,
-                permutations=999,
-                n_jobs=1,
-            )
-        except Exception as e:
-            error_msg = tr("Error calculating Local Geary:")
-            display_message_bar(f"{error_msg} {str(e)}", level=Qgis.Critical)
-            raise
-
-    def calculate_g_local(self, y, w):
-        try:
-            return autocorrelation_service.g_local(
-                y,
-                w,
-                permutations=999,
-                n_jobs=1,
-            )
-        except Exception as e:
-            error_msg = tr("Error calculating Getis-Ord G:")
-            display_message_bar(f"{error_msg} {str(e)}", level=Qgis.Critical)
-            raise
-
-    def calculate_moran_rate(self, events, population, w):
-        try:
-            return autocorrelation_service.moran_rate(
-                events,
-                population,
-                w,
-                permutations=999,
-            )
-        except Exception as e:
-            error_msg = tr("Error calculating Moran Rate:")
-            display_message_bar(f"{error_msg} {str(e)}", level=Qgis.Critical)
-            raise
-
-    def create_output_features(self, file_writer, stats, sig_q=None):
-        """
-        Create output features with LISA statistics.
-
-        Args:
-            file_writer: QgsVectorFileWriter
-            lm: Local Moran's I statistics
-            sig_q: Significant quadrants
-        """
-        try:
-            for i, feature in enumerate(self.admin_layer.getFeatures()):
-                attributes = feature.attributes()
-
-                if self.statistic_type == STAT_MORAN:
-                    attributes.append(float(stats.p_sim[i]))
-                    attributes.append(float(stats.z_sim[i]))
-                    attributes.append(int(stats.q[i]))
-                    attributes.append(float(stats.Is[i]))
-                    attributes.append(int(sig_q[i]))
-                elif self.statistic_type == STAT_MORAN_RATE:
-                    attributes.append(float(stats.p_sim[i]))
-                    attributes.append(float(stats.z_sim[i]))
-                    attributes.append(int(stats.q[i]))
-                    attributes.append(float(stats.Is[i]))
-                    attributes.append(int(sig_q[i]))
-                elif self.statistic_type == STAT_GEARY:
-                    attributes.append(float(stats.localG[i]))
-                    attributes.append(float(stats.p_sim[i]))
-                    attributes.append(int(stats.p_sim[i] <= 0.05))
-                elif self.statistic_type == STAT_G_LOCAL:
-                    attributes.append(float(stats.Gs[i]))
-                    attributes.append(float(stats.Zs[i]))
-                    attributes.append(float(stats.p_sim[i]))
-                    attributes.append(self._hotspot_class(stats.Zs[i], stats.p_sim[i]))
-                elif self.statistic_type == STAT_MORAN_GLOBAL:
-                    attributes.append(float(stats.I))
-                    attributes.append(float(stats.z_sim))
-                    attributes.append(float(stats.p_sim))
-                    attributes.append(int(stats.p_sim <= 0.05))
-                elif self.statistic_type == STAT_MORAN_BV_GLOBAL:
-                    attributes.append(float(stats.I))
-                    attributes.append(float(stats.z_sim))
-                    attributes.append(float(stats.p_sim))
-                    attributes.append(int(stats.p_sim <= 0.05))
-                elif self.statistic_type == STAT_MORAN_BV_LOCAL:
-                    attributes.append(float(stats.p_sim[i]))
-                    attributes.append(float(stats.z_sim[i]))
-                    attributes.append(int(stats.q[i]))
-                    attributes.append(float(stats.Is[i]))
-                    attributes.append(int(sig_q[i]))
-                elif self.statistic_type == STAT_JOIN_COUNTS_GLOBAL:
-                    attributes.append(float(stats.bb))
-                    attributes.append(float(stats.ww))
-                    attributes.append(float(stats.bw))
-                    attributes.append(float(stats.p_sim_bb))
-                    attributes.append(float(stats.p_sim_bw))
-                    attributes.append(int(stats.p_sim_bb <= 0.05))
-                elif self.statistic_type == STAT_JOIN_COUNTS_LOCAL:
-                    attributes.append(float(stats.LJC[i]))
-                    attributes.append(float(stats.p_sim[i]))
-                    attributes.append(int(stats.p_sim[i] <= 0.05))
-
-                new_feature = QgsFeature()
-                new_geom = QgsGeometry(feature.geometry())
-                new_feature.setAttributes(attributes)
-                new_feature.setGeometry(new_geom)
-
-                file_writer.addFeature(new_feature)
-        except Exception as e:
-            display_message_bar(
-                f"{tr('Error creating output features:')} {str(e)}", level=Qgis.Critical
-            )
-            raise
-
     def create_output_layer(self, field):
         """
         Create output layer from the output file.
@@ -1365,8 +1902,7 @@ class CommonAutocorrelationDialog(QDialog):
 
         # Construct layer URI
         if is_gpkg:
-            layer_prefix = self.get_output_layer_prefix()
-            layer_name = f"{layer_prefix}_{field}".replace(" ", "_")
+            layer_name = self.get_output_layer_name(field)
             layer_uri = f"{self.output_file_path}|layername={layer_name}"
         else:
             layer_uri = self.output_file_path
@@ -1384,10 +1920,46 @@ class CommonAutocorrelationDialog(QDialog):
 
         return output_layer
 
+    def add_batch_symbology(self, columns):
+        """Style a batch output layer on its first significance column."""
+        try:
+            column, statistic = next(
+                (column, statistic)
+                for column, statistic, key, __ in columns
+                if key == "sig"
+            )
+            if statistic == STAT_MORAN:
+                classes = dict(self.lisa)
+            elif statistic == STAT_G_LOCAL:
+                classes = {
+                    1: ("#b92815", tr("Hotspot")),
+                    -1: ("#3f70df", tr("Coldspot")),
+                }
+            else:
+                classes = {1: ("#b92815", tr("Significant"))}
+            classes[0] = ("#c0c0c0", tr("Not significant"))
+
+            categories = []
+            for value, (color, label) in classes.items():
+                sym = QgsSymbol.defaultSymbol(self.output_layer.geometryType())
+                sym.setColor(QColor(color))
+                categories.append(QgsRendererCategory(value, sym, label))
+
+            renderer = QgsCategorizedSymbolRenderer(column, categories)
+            self.output_layer.setRenderer(renderer)
+            self.output_layer.triggerRepaint()
+        except Exception as e:
+            display_message_bar(
+                f"{tr('Error applying symbology:')} {str(e)}", level=Qgis.Critical
+            )
+            traceback.print_exc()
+
     def add_symbology(self):
         """Add symbology to the output layer."""
         try:
-            if self.statistic_type in (STAT_MORAN_GLOBAL, STAT_MORAN_BV_GLOBAL):
+            if self.statistic_type in (STAT_MORAN_GLOBAL, STAT_MORAN_BV_GLOBAL) or (
+                self.statistic_type in LARGE_STATISTICS
+            ):
                 categories = []
                 for value, (color, label) in {
                     1: ("#b92815", tr("Significant")),
@@ -1400,6 +1972,8 @@ class CommonAutocorrelationDialog(QDialog):
                 field_name = "MORAN_S"
                 if self.statistic_type == STAT_MORAN_BV_GLOBAL:
                     field_name = "MBV_S"
+                if self.statistic_type == STAT_GEARY_GLOBAL_LARGE:
+                    field_name = "GEARY_S"
                 renderer = QgsCategorizedSymbolRenderer(field_name, categories)
                 self.output_layer.setRenderer(renderer)
                 return
@@ -1479,9 +2053,7 @@ class CommonAutocorrelationDialog(QDialog):
             # Create a new layer
             if is_gpkg:
                 # For GeoPackage, clone the original layer
-                field_name = self.cbx_indicator_field.currentField()
-                layer_prefix = self.get_output_layer_prefix()
-                new_layer_name = f"{layer_prefix}_{field_name}_sig".replace(" ", "_")
+                new_layer_name = self.get_output_layer_name(self.output_label) + "_sig"
 
                 # Need to create a new copy in the GeoPackage
                 options = QgsVectorFileWriter.SaveVectorOptions()
@@ -25,13 +25,22 @@
 import os
 from os.path import dirname, basename
 import traceback  # For debugging unexpected errors
+from typing import Optional
+
+import numpy as np
 
 # QGIS Imports
 from qgis.core import (
+    QgsApplication,
+    QgsFeatureRequest,
     QgsField,
     QgsFields,
+    QgsMessageLog,
+    QgsTask,
     QgsVectorFileWriter,
+    QgsVectorLayerFeatureSource,
     QgsProject,
+    QgsRectangle,
     QgsVectorLayer,
     QgsMapLayerProxyModel,
     QgsWkbTypes,
@@ -44,11 +53,11 @@ from qgis.gui import QgsMessageBar
 from qgis.utils import iface
 
 # PyQt Imports
-from qgis.PyQt.QtWidgets import QWidget, QDialogButtonBox, QApplication
-from qgis.PyQt.QtCore import pyqtSignal, QSettings, QVariant, Qt  # <-- Added Qt import
+from qgis.PyQt.QtWidgets import QWidget, QDialogButtonBox
+from qgis.PyQt.QtCore import pyqtSignal, QSettings, QVariant
 
 # Plugin Imports
-from geopublichealth.src.core.blurring.layer_index import LayerIndex
+from geopublichealth.src.core.blurring.layer_index import LAYER_INDEX_CACHE
 from geopublichealth.src.core.blurring.blur import Blur
 from geopublichealth.src.core.tools import (
     display_message_bar,
@@ -63,7 +72,6 @@ from geopublichealth.src.core.exceptions import (
     NoFileNoDisplayException,
     DifferentCrsException,
     CreatingShapeFileException,
-    PointOutsideEnvelopeException,  # Added for specific exception handling
 )
 from geopublichealth.src.utilities.resources import get_ui_class
 
@@ -71,6 +79,153 @@ from geopublichealth.src.utilities.resources import get_ui_class
 FORM_CLASS = get_ui_class("analysis", "blur.ui")
 
 
+class BlurTask(QgsTask):
+    """Background task streaming the features of a layer through Blur.
+
+    Features are blurred by batches with ``Blur.blur_batch``, so the random
+    offsets and the buffers of a batch are computed at once.
+    """
+
+    blurFinished = pyqtSignal(bool, object, str)  # success, results, message
+    blurProgress = pyqtSignal(float)  # Current progress (0-100)
+
+    # Result data keys
+    RESULT_COUNT = "count"
+    RESULT_OUTSIDE = "outside"
+
+    # Features blurred and given to the file writer at once
+    WRITE_BATCH_SIZE = 5000
+    # Ids of the points outside the envelope reported in the message
+    MAX_REPORTED_IDS = 10
+
+    def __init__(
+        self,
+        description: str,
+        layer: QgsVectorLayer,
+        algo: Blur,
+        file_name: str,
+        out_fields: QgsFields,
+        save_options: QgsVectorFileWriter.SaveVectorOptions,
+        selected_features_only: bool = False,
+    ):
+        """Initialize the task, in the main thread.
+
+        The features are read in the background from a snapshot of the
+        layer (QgsVectorLayerFeatureSource), one batch at a time, so the
+        layer is never loaded in memory at once.
+        """
+        super().__init__(description, QgsTask.CanCancel)
+
+        self.source = QgsVectorLayerFeatureSource(layer)
+        self.request = QgsFeatureRequest()
+        if selected_features_only:
+            self.request.setFilterFids(layer.selectedFeatureIds())
+            self.feature_count = layer.selectedFeatureCount()
+        else:
+            self.feature_count = layer.featureCount()
+        self.crs = layer.crs()
+        self.algo = algo
+        self.file_name = file_name
+        self.out_fields = out_fields
+        self.save_options = save_options
+
+        # Output/state variables
+        self.exception = None
+        self.blurred_count = 0
+        self.outside_ids = []
+
+    def run(self) -> bool:
+        """Blur and write the features, in the background thread."""
+        writer = None
+        try:
+            writer = QgsVectorFileWriter.create(
+                self.file_name,
+                self.out_fields,
+                QgsWkbTypes.Polygon,
+                self.crs,
+                QgsCoordinateTransformContext(),
+                self.save_options,
+            )
+            if writer.hasError():
+                raise CreatingShapeFileException(suffix=f": {writer.errorMessage()}")
+
+            rng = np.random.default_rng()
+            batch = []
+            last_progress = -1
+            for i, feature in enumerate(self.source.getFeatures(self.request)):
+                if self.isCanceled():
+                    return False
+
+                batch.append(feature)
+                if len(batch) >= self.WRITE_BATCH_SIZE:
+                    self.blur_batch(writer, batch, rng)
+                    batch = []
+
+                    # Only emit when the integer percentage changes
+                    progress = int((i + 1) * 100 / max(self.feature_count, 1))
+                    if progress != last_progress:
+                        last_progress = progress
+                        self.setProgress(progress)
+                        self.blurProgress.emit(progress)
+
+            if batch:
+                self.blur_batch(writer, batch, rng)
+            return not self.isCanceled()
+
+        except Exception as e:
+            self.exception = e
+            QgsMessageLog.logMessage(
+                f"Blurring task failed: {str(e)}\n{traceback.format_exc()}",
+                "GeoPublicHealth",
+                Qgis.Critical,
+            )
+            return False
+        finally:
+            # Flush and close the output file
+            del writer
+
+    def blur_batch(self, writer, features, rng):
+        """Blur a batch of features and write them.
+
+        Points outside the envelope, or which can not be moved by the
+        minimum displacement inside it, are skipped and their ids kept.
+        """
+        points = [feature.geometry().asPoint() for feature in features]
+        for blurred, outside_ids in self.algo.blur_batch(
+            [point.x() for point in points],
+            [point.y() for point in points],
+            attributes=[feature.attributes() for feature in features],
+            feature_ids=[feature.id() for feature in features],
+            rng=rng,
+            chunk_size=len(features),
+        ):
+            self.outside_ids.extend(outside_ids)
+            if blurred:
+                self.write_batch(writer, blurred)
+
+    def write_batch(self, writer, features):
+        """Write blurred features through the file writer."""
+        if not writer.addFeatures(features):
+            raise CreatingShapeFileException(suffix=f": {writer.errorMessage()}")
+        self.blurred_count += len(features)
+
+    def finished(self, result: bool):
+        """Called in the main thread when run() finishes."""
+        if result:
+            results_dict = {
+                self.RESULT_COUNT: self.blurred_count,
+                self.RESULT_OUTSIDE: self.outside_ids,
+            }
+            self.blurFinished.emit(True, results_dict, self.file_name)
+        else:
+            error_msg = (
+                f"{tr('Task failed:')} {str(self.exception)}"
+                if self.exception
+                else tr("Task cancelled or failed.")
+            )
+            self.blurFinished.emit(False, None, error_msg)
+
+
 class BlurWidget(QWidget, FORM_CLASS):
     """
     Widget for the Blurring tool GUI. Handles user input and triggers the
@@ -85,18 +240,24 @@ class BlurWidget(QWidget, FORM_CLASS):
         self.setupUi(self)
 
         self.label_progress.setText("")
+        self.current_task = None
+        self.display_result = False
         self.checkBox_envelope.setChecked(False)
         self.comboBox_envelope.setEnabled(False)  # Keep disabled until checkbox checked
+        self.checkBox_sampleInEnvelope.setEnabled(False)
 
         # Connect signals to slots
         self.pushButton_browseFolder.clicked.connect(self.select_file)
         self.buttonBox_blur.button(QDialogButtonBox.Ok).clicked.connect(self.run_blur)
         self.buttonBox_blur.button(QDialogButtonBox.Cancel).clicked.connect(
-            self.signalAskCloseWindow.emit
-        )  # Emit signal directly
+            self.cancel_task_or_close
+        )
         self.checkBox_envelope.toggled.connect(
             self.comboBox_envelope.setEnabled
         )  # Enable/disable combo box
+        self.checkBox_envelope.toggled.connect(
+            self.checkBox_sampleInEnvelope.setEnabled
+        )
 
         self.settings = QSettings()
 
@@ -137,26 +298,31 @@ class BlurWidget(QWidget, FORM_CLASS):
             self.lineEdit_outputFile.setText("")
 
     def run_blur(self):
-        """Executes the blurring logic when the OK button is clicked."""
-        self.progressBar_blur.setValue(0)
-        self.label_progress.setText(tr("Starting..."))  # Initial message
-        QApplication.processEvents()  # Show initial message
-        QApplication.setOverrideCursor(Qt.WaitCursor)  # <-- Use imported Qt here
+        """Validates the inputs and starts the blurring task."""
+        if self.current_task is not None:
+            return
 
         # --- Get Parameters from UI ---
         layer_to_blur = self.comboBox_layerToBlur.currentLayer()
         radius = self.spinBox_radius.value()
+        min_radius = self.spinBox_minRadius.value()
         display_result = self.checkBox_addToMap.isChecked()
         selected_features_only = self.checkBox_selectedOnlyFeatures.isChecked()
         file_name = self.lineEdit_outputFile.text().strip()
         export_radius = self.checkBox_exportRadius.isChecked()
         export_centroid = self.checkBox_exportCentroid.isChecked()
         use_envelope = self.checkBox_envelope.isChecked()
+        sample_in_envelope = self.checkBox_sampleInEnvelope.isChecked()
 
         try:
             if not layer_to_blur:
                 raise NoLayerProvidedException
 
+            if min_radius and min_radius >= radius:
+                raise GeoPublicHealthException(
+                    tr("The minimum displacement must be smaller than the radius.")
+                )
+
             envelope_layer = None
             envelope_index = None
             if use_envelope:
@@ -170,11 +336,16 @@ class BlurWidget(QWidget, FORM_CLASS):
                         epsg2=envelope_layer.crs().authid(),
                     )
 
-                envelope_index = LayerIndex(envelope_layer)
-
             if not file_name and not display_result:
                 raise NoFileNoDisplayException
 
+            if selected_features_only:
+                feature_count = layer_to_blur.selectedFeatureCount()
+            else:
+                feature_count = layer_to_blur.featureCount()
+            if not feature_count:
+                raise GeoPublicHealthException(tr("No features to blur."))
+
             if not file_name:
                 file_name = QgsProcessingUtils.generateTempFilename(
                     "geopublichealth_blur.shp"
@@ -188,13 +359,15 @@ class BlurWidget(QWidget, FORM_CLASS):
 
             set_last_input_path(dirname(file_name))
 
-            if selected_features_only:
-                features = layer_to_blur.selectedFeatures()
-            else:
-                features = list(layer_to_blur.getFeatures())
-
-            if not features:
-                raise GeoPublicHealthException(tr("No features to blur."))
+            if use_envelope:
+                # Read in the main thread, the task only queries the index.
+                # Only the envelope polygons a buffer can reach are indexed.
+                if selected_features_only:
+                    extent = layer_to_blur.boundingBoxOfSelected()
+                else:
+                    extent = QgsRectangle(layer_to_blur.extent())
+                extent.grow(radius)
+                envelope_index = LAYER_INDEX_CACHE.get(envelope_layer, extent)
 
             out_fields = QgsFields()
             out_fields.extend(layer_to_blur.fields())
@@ -214,72 +387,117 @@ class BlurWidget(QWidget, FORM_CLASS):
                 save_options.driverName = "ESRI Shapefile"
             save_options.fileEncoding = "UTF-8"
 
-            writer = QgsVectorFileWriter.create(
-                file_name,
-                out_fields,
-                QgsWkbTypes.Polygon,
-                layer_to_blur.crs(),
-                QgsCoordinateTransformContext(),
-                save_options,
-            )
-
-            if writer.hasError():
-                raise CreatingShapeFileException(suffix=f": {writer.errorMessage()}")
-
             algo = Blur(
                 radius,
                 envelope_index,
                 export_radius,
                 export_centroid,
+                sample_in_envelope=sample_in_envelope,
+                min_radius=min_radius,
             )
 
-            total = len(features)
-            for i, feature in enumerate(features):
-                try:
-                    blurred_feature = algo.blur(feature)
-                    writer.addFeature(blurred_feature)
-                except PointOutsideEnvelopeException as exc:
-                    display_message_bar(
-                        msg=exc.msg, level=exc.level, duration=exc.duration
-                    )
-
-                percent = int((i + 1) * 100 / total)
-                self.progressBar_blur.setValue(percent)
-                QApplication.processEvents()
-
-            del writer
-
-            if display_result:
-                if output_ext == ".gpkg":
-                    layer_name = os.path.splitext(basename(file_name))[0]
-                    layer_uri = f"{file_name}|layername={layer_name}"
-                else:
-                    layer_uri = file_name
-
-                output_layer = QgsVectorLayer(
-                    layer_uri,
-                    os.path.splitext(basename(file_name))[0],
-                    "ogr",
-                )
-                if output_layer.isValid():
-                    QgsProject.instance().addMapLayer(output_layer)
-                else:
-                    display_message_bar(
-                        msg=tr("Output layer is invalid."),
-                        level=Qgis.Warning,
-                    )
-
-            self.label_progress.setText(tr("Finished"))
-            self.progressBar_blur.setValue(100)
-
         except GeoPublicHealthException as e:
             display_message_bar(msg=e.msg, level=e.level, duration=e.duration)
             traceback.print_exc()
+            return
         except Exception as e:
             display_message_bar(
                 msg=f"{tr('Unexpected error:')} {str(e)}",
                 level=Qgis.Critical,
             )
             traceback.print_exc()
-        finally:
-            QApplication.restoreOverrideCursor()
+            return
+
+        # --- Start the task ---
+        self.display_result = display_result
+        self._set_ui_running_state(True)
+        self.current_task = BlurTask(
+            tr("Blurring ") + layer_to_blur.name(),
+            layer_to_blur,
+            algo,
+            file_name,
+            out_fields,
+            save_options,
+            selected_features_only=selected_features_only,
+        )
+        self.current_task.blurProgress.connect(self.update_progress)
+        self.current_task.blurFinished.connect(self.task_finished)
+        QgsApplication.taskManager().addTask(self.current_task)
+
+    def update_progress(self, value: float):
+        """Slot to update the progress bar."""
+        self.progressBar_blur.setValue(int(value))
+        self.label_progress.setText(f"{tr('Blurring...')} {int(value)}%")
+
+    def task_finished(self, success: bool, result_data: Optional[dict], message: str):
+        """Slot executed when the blurring task completes.
+
+        Args:
+            success: Whether the task completed successfully
+            result_data: Result data dictionary or None on failure
+            message: Output file name, or error message
+        """
+        self.current_task = None
+        self._set_ui_running_state(False)
+
+        if not success:
+            self.label_progress.setText(tr("Cancelled or failed"))
+            display_message_bar(msg=message, level=Qgis.Warning)
+            return
+
+        outside_ids = result_data[BlurTask.RESULT_OUTSIDE]
+        if outside_ids:
+            reported = ", ".join(
+                str(fid) for fid in outside_ids[: BlurTask.MAX_REPORTED_IDS]
+            )
+            display_message_bar(
+                msg=tr(
+                    "{} points outside the envelope, or which can not be moved "
+                    "by the minimum displacement inside it, were skipped: {}"
+                ).format(
+                    len(outside_ids), reported
+                ),
+                level=Qgis.Warning,
+                duration=10,
+            )
+
+        file_name = message
+        if self.display_result:
+            output_ext = os.path.splitext(file_name)[1].lower()
+            if output_ext == ".gpkg":
+                layer_name = os.path.splitext(basename(file_name))[0]
+                layer_uri = f"{file_name}|layername={layer_name}"
+            else:
+                layer_uri = file_name
+
+            output_layer = QgsVectorLayer(
+                layer_uri,
+                os.path.splitext(basename(file_name))[0],
+                "ogr",
+            )
+            if output_layer.isValid():
+                QgsProject.instance().addMapLayer(output_layer)
+            else:
+                display_message_bar(
+                    msg=tr("Output layer is invalid."),
+                    level=Qgis.Warning,
+                )
+
+        self.label_progress.setText(tr("Finished"))
+        self.progressBar_blur.setValue(100)
+
+    def cancel_task_or_close(self):
+        """Cancels the running task, or asks to close the window."""
+        if self.current_task is not None and self.current_task.isActive():
+            self.current_task.cancel()
+        else:
+            self.signalAskCloseWindow.emit()
+
+    def _set_ui_running_state(self, running: bool):
+        """Enables or disables the OK button while the task is running."""
+        self.buttonBox_blur.button(QDialogButtonBox.Ok).setEnabled(not running)
+        cancel_button = self.buttonBox_blur.button(QDialogButtonBox.Cancel)
+        cancel_button.setText(tr("Cancel Task") if running else tr("Cancel"))
+        if running:
+            self.progressBar_blur.setValue(0)
+            self.label_progress.setText(tr("Starting..."))
@@ -26,6 +26,8 @@
 import traceback
 import tempfile
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from typing import Dict, List, Optional, Union, Any
 
 # Third-Party Imports
@@ -61,14 +63,13 @@ from qgis.core import (
     QgsFeature,
     QgsFeatureRequest,
     QgsVectorLayer,
+    QgsVectorLayerFeatureSource,
     QgsProject,
-    QgsGeometry,
     QgsWkbTypes,
     QgsMapLayerProxyModel,
     QgsProcessingUtils,
     QgsFieldConstraints,
     QgsVectorFileWriter,
-    QgsSpatialIndex,
     QgsUnitTypes,
     QgsGraduatedSymbolRenderer,
     QgsSymbol,
@@ -106,9 +107,51 @@ from geopublichealth.src.core.exceptions import (
     NotANumberException,
 )
 from geopublichealth.src.core.stats import Stats
+from geopublichealth.src.core.diagnostics import Diagnostics
+from geopublichealth.src.core.gis.point_in_polygon import (
+    AssignmentCache,
+    PointInPolygonAssigner,
+    category_codes,
+    category_counts,
+    layer_fingerprint,
+    read_point_coordinates,
+    read_point_values,
+)
 from geopublichealth.src.core.services import rates
 
 
+STANDARDIZATION_DIRECT = "direct"
+STANDARDIZATION_INDIRECT = "indirect"
+
+# Level of the optional confidence intervals of the rates
+CONFIDENCE_LEVEL = 0.95
+
+# Maximum number of point categories, without a selection of values
+MAX_CATEGORIES = 50
+
+# Categories of the data issues collected by the task
+DIAGNOSTIC_INVALID_CASE = "invalid_case"
+DIAGNOSTIC_INVALID_POPULATION = "invalid_population"
+DIAGNOSTIC_NEGLIGIBLE_AREA = "negligible_area"
+DIAGNOSTIC_NEGLIGIBLE_POPULATION = "negligible_population"
+
+
+def _attribute_float(value) -> float:
+    """Convert an attribute to float, NaN for NULL or invalid values."""
+    if value is None or (isinstance(value, QVariant) and value.isNull()):
+        return np.nan
+    try:
+        return float(str(value).replace(",", ""))
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _attribute_value(value):
+    """Convert a float to an attribute value, None (NULL) for NaN."""
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
 # --------------------------------------------------------------------------
 # Background Task Class
 # --------------------------------------------------------------------------
@@ -124,6 +167,15 @@ class IncidenceDensityTask(QgsTask):
     RESULT_WARNINGS = "warnings"
     RESULT_DRIVER = "driver_name"
 
+    # Admin features read by each thread pool job
+    CHUNK_SIZE = 2000
+    # Progress (0-100) reached once all the chunks are read
+    PROGRESS_READ = 80.0
+    # Output features given to the file writer at once
+    WRITE_BATCH_SIZE = 5000
+    # Point to polygon assignments of the last runs, shared by the tasks
+    ASSIGNMENT_CACHE = AssignmentCache()
+
     def __init__(
         self,
         description: str,
@@ -140,8 +192,28 @@ class IncidenceDensityTask(QgsTask):
         transform_context: QgsCoordinateTransformContext,
         project_crs: Any,
         driver_name: str,
+        standardization: Optional[str] = None,
+        strata_case_fields: Optional[List[str]] = None,
+        strata_population_fields: Optional[List[str]] = None,
+        standard_values: Optional[List[float]] = None,
+        confidence_level: Optional[float] = None,
+        diagnostics_path: Optional[str] = None,
+        category_field_name: Optional[str] = None,
+        category_values: Optional[List[str]] = None,
     ):
-        """Initialize the task with necessary parameters."""
+        """Initialize the task with necessary parameters.
+
+        Age-band fields and standard values are only used with a
+        standardization (STANDARDIZATION_DIRECT or STANDARDIZATION_INDIRECT).
+        Standard values are the standard population of each age band
+        (direct), or optional reference rates per ratio (indirect).
+        With a confidence level, exact Poisson confidence limits are added
+        to the output (not available for direct standardization).
+        Data issues are summarized once at the end, and every offending
+        feature id is written to the diagnostics CSV path if given.
+        With a category field of the point layer, a count and a rate column
+        are added for each category (or each of the category values given).
+        """
         super().__init__(description, QgsTask.CanCancel)
 
         # Input parameters
@@ -158,12 +230,21 @@ class IncidenceDensityTask(QgsTask):
         self.transform_context = transform_context
         self.project_crs = project_crs
         self.driver_name = driver_name
+        self.standardization = standardization
+        self.strata_case_fields = strata_case_fields or []
+        self.strata_population_fields = strata_population_fields or []
+        self.standard_values = standard_values
+        self.confidence_level = confidence_level
+        self.diagnostics_path = diagnostics_path
+        self.category_field_name = category_field_name
+        self.category_values = category_values or None
 
         # Output/state variables
         self.exception = None
         self.calculated_data = []
         self.total_case_count = 0
         self.task_warnings = []
+        self.diagnostics = Diagnostics()
 
     def run(self) -> bool:
         """Main processing logic executed in the background thread."""
@@ -237,6 +318,56 @@ class IncidenceDensityTask(QgsTask):
             if intersection_field:
                 output_fields.append(intersection_field)
 
+            # Observed and expected counts of indirect standardization
+            if self.standardization == STANDARDIZATION_INDIRECT:
+                for field_name in ("obs_ct", "exp_ct"):
+                    if output_fields.indexOf(field_name) != -1:
+                        raise FieldExistingException(field=field_name)
+                    output_fields.append(QgsField(field_name, 6, "Real", 20, 6))
+
+            # Confidence limits of the rates or SMRs
+            if self.confidence_level and self.standardization == STANDARDIZATION_DIRECT:
+                self.task_warnings.append(
+                    tr(
+                        "Confidence intervals are not available for direct "
+                        "standardization, they were not computed."
+                    )
+                )
+                self.confidence_level = None
+            if self.confidence_level:
+                for field_name in ("ci_lo", "ci_hi"):
+                    if output_fields.indexOf(field_name) != -1:
+                        raise FieldExistingException(field=field_name)
+                    output_fields.append(QgsField(field_name, 6, "Real", 20, 10))
+
+            # Count and rate of each category of points
+            category_labels = []
+            if self.use_point_layer_flag and point_layer and self.category_field_name:
+                category_fids, point_categories = read_point_values(
+                    point_layer, self.category_field_name
+                )
+                category_point_codes, category_labels = category_codes(
+                    point_categories, self.category_values
+                )
+                if len(category_labels) > MAX_CATEGORIES:
+                    raise GeoPublicHealthException(
+                        tr(
+                            "The category field has {} values, select at most {}."
+                        ).format(len(category_labels), MAX_CATEGORIES)
+                    )
+                # Short names fit the 10 characters of shapefile fields, the
+                # category is kept in the alias.
+                for index, label in enumerate(category_labels):
+                    count_field = QgsField("n_{}".format(index), QVariant.Int)
+                    count_field.setAlias("n_" + label)
+                    rate_field = QgsField("r_{}".format(index), 6, "Real", 20, 10)
+                    rate_field.setAlias(self.output_field_name + "_" + label)
+                    for field in (count_field, rate_field):
+                        # Shapefile field names are not case sensitive
+                        if output_fields.lookupField(field.name()) != -1:
+                            raise FieldExistingException(field=field.name())
+                        output_fields.append(field)
+
             # --- Setup Vector File Writer ---
             gpkg_layer_name = (
                 self.output_field_name.replace(" ", "_")
@@ -269,17 +400,38 @@ class IncidenceDensityTask(QgsTask):
                 )
 
             # --- Prepare indices ---
-            point_layer_index = None
+            self.calculated_data = []
+            id_request = QgsFeatureRequest().setNoAttributes()
+            id_request.setFlags(QgsFeatureRequest.NoGeometry)
+            admin_fids = [
+                feature.id() for feature in admin_layer.getFeatures(id_request)
+            ]
+            num_admin_features = len(admin_fids)
+
+            point_assigner = None
+            point_fids = None
+            assignment_key = None
+            cached_assignment = None
             index_case = -1
             index_population = -1
             self.total_case_count = 0
 
-            # Set up spatial index for point layer if needed
+            # Read the point coordinates once, points are then assigned to
+            # the admin polygons while iterating over them. The assignment of
+            # a previous run on the same layers is reused if available.
             if self.use_point_layer_flag and point_layer:
                 self.total_case_count = point_layer.featureCount()
-                if self.total_case_count > 0:
-                    point_layer_index = QgsSpatialIndex(point_layer.getFeatures())
-            else:
+                assignment_key = (
+                    layer_fingerprint(admin_layer),
+                    layer_fingerprint(point_layer),
+                )
+                cached_assignment = self.ASSIGNMENT_CACHE.get(
+                    assignment_key, admin_fids
+                )
+                if cached_assignment is None and self.total_case_count > 0:
+                    point_fids, point_coordinates = read_point_coordinates(point_layer)
+                    point_assigner = PointInPolygonAssigner(point_coordinates)
+            elif not self.standardization:
                 # Get case field index
                 index_case = admin_fields.lookupField(self.case_field_name)
                 if index_case == -1:
@@ -288,7 +440,7 @@ class IncidenceDensityTask(QgsTask):
                     )
 
             # Get population field index if needed
-            if not self.use_area_flag:
+            if not self.use_area_flag and not self.standardization:
                 index_population = admin_fields.lookupField(self.population_field_name)
                 if index_population == -1:
                     raise FieldException(
@@ -302,167 +454,111 @@ class IncidenceDensityTask(QgsTask):
                     raise FieldException(field_1="Population", field_2="Case")
 
             # --- Process Features ---
-            self.calculated_data = []
-            admin_features_iterator = admin_layer.getFeatures()
-            num_admin_features = admin_layer.featureCount()
-
             if num_admin_features == 0:
                 del file_writer
                 return True
 
-            # Setup progress tracking
-            progress_step = 100.0 / num_admin_features
-
-            # Get output field indices
-            output_field_idx = output_fields.lookupField(self.output_field_name)
-            intersection_field_idx = (
-                output_fields.lookupField(intersection_field_name)
-                if self.add_intersections_flag
-                else -1
+            # Read the features and find their points in parallel
+            admin_features = self.read_admin_features(
+                admin_layer, admin_fids, point_assigner
             )
+            if admin_features is None:
+                del file_writer
+                return False
 
-            # Process each admin feature
-            for i, admin_feature in enumerate(admin_features_iterator):
-                if self.isCanceled():
+            expected = None
+            limits = None
+            category_columns = []
+            if self.standardization:
+                # Age-band columns are read and standardized all at once
+                values, observed, expected = self.compute_standardized(
+                    admin_fields, admin_features
+                )
+                counts = np.nan_to_num(observed).astype(np.int64)
+                if self.confidence_level and expected is not None:
+                    lower, upper = rates.poisson_confidence_limits(
+                        observed, self.confidence_level
+                    )
+                    limits = (
+                        rates.compute_incidence_array(lower, expected),
+                        rates.compute_incidence_array(upper, expected),
+                    )
+            else:
+                columns = self.collect_crude_columns(
+                    admin_features, point_assigner, index_case, index_population
+                )
+                if columns is None:
                     del file_writer
                     return False
-
-                attributes = admin_feature.attributes()
-                admin_geom = admin_feature.geometry()
-                feature_id_str = f"ID {admin_feature.id()}"
-                count = 0
-                value = None  # Default to None
-
-                # Get Case Count based on method
-                if self.use_point_layer_flag and point_layer_index and point_layer:
-                    # Count points that intersect with the admin polygon
-                    candidate_fids = point_layer_index.intersects(
-                        admin_geom.boundingBox()
+                counts, denominators = columns
+                if cached_assignment is not None:
+                    counts = cached_assignment["counts"].copy()
+                elif point_assigner is not None:
+                    self.ASSIGNMENT_CACHE.put(
+                        assignment_key,
+                        admin_fids,
+                        counts,
+                        point_fids,
+                        point_assigner.assignment,
                     )
-                    if candidate_fids:
-                        request = QgsFeatureRequest().setFilterFids(candidate_fids)
-                        prepared_admin_geom = QgsGeometry(admin_geom)
-
-                        for point_feat in point_layer.getFeatures(request):
-                            point_geom = point_feat.geometry()
-                            if (
-                                point_geom
-                                and not point_geom.isEmpty()
-                                and point_geom.intersects(prepared_admin_geom)
-                            ):
-                                count += 1
-
-                elif not self.use_point_layer_flag:
-                    # Get case count from attribute field
-                    case_val = attributes[index_case]
-                    count = 0
-
-                    if not (
-                        case_val is None
-                        or (isinstance(case_val, QVariant) and case_val.isNull())
-                    ):
-                        try:
-                            f_count = float(str(case_val).replace(",", ""))
-                            count = int(f_count) if f_count >= 0 else 0
-                        except (ValueError, TypeError):
-                            QgsMessageLog.logMessage(
-                                f"{tr('Warning:')} {feature_id_str} {tr('has invalid case value')} "
-                                f"('{case_val}'), {tr('treating as 0.')}",
-                                "GeoPublicHealth",
-                                Qgis.Warning,
-                            )
-
-                    if i == 0:
-                        self.total_case_count = 0
-                    self.total_case_count += count
-
-                # Calculate Value based on method
-                try:
-                    if self.use_area_flag:
-                        # Density calculation (count / area)
-                        denominator = admin_geom.area()
-                        value = rates.compute_density(
-                            [count], [denominator], self.ratio
-                        )[0]
-
-                        if denominator <= 1e-9 and count != 0:
-                            QgsMessageLog.logMessage(
-                                f"{tr('Warning:')} {feature_id_str} {tr('has zero/negligible area.')}",
-                                "GeoPublicHealth",
-                                Qgis.Warning,
-                            )
+                values = self.compute_crude_values(admin_features, counts, denominators)
+                if category_labels:
+                    if cached_assignment is not None:
+                        point_fids = cached_assignment["point_fids"]
+                        assignment = cached_assignment["assignment"]
+                    elif point_assigner is not None:
+                        assignment = point_assigner.assignment
                     else:
-                        # Incidence calculation (count / population)
-                        pop_val = attributes[index_population]
-                        denominator = None
-
-                        if not (
-                            pop_val is None
-                            or (isinstance(pop_val, QVariant) and pop_val.isNull())
-                        ):
-                            try:
-                                denominator = float(str(pop_val).replace(",", ""))
-                            except (ValueError, TypeError):
-                                QgsMessageLog.logMessage(
-                                    f"{tr('Warning:')} {feature_id_str} {tr('has invalid population value')} "
-                                    f"('{pop_val}').",
-                                    "GeoPublicHealth",
-                                    Qgis.Warning,
-                                )
-
-                        value = rates.compute_incidence(
-                            [count],
-                            [denominator],
-                            self.ratio,
-                        )[0]
-
-                        if (denominator is None or denominator <= 1e-9) and count != 0:
-                            QgsMessageLog.logMessage(
-                                f"{tr('Warning:')} {feature_id_str} {tr('has zero/negligible population.')}",
-                                "GeoPublicHealth",
-                                Qgis.Warning,
-                            )
-                except Exception as e:
-                    QgsMessageLog.logMessage(
-                        f"{tr('Warning: Calculation error for')} {feature_id_str}: {str(e)}",
-                        "GeoPublicHealth",
-                        Qgis.Warning,
+                        # No point at all
+                        point_fids = category_fids
+                        assignment = np.full(len(category_fids), -1)
+                    category_columns = self.compute_category_columns(
+                        point_fids,
+                        assignment,
+                        category_fids,
+                        category_point_codes,
+                        len(category_labels),
+                        denominators,
+                    )
+                if self.confidence_level:
+                    limits = rates.rate_confidence_intervals(
+                        counts, denominators, self.ratio, self.confidence_level
                     )
-                    value = None
-
-                # Store the calculated value
-                self.calculated_data.append(value)
-
-                # Prepare and Write Feature
-                new_feature = QgsFeature(output_fields)
-                new_feature.setGeometry(QgsGeometry(admin_geom))
-
-                # Copy original attributes
-                for fld_idx, src_fld in enumerate(admin_fields):
-                    new_feature[src_fld.name()] = attributes[fld_idx]
 
-                # Set calculated value
-                new_feature[output_field_idx] = value  # None handled as NULL
+            if not self.use_point_layer_flag:
+                self.total_case_count = int(counts.sum())
 
-                # Set intersection count if requested
-                if self.add_intersections_flag and intersection_field_idx != -1:
-                    new_feature[intersection_field_idx] = count
+            # Store the calculated values (NaN as None)
+            self.calculated_data = values.tolist()
+            for i in np.flatnonzero(np.isnan(values)).tolist():
+                self.calculated_data[i] = None
 
-                # Add feature to output file
-                if not file_writer.addFeature(new_feature):
-                    QgsMessageLog.logMessage(
-                        f"{tr('Error writing feature')} {feature_id_str}: {file_writer.errorMessage()}",
-                        "GeoPublicHealth",
-                        Qgis.Warning,
-                    )
+            # Output columns, in the order of the appended output fields
+            columns = [self.calculated_data]
+            if self.add_intersections_flag:
+                columns.append(counts.tolist())
+            if expected is not None:
+                columns.append([_attribute_value(value) for value in observed])
+                columns.append([_attribute_value(value) for value in expected])
+            if limits is not None:
+                columns.extend(
+                    [_attribute_value(value) for value in limit] for limit in limits
+                )
+            columns.extend(category_columns)
 
-                # Update progress
-                self.progressChanged.emit((i + 1) * progress_step)
+            # Write the admin features in batches, in the original order
+            if not self.write_features(
+                file_writer, output_fields, admin_features, columns
+            ):
+                del file_writer
+                return False
 
             # --- Finalize ---
             del file_writer
             file_writer = None
 
+            self.report_diagnostics()
+
             if self.isCanceled():
                 QgsProcessingUtils.deleteFile(output_target_path)
                 return False
@@ -493,6 +589,307 @@ class IncidenceDensityTask(QgsTask):
 
             return False
 
+    def collect_crude_columns(
+        self, admin_features, point_assigner, index_case, index_population
+    ):
+        """
+        Collect the case and denominator columns, in the original order.
+
+        Returns:
+            tuple: Case counts and denominators arrays, or None if cancelled
+        """
+        num_admin_features = len(admin_features)
+        counts = np.zeros(num_admin_features, dtype=np.int64)
+        denominators = np.full(num_admin_features, np.nan)
+        for i, (fid, attributes, admin_geom, point_hits) in enumerate(admin_features):
+            if self.isCanceled():
+                return None
+
+            # Get Case Count based on method
+            if self.use_point_layer_flag and point_assigner is not None:
+                # Count points that intersect with the admin polygon and
+                # are not counted yet by a previous one
+                counts[i] = point_assigner.assign_points(i, point_hits)
+
+            elif not self.use_point_layer_flag:
+                # Get case count from attribute field
+                case_val = attributes[index_case]
+
+                if not (
+                    case_val is None
+                    or (isinstance(case_val, QVariant) and case_val.isNull())
+                ):
+                    try:
+                        f_count = float(str(case_val).replace(",", ""))
+                        counts[i] = int(f_count) if f_count >= 0 else 0
+                    except (ValueError, TypeError):
+                        self.diagnostics.add(DIAGNOSTIC_INVALID_CASE, fid, case_val)
+
+            # Get the denominator based on method
+            if self.use_area_flag:
+                denominators[i] = admin_geom.area()
+            else:
+                pop_val = attributes[index_population]
+                if not (
+                    pop_val is None
+                    or (isinstance(pop_val, QVariant) and pop_val.isNull())
+                ):
+                    try:
+                        denominators[i] = float(str(pop_val).replace(",", ""))
+                    except (ValueError, TypeError):
+                        self.diagnostics.add(
+                            DIAGNOSTIC_INVALID_POPULATION, fid, pop_val
+                        )
+
+        return counts, denominators
+
+    def compute_crude_values(self, admin_features, counts, denominators):
+        """
+        Calculate every crude rate in one call.
+
+        Returns:
+            numpy.ndarray: Rates, NaN when invalid
+        """
+        if self.use_area_flag:
+            # Density calculation (count / area)
+            values = rates.compute_density_array(counts, denominators, self.ratio)
+            category = DIAGNOSTIC_NEGLIGIBLE_AREA
+        else:
+            # Incidence calculation (count / population)
+            values = rates.compute_incidence_array(counts, denominators, self.ratio)
+            category = DIAGNOSTIC_NEGLIGIBLE_POPULATION
+
+        negligible = ~(denominators > 1e-9) & (counts != 0)
+        self.diagnostics.add_many(
+            category,
+            (admin_features[i][0] for i in np.flatnonzero(negligible).tolist()),
+        )
+        return values
+
+    def compute_standardized(self, admin_fields, admin_features):
+        """
+        Calculate age-standardized rates or SMRs of every unit at once.
+
+        Returns:
+            tuple: Values (rates or SMRs), observed counts and expected counts
+            (None for direct standardization)
+        """
+        strata_columns = []
+        for field_names in (self.strata_case_fields, self.strata_population_fields):
+            indexes = []
+            for field_name in field_names:
+                field_index = admin_fields.lookupField(field_name)
+                if field_index == -1:
+                    raise FieldException(
+                        tr("Age-band field '{}' not found.").format(field_name)
+                    )
+                indexes.append(field_index)
+            strata_columns.append(
+                np.array(
+                    [
+                        [_attribute_float(attributes[index]) for index in indexes]
+                        for __, attributes, __, __ in admin_features
+                    ],
+                    dtype=float,
+                ).reshape(-1, len(indexes))
+            )
+        cases, population = strata_columns
+
+        if self.standardization == STANDARDIZATION_DIRECT:
+            values = rates.direct_standardized_rates(
+                cases, population, self.standard_values, self.ratio
+            )
+            return values, cases.sum(axis=1), None
+
+        reference_rates = None
+        if self.standard_values:
+            # Reference rates are given per ratio, like the output rates
+            reference_rates = np.asarray(self.standard_values, dtype=float)
+            reference_rates = reference_rates / self.ratio
+        result = rates.indirect_standardization(cases, population, reference_rates)
+        return result["smr"], result["observed"], result["expected"]
+
+    def compute_category_columns(
+        self,
+        point_fids,
+        assignment,
+        category_fids,
+        codes,
+        category_count,
+        denominators,
+    ):
+        """
+        Count the points of each category in each admin feature, and their rate.
+
+        Args:
+            point_fids: Point ids, in the order of the assignment
+            assignment: Admin feature position of each point, -1 if outside
+            category_fids: Point ids, in the order of the category codes
+            codes: Category code of each point, -1 to skip it
+
+        Returns:
+            list: Count and rate columns of each category, alternately
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        if not np.array_equal(point_fids, category_fids):
+            # Align the category codes on the assignment order
+            order = np.argsort(category_fids)
+            positions = np.searchsorted(category_fids, point_fids, sorter=order)
+            codes = codes[order[np.minimum(positions, len(order) - 1)]]
+
+        counts = category_counts(assignment, codes, len(denominators), category_count)
+        columns = []
+        for code in range(category_count):
+            if self.use_area_flag:
+                values = rates.compute_density_array(
+                    counts[:, code], denominators, self.ratio
+                )
+            else:
+                values = rates.compute_incidence_array(
+                    counts[:, code], denominators, self.ratio
+                )
+            columns.append(counts[:, code].tolist())
+            columns.append([_attribute_value(value) for value in values])
+        return columns
+
+    def report_diagnostics(self):
+        """Log one summary of the data issues and export them if requested."""
+        if not len(self.diagnostics):
+            return
+
+        labels = {
+            DIAGNOSTIC_INVALID_CASE: tr("Invalid case value, treated as 0"),
+            DIAGNOSTIC_INVALID_POPULATION: tr("Invalid population value"),
+            DIAGNOSTIC_NEGLIGIBLE_AREA: tr("Zero/negligible area"),
+            DIAGNOSTIC_NEGLIGIBLE_POPULATION: tr("Zero/negligible population"),
+        }
+        lines = self.diagnostics.summary(labels)
+        if self.diagnostics_path:
+            try:
+                self.diagnostics.write_csv(self.diagnostics_path)
+                lines.append(
+                    tr("Offending feature ids written to {}").format(
+                        self.diagnostics_path
+                    )
+                )
+            except OSError as e:
+                lines.append(
+                    tr("Could not write the diagnostics file: {}").format(str(e))
+                )
+
+        QgsMessageLog.logMessage(
+            tr("Data issues (feature count and first ids):")
+            + "\n - "
+            + "\n - ".join(lines),
+            "GeoPublicHealth",
+            Qgis.Warning,
+        )
+        self.task_warnings.extend(lines)
+
+    def write_features(self, file_writer, output_fields, admin_features, columns):
+        """
+        Write the output features in batches.
+
+        Attributes are set positionally in a single call: the source
+        attributes followed by one value of each output column. With a
+        GeoPackage, the writer keeps every batch in a single transaction,
+        committed when the writer is deleted.
+
+        Returns:
+            bool: False if cancelled
+        """
+        num_admin_features = len(admin_features)
+        progress_step = (100.0 - self.PROGRESS_READ) / num_admin_features
+        rows = zip(admin_features, zip(*columns))
+        for start in range(0, num_admin_features, self.WRITE_BATCH_SIZE):
+            if self.isCanceled():
+                return False
+
+            batch = []
+            for (__, attributes, admin_geom, __), values in islice(
+                rows, self.WRITE_BATCH_SIZE
+            ):
+                new_feature = QgsFeature(output_fields)
+                new_feature.setGeometry(admin_geom)
+                new_feature.setAttributes(list(attributes) + list(values))
+                batch.append(new_feature)
+
+            if not file_writer.addFeatures(batch):
+                QgsMessageLog.logMessage(
+                    f"{tr('Error writing features')}: {file_writer.errorMessage()}",
+                    "GeoPublicHealth",
+                    Qgis.Warning,
+                )
+
+            self.progressChanged.emit(
+                self.PROGRESS_READ + (start + len(batch)) * progress_step
+            )
+        return True
+
+    def read_admin_features(self, admin_layer, admin_fids, point_assigner):
+        """
+        Read the admin features in chunks processed by a thread pool.
+
+        Each chunk has its own feature source. Points intersecting each
+        polygon are searched in the workers, they are only assigned to a
+        polygon when merging, so the counts do not depend on the scheduling.
+
+        Args:
+            admin_layer: Admin layer loaded by the task
+            admin_fids: Admin feature ids, in iteration order
+            point_assigner: PointInPolygonAssigner, or None without points
+
+        Returns:
+            list: (fid, attributes, geometry, point hits) tuples in the order
+            of admin_fids, or None if cancelled
+        """
+        chunks = [
+            admin_fids[start : start + self.CHUNK_SIZE]
+            for start in range(0, len(admin_fids), self.CHUNK_SIZE)
+        ]
+        # Feature sources are created here, in the task thread owning the layer
+        sources = [QgsVectorLayerFeatureSource(admin_layer) for __ in chunks]
+
+        features = {}
+        workers = min(len(chunks), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.read_admin_chunk, source, chunk, point_assigner)
+                for source, chunk in zip(sources, chunks)
+            ]
+            for future in as_completed(futures):
+                chunk_features = future.result()
+                if chunk_features is None:
+                    continue
+                features.update(chunk_features)
+                self.progressChanged.emit(
+                    self.PROGRESS_READ * len(features) / len(admin_fids)
+                )
+
+        if self.isCanceled():
+            return None
+        return [(fid,) + features[fid] for fid in admin_fids]
+
+    def read_admin_chunk(self, source, fids, point_assigner):
+        """
+        Read one chunk of admin features, run in a worker thread.
+
+        Returns:
+            dict: (attributes, geometry, point hits) by feature id, or None if
+            cancelled
+        """
+        request = QgsFeatureRequest().setFilterFids(fids)
+        features = {}
+        for feature in source.getFeatures(request):
+            if self.isCanceled():
+                return None
+            geometry = feature.geometry()
+            point_hits = None
+            if point_assigner is not None:
+                point_hits = point_assigner.hits(geometry)
+            features[feature.id()] = (feature.attributes(), geometry, point_hits)
+        return features
+
     def finished(self, result: bool):
         """Called when the task's run() method finishes."""
         if result:
@@ -607,6 +1004,10 @@ class IncidenceDensityDialog(QDialog):
         self.checkBox_addNbIntersections = getattr(
             self, "checkBox_addNbIntersections", None
         )
+        self.checkBox_confidenceIntervals = getattr(
+            self, "checkBox_confidenceIntervals", None
+        )
+        self.checkBox_exportIssues = getattr(self, "checkBox_exportIssues", None)
         self.cbx_ratio = getattr(self, "cbx_ratio", None)
 
         # Symbology widgets
@@ -631,6 +1032,18 @@ class IncidenceDensityDialog(QDialog):
         self.cbx_case_field = getattr(self, "cbx_case_field", None)
         self.cbx_population_field = getattr(self, "cbx_population_field", None)
 
+        # Age standardization widgets
+        self.cbx_standardization = getattr(self, "cbx_standardization", None)
+        self.cbx_strata_case_fields = getattr(self, "cbx_strata_case_fields", None)
+        self.cbx_strata_population_fields = getattr(
+            self, "cbx_strata_population_fields", None
+        )
+        self.le_standard_population = getattr(self, "le_standard_population", None)
+
+        # Point category widgets
+        self.cbx_category_field = getattr(self, "cbx_category_field", None)
+        self.le_category_values = getattr(self, "le_category_values", None)
+
     def _setup_ui_connections(self):
         """Set up signal-slot connections."""
         if self.button_browse:
@@ -645,6 +1058,123 @@ class IncidenceDensityDialog(QDialog):
             if cancel_button:
                 cancel_button.clicked.connect(self.cancel_task_and_close)
 
+        if self.cbx_standardization:
+            self.cbx_standardization.currentIndexChanged.connect(
+                self.update_standardization_controls
+            )
+            if self.cbx_aggregation_layer:
+                self.cbx_aggregation_layer.layerChanged.connect(
+                    self.update_strata_fields
+                )
+                self.update_strata_fields(self.cbx_aggregation_layer.currentLayer())
+            self.update_standardization_controls()
+
+        if self.cbx_category_field and self.cbx_case_layer:
+            self.cbx_category_field.setAllowEmptyFieldName(True)
+            self.cbx_case_layer.layerChanged.connect(self.cbx_category_field.setLayer)
+            self.cbx_category_field.setLayer(self.cbx_case_layer.currentLayer())
+
+    def get_category_inputs(self):
+        """
+        Read the category field of the point layer and the values to count.
+
+        Returns:
+            tuple: Field name and values (None when not set)
+        """
+        if not self.cbx_category_field or not self.cbx_category_field.currentField():
+            return None, None
+
+        values = None
+        if self.le_category_values:
+            values = [
+                value.strip()
+                for value in self.le_category_values.text().split(",")
+                if value.strip()
+            ]
+        return self.cbx_category_field.currentField(), values or None
+
+    def get_standardization(self):
+        """Selected standardization, None for crude rates."""
+        if not self.cbx_standardization:
+            return None
+        return {
+            1: STANDARDIZATION_DIRECT,
+            2: STANDARDIZATION_INDIRECT,
+        }.get(self.cbx_standardization.currentIndex())
+
+    def update_standardization_controls(self):
+        """Enable the age-band widgets only with a standardization."""
+        standardization = self.get_standardization()
+        for widget_name in (
+            "cbx_strata_case_fields",
+            "label_strata_case_fields",
+            "cbx_strata_population_fields",
+            "label_strata_population_fields",
+            "le_standard_population",
+            "label_standard_population",
+        ):
+            widget = getattr(self, widget_name, None)
+            if widget:
+                widget.setEnabled(standardization is not None)
+        for widget_name in ("cbx_case_field", "cbx_population_field"):
+            widget = getattr(self, widget_name, None)
+            if widget:
+                widget.setEnabled(standardization is None)
+
+    def update_strata_fields(self, layer):
+        """List the numeric fields of the layer in the age-band selectors."""
+        for widget in (self.cbx_strata_case_fields, self.cbx_strata_population_fields):
+            if not widget:
+                continue
+            widget.clear()
+            if layer is not None:
+                widget.addItems(
+                    [field.name() for field in layer.fields() if field.isNumeric()]
+                )
+
+    def get_standardization_inputs(self, standardization):
+        """
+        Read and validate the age-band fields and the standard values.
+
+        Returns:
+            tuple: Case fields, population fields and standard values (None
+            when empty), or None if invalid (a message is displayed)
+        """
+        case_fields = list(self.cbx_strata_case_fields.checkedItems())
+        population_fields = list(self.cbx_strata_population_fields.checkedItems())
+        if not population_fields or len(case_fields) != len(population_fields):
+            display_message_bar(
+                tr("Select as many age-band case fields as population fields."),
+                level=Qgis.Warning,
+            )
+            return None
+
+        standard_values = None
+        text = self.le_standard_population.text() if self.le_standard_population else ""
+        if text.strip():
+            try:
+                standard_values = [
+                    float(value) for value in text.replace(";", ",").split(",")
+                ]
+            except ValueError:
+                standard_values = []
+            if len(standard_values) != len(population_fields) or any(
+                value < 0 for value in standard_values
+            ):
+                display_message_bar(
+                    tr("Enter one positive standard value per age band."),
+                    level=Qgis.Warning,
+                )
+                return None
+        elif standardization == STANDARDIZATION_DIRECT:
+            display_message_bar(
+                tr("Direct standardization requires a standard population."),
+                level=Qgis.Warning,
+            )
+            return None
+
+        return case_fields, population_fields, standard_values
+
     def _setup_classification_modes(self):
         """Set up classification modes for symbology."""
         # Add classification modes
@@ -888,9 +1418,19 @@ class IncidenceDensityDialog(QDialog):
 
         point_layer = None
         point_layer_uri = None
+        category_field_name = None
+        category_values = None
         case_column_name = None
         population_column_name = None
 
+        # Age-band fields replace the case and population fields
+        standardization = self.get_standardization()
+        strata_inputs = (None, None, None)
+        if standardization:
+            strata_inputs = self.get_standardization_inputs(standardization)
+            if strata_inputs is None:
+                return
+
         # Get case source (point layer or field)
         if self.use_point_layer:
             point_layer = (
@@ -910,7 +1450,9 @@ class IncidenceDensityDialog(QDialog):
                     level=Qgis.Critical,
                 )
                 return
-        else:
+
+            category_field_name, category_values = self.get_category_inputs()
+        elif not standardization:
             case_column_name = (
                 self.cbx_case_field.currentField() if self.cbx_case_field else None
             )
@@ -921,7 +1463,7 @@ class IncidenceDensityDialog(QDialog):
                 return
 
         # Get population source (field or area)
-        if not self.use_area:
+        if not self.use_area and not standardization:
             population_column_name = (
                 self.cbx_population_field.currentField()
                 if self.cbx_population_field
@@ -957,6 +1499,15 @@ class IncidenceDensityDialog(QDialog):
             if self.checkBox_addNbIntersections
             else False
         )
+        confidence_level = (
+            CONFIDENCE_LEVEL
+            if self.checkBox_confidenceIntervals
+            and self.checkBox_confidenceIntervals.isChecked()
+            else None
+        )
+        export_issues = bool(
+            self.checkBox_exportIssues and self.checkBox_exportIssues.isChecked()
+        )
 
         # Get ratio value
         try:
@@ -974,6 +1525,7 @@ class IncidenceDensityDialog(QDialog):
             self.le_output_filepath.text() if self.le_output_filepath else ""
         )
         driver_name = "GPKG"
+        diagnostics_path = None
 
         if output_file_path_ui:
             if output_file_path_ui.lower().endswith(".shp"):
@@ -985,6 +1537,9 @@ class IncidenceDensityDialog(QDialog):
                 self.le_output_filepath.setText(output_file_path_ui)
 
             output_file_path = os.path.splitext(output_file_path_ui)[0]  # Base path
+            if export_issues:
+                # Offending feature ids are exported next to the output file
+                diagnostics_path = output_file_path + "_issues.csv"
         else:
             # Create temporary file if no output path specified
             try:
@@ -1035,6 +1590,12 @@ class IncidenceDensityDialog(QDialog):
             QgsProject.instance().transformContext(),
             admin_layer.crs(),
             driver_name,
+            standardization,
+            *strata_inputs,
+            confidence_level=confidence_level,
+            diagnostics_path=diagnostics_path,
+            category_field_name=category_field_name,
+            category_values=category_values,
         )
 
         # Connect signals
@@ -23,6 +23,7 @@
 
 from builtins import str
 from builtins import range
+import os
 from os.path import dirname
 from qgis.core import Qgis, QgsMapLayerProxyModel
 
@@ -102,7 +103,9 @@ class StatsWidget(QWidget, FORM_CLASS):
         self.tab = []
 
         self.comboBox_blurredLayer.setFilters(QgsMapLayerProxyModel.PolygonLayer)
-        self.comboBox_statsLayer.setFilters(QgsMapLayerProxyModel.PolygonLayer)
+        self.comboBox_statsLayer.setFilters(
+            QgsMapLayerProxyModel.PolygonLayer | QgsMapLayerProxyModel.PointLayer
+        )
 
     def run_stats(self):
         self.progressBar_stats.setValue(0)
@@ -133,32 +136,7 @@ class StatsWidget(QWidget, FORM_CLASS):
 
             nb_feature_stats = stats_layer.featureCount()
             nb_feature_blurred = blurred_layer.featureCount()
-            label_creating = tr("Creating index on the stats layer")
-            label_calculating = tr("Calculating")
-
-            if Qgis.QGIS_VERSION_INT < 20700:
-                self.label_progressStats.setText("%s 1/2" % label_creating)
-
-                def index_progress(current, total):
-                    percent = int(current * 100 / total)
-                    self.progressBar_stats.setValue(percent)
-                    QApplication.processEvents()
-
-                index = spatial_stats.build_spatial_index(
-                    stats_layer,
-                    progress_callback=index_progress,
-                    use_fast=False,
-                )
-                self.label_progressStats.setText("%s 2/2" % label_calculating)
-            else:
-                self.label_progressStats.setText("%s 1/2" % label_creating)
-                QApplication.processEvents()
-                index = spatial_stats.build_spatial_index(
-                    stats_layer,
-                    use_fast=True,
-                )
-                self.label_progressStats.setText("%s 2/2" % label_calculating)
-
+            self.label_progressStats.setText(tr("Calculating"))
             QApplication.processEvents()
 
             def calc_progress(current, total):
@@ -166,11 +144,12 @@ class StatsWidget(QWidget, FORM_CLASS):
                 self.progressBar_stats.setValue(percent)
                 QApplication.processEvents()
 
+            # The stats geometries are read once, no index is built here
             self.tab = spatial_stats.compute_intersection_counts(
                 blurred_layer,
                 stats_layer,
-                index,
                 progress_callback=calc_progress,
+                workers=os.cpu_count() or 1,
             )
 
             items_stats = spatial_stats.build_stats_items(
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from itertools import islice
+
+import numpy as np
+
+# Core QGIS Imports for Processing
+from qgis.core import (
+    QgsProcessing,
+    QgsProcessingAlgorithm,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterField,
+    QgsProcessingParameterNumber,
+    QgsFeatureRequest,
+    QgsFeatureSink,
+    QgsWkbTypes,
+    QgsFields,
+    QgsField,
+    QgsFeature,
+)
+
+# PyQt Imports
+from qgis.PyQt.QtCore import QCoreApplication, QVariant
+
+# Plugin specific imports
+from geopublichealth.src.core.blurring import evaluation
+from geopublichealth.src.core.gis.point_in_polygon import (
+    read_point_coordinates,
+    read_point_records,
+)
+from geopublichealth.src.core.exceptions import GeoPublicHealthException
+
+
+class BlurEvaluationAlgorithm(QgsProcessingAlgorithm):
+    """
+    QGIS Processing algorithm measuring the protection of a blurred layer.
+    Displacement, k-anonymity, risk and linkage are computed with KD-trees.
+    """
+
+    # Parameter and Output constants
+    ORIGINAL_LAYER = "ORIGINAL_LAYER"
+    BLURRED_LAYER = "BLURRED_LAYER"
+    ID_FIELD = "ID_FIELD"
+    REFERENCE_LAYER = "REFERENCE_LAYER"
+    K_TARGET = "K_TARGET"
+    OUTPUT_LAYER = "OUTPUT_LAYER"
+    OUTPUT_SUMMARY = "OUTPUT_SUMMARY"
+
+    # Output features given to the sink at once
+    WRITE_BATCH_SIZE = 5000
+
+    def initAlgorithm(self, config):
+        """Defines the input parameters and output specifications for the algorithm."""
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.ORIGINAL_LAYER,
+                self.tr("Original case layer"),
+                [QgsProcessing.TypeVectorPoint],
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.BLURRED_LAYER,
+                self.tr("Blurred layer"),
+                [QgsProcessing.TypeVectorPolygon],
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.ID_FIELD,
+                self.tr("Case identifier in both layers (feature order if empty)"),
+                parentLayerParameterName=self.ORIGINAL_LAYER,
+                optional=True,
+            )
+        )
+
+        # Population reference, the original cases if empty
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.REFERENCE_LAYER,
+                self.tr("Population reference layer (optional)"),
+                [QgsProcessing.TypeVectorPoint],
+                optional=True,
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.K_TARGET,
+                self.tr("k-anonymity target (0 to skip)"),
+                type=QgsProcessingParameterNumber.Integer,
+                defaultValue=0,
+                minValue=0,
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT_LAYER,
+                self.tr("Blurred layer with privacy metrics (Output)"),
+                QgsProcessing.TypeVectorPolygon,
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT_SUMMARY,
+                self.tr("Privacy summary (Output)"),
+                QgsProcessing.TypeVector,
+            )
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        """Main execution logic of the evaluation."""
+
+        # --- Get Parameters ---
+        original = self.parameterAsSource(parameters, self.ORIGINAL_LAYER, context)
+        blurred = self.parameterAsSource(parameters, self.BLURRED_LAYER, context)
+        if original is None or blurred is None:
+            raise GeoPublicHealthException(self.tr("Input layer not found."))
+        reference_source = self.parameterAsSource(
+            parameters, self.REFERENCE_LAYER, context
+        )
+        id_field = self.parameterAsString(parameters, self.ID_FIELD, context)
+        k_target = self.parameterAsInt(parameters, self.K_TARGET, context)
+
+        sources = [blurred] + ([reference_source] if reference_source else [])
+        if any(source.sourceCrs() != original.sourceCrs() for source in sources):
+            feedback.reportError(
+                self.tr("All the layers must have the same CRS."),
+                fatalError=True,
+            )
+            return {}
+        if id_field and blurred.fields().indexOf(id_field) == -1:
+            feedback.reportError(
+                self.tr("The blurred layer has no field {}.").format(id_field),
+                fatalError=True,
+            )
+            return {}
+
+        # --- Read the layers once ---
+        feedback.pushInfo(self.tr("Reading layers..."))
+        centers, radii, keys = self.read_buffers(blurred, id_field)
+        if id_field:
+            __, coordinates, values = read_point_records(original, id_field)
+            rows = {value: row for row, value in enumerate(values)}
+            matches = np.array([rows.get(key, -1) for key in keys], dtype=np.int64)
+            unmatched = int((matches < 0).sum())
+            if unmatched:
+                feedback.pushInfo(
+                    self.tr("{} blurred features without original case.").format(
+                        unmatched
+                    )
+                )
+            coordinates = np.vstack((coordinates, [np.nan, np.nan]))[matches]
+        else:
+            __, coordinates = read_point_coordinates(original)
+            if len(coordinates) != len(centers):
+                feedback.reportError(
+                    self.tr(
+                        "Both layers must have the same number of features "
+                        "without identifier field."
+                    ),
+                    fatalError=True,
+                )
+                return {}
+
+        reference = None
+        if reference_source:
+            __, reference = read_point_coordinates(reference_source)
+        if feedback.isCanceled():
+            return {}
+
+        # --- Metrics, with KD-tree queries ---
+        feedback.pushInfo(self.tr("Computing privacy metrics..."))
+        metrics = evaluation.evaluate_blurring(coordinates, centers, radii, reference)
+        feedback.setProgress(50)
+
+        # --- Write the outputs ---
+        layer_id = self.write_metrics(parameters, context, blurred, metrics, feedback)
+        rows = evaluation.summary(metrics, k_target or None)
+        summary_id = self.write_summary(parameters, context, rows)
+        for label, value in rows:
+            feedback.pushInfo("{}: {}".format(label, value))
+
+        if feedback.isCanceled():
+            return {}
+        return {self.OUTPUT_LAYER: layer_id, self.OUTPUT_SUMMARY: summary_id}
+
+    @staticmethod
+    def read_buffers(blurred, id_field):
+        """Read the center and radius of each blurred buffer in one pass.
+
+        Buffers are regular polygons around the random point, so the center
+        and the radius are taken from their bounding box.
+        """
+        request = QgsFeatureRequest()
+        if id_field:
+            request.setSubsetOfAttributes([id_field], blurred.fields())
+        else:
+            request.setNoAttributes()
+
+        centers = []
+        radii = []
+        keys = []
+        for feature in blurred.getFeatures(request):
+            geometry = feature.geometry()
+            if geometry is None or geometry.isNull() or geometry.isEmpty():
+                centers.append((np.nan, np.nan))
+                radii.append(np.nan)
+            else:
+                box = geometry.boundingBox()
+                center = box.center()
+                centers.append((center.x(), center.y()))
+                radii.append((box.width() + box.height()) / 4)
+            if id_field:
+                keys.append(feature[id_field])
+        return np.array(centers, dtype=float).reshape(-1, 2), np.array(radii), keys
+
+    def write_metrics(self, parameters, context, blurred, metrics, feedback):
+        """Write the blurred features with their metrics, in batches."""
+        out_fields = QgsFields()
+        out_fields.extend(blurred.fields())
+        out_fields.append(QgsField("displace", QVariant.Double))
+        out_fields.append(QgsField("k_anon", QVariant.Int))
+        out_fields.append(QgsField("risk", QVariant.Double))
+        out_fields.append(QgsField("linked", QVariant.Int))
+
+        (sink, dest_id) = self.parameterAsSink(
+            parameters,
+            self.OUTPUT_LAYER,
+            context,
+            out_fields,
+            blurred.wkbType(),
+            blurred.sourceCrs(),
+        )
+        if sink is None:
+            raise GeoPublicHealthException(self.tr("Could not create output layer."))
+
+        columns = zip(
+            metrics[evaluation.METRIC_DISPLACEMENT].tolist(),
+            metrics[evaluation.METRIC_ANONYMITY].tolist(),
+            metrics[evaluation.METRIC_RISK].tolist(),
+            metrics[evaluation.METRIC_LINKED].astype(int).tolist(),
+        )
+        total = len(metrics[evaluation.METRIC_ANONYMITY])
+        features = blurred.getFeatures()
+        done = 0
+        while True:
+            rows = []
+            for feature, values in zip(
+                islice(features, self.WRITE_BATCH_SIZE), columns
+            ):
+                displacement = values[0] if np.isfinite(values[0]) else None
+                row = QgsFeature(out_fields)
+                row.setGeometry(feature.geometry())
+                row.setAttributes(
+                    feature.attributes() + [displacement] + list(values[1:])
+                )
+                rows.append(row)
+            if not rows or feedback.isCanceled():
+                break
+            sink.addFeatures(rows, QgsFeatureSink.FastInsert)
+            done += len(rows)
+            feedback.setProgress(50 + 50 * done / max(total, 1))
+        return dest_id
+
+    def write_summary(self, parameters, context, rows):
+        """Write the summary rows in a table without geometry."""
+        out_fields = QgsFields()
+        out_fields.append(QgsField("metric", QVariant.String))
+        out_fields.append(QgsField("value", QVariant.String))
+
+        (sink, dest_id) = self.parameterAsSink(
+            parameters,
+            self.OUTPUT_SUMMARY,
+            context,
+            out_fields,
+            QgsWkbTypes.NoGeometry,
+        )
+        if sink is None:
+            raise GeoPublicHealthException(self.tr("Could not create output layer."))
+
+        features = []
+        for label, value in rows:
+            feature = QgsFeature(out_fields)
+            feature.setAttributes([label, value])
+            features.append(feature)
+        sink.addFeatures(features, QgsFeatureSink.FastInsert)
+        return dest_id
+
+    # --- Metadata Methods ---
+    def name(self):
+        """Returns the unique algorithm name."""
+        return "geopublichealth_blur_evaluation"
+
+    def displayName(self):
+        """Returns the translated algorithm name."""
+        return self.tr("Evaluate blurring privacy")
+
+    def group(self):
+        """Returns the group name for organization in Processing."""
+        return self.tr("GeoPublicHealth Tools")
+
+    def groupId(self):
+        """Returns the unique group ID."""
+        return "geopublichealthtools"
+
+    def tr(self, string):
+        """Translates a string using the plugin's context."""
+        return QCoreApplication.translate("BlurEvaluationAlgorithm", string)
+
+    def createInstance(self):
+        """Creates a new instance of the algorithm."""
+        return BlurEvaluationAlgorithm()
+
+    def shortHelpString(self):
+        """Provides a brief description for the Processing GUI."""
+        return self.tr(
+            "Measures how well a blurred layer protects the original cases.\n"
+            "For each blurred feature: the displacement of the random point, the "
+            "k-anonymity (reference points inside the buffer), the risk (1 / k) and "
+            "whether the nearest original case of the random point is the right "
+            "one (nearest-neighbour linkage).\n"
+            "The population reference defaults to the original cases. Cases are "
+            "matched on the identifier field, or on the feature order."
+        )
@@ -24,6 +24,11 @@
 """
 
 import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import numpy as np
 
 # Core QGIS Imports for Processing
 from qgis.core import (
@@ -37,6 +42,7 @@ from qgis.core import (
     QgsFeatureSink,
     QgsWkbTypes,
     QgsFields,
+    QgsRectangle,
     QgsField,
     QgsVectorLayer,
     QgsFeature,
@@ -49,9 +55,14 @@ from qgis.PyQt.QtCore import QVariant, QCoreApplication
 
 # Plugin specific imports
 from geopublichealth.src.core.blurring.blur import Blur
-from geopublichealth.src.core.blurring.layer_index import LayerIndex
+from geopublichealth.src.core.blurring.k_anonymity import (
+    covering_buffer_radius,
+    k_anonymity_radius,
+)
+from geopublichealth.src.core.blurring.layer_index import LAYER_INDEX_CACHE
 from geopublichealth.src.utilities.resources import resource
 from geopublichealth.src.core.exceptions import GeoPublicHealthException
+from geopublichealth.src.core.gis.point_in_polygon import read_point_coordinates
 
 
 class BlurringGeoAlgorithm(QgsProcessingAlgorithm):
@@ -68,7 +79,15 @@ class BlurringGeoAlgorithm(QgsProcessingAlgorithm):
     CENTROID_EXPORT = "CENTROID_EXPORT"
     # DISTANCE_EXPORT seems unused in original code, omitting unless needed
     ENVELOPE_LAYER = "ENVELOPE_LAYER"
+    SAMPLE_IN_ENVELOPE = "SAMPLE_IN_ENVELOPE"
+    MIN_RADIUS = "MIN_RADIUS"
+    REFERENCE_LAYER = "REFERENCE_LAYER"
+    K_ANONYMITY = "K_ANONYMITY"
     RANDOM_SEED = "RANDOM_SEED"
+    THREADS = "THREADS"
+
+    # Features blurred by a worker at once
+    CHUNK_SIZE = 1000
 
     def initAlgorithm(self, config):
         """Defines the input parameters and output specifications for the algorithm."""
@@ -93,6 +112,17 @@ class BlurringGeoAlgorithm(QgsProcessingAlgorithm):
             )
         )
 
+        # Minimum displacement (donut masking)
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.MIN_RADIUS,
+                self.tr("Minimum displacement (map units, 0 for none)"),
+                type=QgsProcessingParameterNumber.Double,
+                defaultValue=0.0,
+                minValue=0.0,
+            )
+        )
+
         # Optional envelope layer (polygon)
         self.addParameter(
             QgsProcessingParameterVectorLayer(
@@ -103,6 +133,34 @@ class BlurringGeoAlgorithm(QgsProcessingAlgorithm):
             )
         )
 
+        # Draw once in the disk clipped by the envelope, no rejection loop
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.SAMPLE_IN_ENVELOPE,
+                self.tr("Sample directly inside the envelope"),
+                defaultValue=False,
+            )
+        )
+
+        # Optional adaptive radius covering k reference points (k-anonymity)
+        self.addParameter(
+            QgsProcessingParameterVectorLayer(
+                self.REFERENCE_LAYER,
+                self.tr("Reference layer for k-anonymity (households, population)"),
+                [QgsProcessing.TypeVectorPoint],
+                optional=True,
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.K_ANONYMITY,
+                self.tr("k: reference points covered by each radius (0 to disable)"),
+                type=QgsProcessingParameterNumber.Integer,
+                defaultValue=0,
+                minValue=0,
+            )
+        )
+
         # Option to add radius to output attributes
         self.addParameter(
             QgsProcessingParameterBoolean(
@@ -140,6 +198,17 @@ class BlurringGeoAlgorithm(QgsProcessingAlgorithm):
             )
         )
 
+        # Worker threads, the output does not depend on it
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.THREADS,
+                self.tr("Number of threads"),
+                type=QgsProcessingParameterNumber.Integer,
+                defaultValue=1,
+                minValue=1,
+            )
+        )
+
     def processAlgorithm(self, parameters, context, feedback):
         """Main execution logic of the blurring algorithm."""
 
@@ -149,6 +218,13 @@ class BlurringGeoAlgorithm(QgsProcessingAlgorithm):
             raise GeoPublicHealthException(self.tr("Input layer not found."))
 
         radius = self.parameterAsDouble(parameters, self.RADIUS_FIELD, context)
+        min_radius = self.parameterAsDouble(parameters, self.MIN_RADIUS, context)
+        if min_radius and min_radius >= radius:
+            feedback.reportError(
+                self.tr("The minimum displacement must be smaller than the radius."),
+                fatalError=True,
+            )
+            return {}
         export_radius = self.parameterAsBool(parameters, self.RADIUS_EXPORT, context)
         export_centroid = self.parameterAsBool(
             parameters, self.CENTROID_EXPORT, context
@@ -156,10 +232,19 @@ class BlurringGeoAlgorithm(QgsProcessingAlgorithm):
         envelope_layer = self.parameterAsVectorLayer(
             parameters, self.ENVELOPE_LAYER, context
         )
+        sample_in_envelope = self.parameterAsBool(
+            parameters, self.SAMPLE_IN_ENVELOPE, context
+        )
+        reference_layer = self.parameterAsVectorLayer(
+            parameters, self.REFERENCE_LAYER, context
+        )
+        k_anonymity = self.parameterAsInt(parameters, self.K_ANONYMITY, context)
+        threads = self.parameterAsInt(parameters, self.THREADS, context)
+        seed = None
         seed_value = parameters.get(self.RANDOM_SEED)
         if seed_value is not None:
             try:
-                random.seed(int(seed_value))
+                seed = int(seed_value)
             except (TypeError, ValueError):
                 feedback.reportError(
                     self.tr(
@@ -167,20 +252,63 @@ class BlurringGeoAlgorithm(QgsProcessingAlgorithm):
                     ),
                     fatalError=False,
                 )
+        if seed is None:
+            # Each feature draws from its own stream of this seed.
+            seed = random.SystemRandom().getrandbits(63)
+
+        # Check CRS compatibility of the envelope layer (if provided)
+        if envelope_layer and source.sourceCrs() != envelope_layer.crs():
+            feedback.reportError(
+                self.tr("Input layer and Envelope layer must have the same CRS."),
+                fatalError=True,
+            )
+            return {}
 
-        # --- Prepare Envelope Index (if provided) ---
-        vector_layer_envelope_index = None
-        if envelope_layer:
-            feedback.pushInfo(self.tr("Preparing envelope index..."))
-            # Check CRS compatibility
-            if source.sourceCrs() != envelope_layer.crs():
+        # --- Adaptive radius of each point (k-anonymity) ---
+        radii = None
+        if reference_layer and k_anonymity > 0:
+            if source.sourceCrs() != reference_layer.crs():
                 feedback.reportError(
-                    self.tr("Input layer and Envelope layer must have the same CRS."),
+                    self.tr("Input layer and Reference layer must have the same CRS."),
                     fatalError=True,
                 )
                 return {}
-            # Create spatial index for the envelope layer
-            vector_layer_envelope_index = LayerIndex(envelope_layer)
+            feedback.pushInfo(self.tr("Computing k-anonymity radii..."))
+            __, reference = read_point_coordinates(reference_layer)
+            fids, coordinates = read_point_coordinates(source)
+            try:
+                # The radius parameter is the minimum radius
+                values = k_anonymity_radius(
+                    coordinates, reference, k_anonymity, min_radius=radius
+                )
+            except ValueError as e:
+                feedback.reportError(str(e), fatalError=True)
+                return {}
+            finite = np.isfinite(values)
+            # The buffer around the displaced point must still contain the
+            # disk of the radius around the original point.
+            radii = dict(
+                zip(
+                    fids[finite].tolist(),
+                    zip(
+                        values[finite].tolist(),
+                        covering_buffer_radius(values[finite]).tolist(),
+                    ),
+                )
+            )
+
+        # --- Prepare Envelope Index (if provided) ---
+        vector_layer_envelope_index = None
+        if envelope_layer:
+            feedback.pushInfo(self.tr("Preparing envelope index..."))
+            # Only the envelope polygons a buffer can reach are indexed, the
+            # index is kept for the next runs on the same layers.
+            extent = QgsRectangle(source.sourceExtent())
+            # Points are moved by at most their k-anonymity radius.
+            extent.grow(
+                max([radius] + [r for r, __ in radii.values()]) if radii else radius
+            )
+            vector_layer_envelope_index = LAYER_INDEX_CACHE.get(envelope_layer, extent)
             feedback.pushInfo(self.tr("Envelope index created."))
 
         # --- Prepare Output ---
@@ -215,33 +343,42 @@ class BlurringGeoAlgorithm(QgsProcessingAlgorithm):
 
         # --- Initialize Blurring Algorithm ---
         feedback.pushInfo(self.tr("Starting blurring process..."))
-        algo = Blur(radius, vector_layer_envelope_index, export_radius, export_centroid)
+
+        def make_blur(envelope_index):
+            return Blur(
+                radius,
+                envelope_index,
+                export_radius,
+                export_centroid,
+                sample_in_envelope=sample_in_envelope,
+                seed=seed,
+                min_radius=min_radius,
+            )
 
         # --- Process Features ---
         total = 100.0 / source.featureCount() if source.featureCount() else 0
         features = source.getFeatures()
 
-        for current, feature in enumerate(features):
-            # Check for cancellation
-            if feedback.isCanceled():
-                break
-
-            try:
-                # Perform blurring
-                blurred_feature = algo.blur(feature)  # algo.blur returns a QgsFeature
-                # Add the processed feature to the output sink
-                sink.addFeature(blurred_feature, QgsFeatureSink.FastInsert)
-            except GeoPublicHealthException as e:
-                # Report errors encountered during blurring (e.g., point outside envelope)
-                feedback.reportError(
-                    f"Error processing feature ID {feature.id()}: {e.msg}",
-                    fatalError=False,
+        chunks = iter(lambda: list(islice(features, self.CHUNK_SIZE)), [])
+        if threads > 1:
+            # Each chunk uses its own envelope engines, as they are not
+            # thread-safe. Chunks are written in the reading order.
+            def blur_chunk(chunk):
+                envelope_index = None
+                if vector_layer_envelope_index is not None:
+                    envelope_index = vector_layer_envelope_index.copy()
+                return self.blur_chunk(make_blur(envelope_index), chunk, radii)
+
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                results = self.ordered_results(
+                    executor, blur_chunk, chunks, 2 * threads
                 )
-                # Optionally skip the feature or handle the error differently
-                continue  # Skip this feature and continue with the next
-
-            # Update progress feedback
-            feedback.setProgress(int(current * total))
+                self.write_chunks(results, sink, total, feedback)
+                results.close()
+        else:
+            algo = make_blur(vector_layer_envelope_index)
+            results = (self.blur_chunk(algo, chunk, radii) for chunk in chunks)
+            self.write_chunks(results, sink, total, feedback)
 
         # Check if the process was cancelled after the loop
         if feedback.isCanceled():
@@ -254,6 +391,60 @@ class BlurringGeoAlgorithm(QgsProcessingAlgorithm):
         # Return the destination ID for the output layer
         return {self.OUTPUT_LAYER: dest_id}
 
+    @staticmethod
+    def blur_chunk(algo, features, radii=None):
+        """Blur a list of features, keeping the errors to report them later.
+
+        ``radii`` is an optional (radius, buffer radius) pair by feature id,
+        the blur radius is used for the features without one.
+        """
+        blurred = []
+        errors = []
+        for feature in features:
+            try:
+                radius, buffer_radius = (
+                    radii.get(feature.id(), (None, None)) if radii else (None, None)
+                )
+                blurred.append(algo.blur(feature, radius, buffer_radius))
+            except GeoPublicHealthException as e:
+                # e.g. point outside envelope, the feature is skipped
+                errors.append((feature.id(), e.msg))
+        return len(features), blurred, errors
+
+    @staticmethod
+    def ordered_results(executor, function, chunks, window):
+        """Run the chunks concurrently and yield the results in order.
+
+        At most ``window`` chunks are read ahead. Closing the generator
+        cancels the chunks not started yet.
+        """
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(function, chunk))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def write_chunks(self, results, sink, total, feedback):
+        """Write the blurred chunks in order, with progress and cancellation."""
+        done = 0
+        for count, blurred, errors in results:
+            for feature_id, message in errors:
+                feedback.reportError(
+                    f"Error processing feature ID {feature_id}: {message}",
+                    fatalError=False,
+                )
+            sink.addFeatures(blurred, QgsFeatureSink.FastInsert)
+            done += count
+            feedback.setProgress(int(done * total))
+            if feedback.isCanceled():
+                break
+
     # --- Metadata Methods ---
     def name(self):
         """Returns the unique algorithm name."""
@@ -288,7 +479,22 @@ class BlurringGeoAlgorithm(QgsProcessingAlgorithm):
         """Provides a brief description for the Processing GUI."""
         return self.tr(
             "Blurs point locations by creating polygon buffers around randomly offset points.\n"
-            "Optionally uses an envelope layer as a mask and adds radius/centroid attributes."
+            "Optionally uses an envelope layer as a mask and adds radius/centroid attributes.\n"
+            "With direct sampling, each point is drawn once in the part of its disk "
+            "inside the envelope, so the radius is never reduced.\n"
+            "Each point has its own random stream derived from the seed and its "
+            "feature id, so the output does not depend on the number of threads.\n"
+            "With a reference layer and k > 0, the radius of each point is the "
+            "distance to its k-th nearest reference point (households or "
+            "population points), at least the radius parameter. The point is "
+            "moved by at most this radius and its buffer has twice the radius, "
+            "so every buffer still covers the k reference points.\n"
+            "With a minimum displacement, each point is moved area-uniformly "
+            "between the minimum displacement and the radius (donut masking), "
+            "scaled along with the k-anonymity radius. A point which can not be "
+            "moved that far inside the envelope is skipped and reported.\n"
+            "Only the envelope polygons within the radius of the input extent are "
+            "indexed. The index of a saved file layer is reused by the next runs."
         )
 
     def icon(self):
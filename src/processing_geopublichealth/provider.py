@@ -27,6 +27,10 @@ from qgis.core import QgsProcessingProvider
 
 from geopublichealth.src.processing_geopublichealth.blurring import (
     BlurringGeoAlgorithm)
+from geopublichealth.src.processing_geopublichealth.blur_evaluation import (
+    BlurEvaluationAlgorithm)
+from geopublichealth.src.processing_geopublichealth.space_time import (
+    SpaceTimeCountsAlgorithm)
 from geopublichealth.src.utilities.resources import resource
 
 class Provider(QgsProcessingProvider):
@@ -39,7 +43,11 @@ class Provider(QgsProcessingProvider):
         self.activate = True
 
         # Load algorithms
-        self.alglist = [BlurringGeoAlgorithm()]
+        self.alglist = [
+            BlurringGeoAlgorithm(),
+            BlurEvaluationAlgorithm(),
+            SpaceTimeCountsAlgorithm(),
+        ]
         for alg in self.alglist:
             alg.provider = self
 
@@ -51,6 +59,8 @@ class Provider(QgsProcessingProvider):
         pass
     def loadAlgorithms(self):
         self.addAlgorithm(BlurringGeoAlgorithm())
+        self.addAlgorithm(BlurEvaluationAlgorithm())
+        self.addAlgorithm(SpaceTimeCountsAlgorithm())
 
     def id(self):
         return 'GeoPublicHealth'
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+# Core QGIS Imports for Processing
+from qgis.core import (
+    QgsProcessing,
+    QgsProcessingAlgorithm,
+    QgsProcessingParameterEnum,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterField,
+    QgsProcessingParameterNumber,
+    QgsFeatureSink,
+    QgsWkbTypes,
+    QgsFields,
+    QgsField,
+    QgsFeature,
+)
+
+# PyQt Imports
+from qgis.PyQt.QtCore import QCoreApplication, QDate, QVariant, Qt
+
+# Plugin specific imports
+from geopublichealth.src.core.gis.point_in_polygon import (
+    PointInPolygonAssigner,
+    read_point_records,
+)
+from geopublichealth.src.core.services import space_time
+from geopublichealth.src.core.exceptions import GeoPublicHealthException
+
+
+class SpaceTimeCountsAlgorithm(QgsProcessingAlgorithm):
+    """
+    QGIS Processing algorithm counting dated cases per polygon and time bin.
+    Points are assigned to the polygons and binned by date in a single pass.
+    """
+
+    # Parameter and Output constants
+    INPUT_POINTS = "INPUT_POINTS"
+    DATE_FIELD = "DATE_FIELD"
+    INPUT_POLYGONS = "INPUT_POLYGONS"
+    ID_FIELD = "ID_FIELD"
+    PERIOD = "PERIOD"
+    STEP = "STEP"
+    LAYOUT = "LAYOUT"
+    OUTPUT_LAYER = "OUTPUT_LAYER"
+
+    # Layout of the output
+    LAYOUT_LONG = 0
+    LAYOUT_WIDE = 1
+
+    def initAlgorithm(self, config):
+        """Defines the input parameters and output specifications for the algorithm."""
+
+        # Input case layer, with the onset dates
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.INPUT_POINTS,
+                self.tr("Case layer"),
+                [QgsProcessing.TypeVectorPoint],
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.DATE_FIELD,
+                self.tr("Date field"),
+                parentLayerParameterName=self.INPUT_POINTS,
+            )
+        )
+
+        # Polygons to aggregate the cases
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.INPUT_POLYGONS,
+                self.tr("Layer for aggregation"),
+                [QgsProcessing.TypeVectorPolygon],
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.ID_FIELD,
+                self.tr("Polygon identifier (long table, feature id if empty)"),
+                parentLayerParameterName=self.INPUT_POLYGONS,
+                optional=True,
+            )
+        )
+
+        # Time bins
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.PERIOD,
+                self.tr("Period"),
+                options=[
+                    self.tr("Day"),
+                    self.tr("Week"),
+                    self.tr("Month"),
+                    self.tr("Year"),
+                ],
+                defaultValue=1,
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.STEP,
+                self.tr("Periods per time bin"),
+                type=QgsProcessingParameterNumber.Integer,
+                defaultValue=1,
+                minValue=1,
+            )
+        )
+
+        # Output
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.LAYOUT,
+                self.tr("Output layout"),
+                options=[
+                    self.tr("Long table (polygon, bin start, count)"),
+                    self.tr("Wide columns (one count column per bin)"),
+                ],
+                defaultValue=self.LAYOUT_LONG,
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT_LAYER,
+                self.tr("Space-time counts (Output)"),
+            )
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        """Main execution logic of the space-time aggregation."""
+
+        # --- Get Parameters ---
+        points = self.parameterAsSource(parameters, self.INPUT_POINTS, context)
+        polygons = self.parameterAsSource(parameters, self.INPUT_POLYGONS, context)
+        if points is None or polygons is None:
+            raise GeoPublicHealthException(self.tr("Input layer not found."))
+
+        date_field = self.parameterAsString(parameters, self.DATE_FIELD, context)
+        id_field = self.parameterAsString(parameters, self.ID_FIELD, context)
+        period = space_time.PERIODS[
+            self.parameterAsEnum(parameters, self.PERIOD, context)
+        ]
+        step = self.parameterAsInt(parameters, self.STEP, context)
+        layout = self.parameterAsEnum(parameters, self.LAYOUT, context)
+
+        if points.sourceCrs() != polygons.sourceCrs():
+            feedback.reportError(
+                self.tr("Case layer and aggregation layer must have the same CRS."),
+                fatalError=True,
+            )
+            return {}
+
+        # --- Read the cases and bin their dates ---
+        feedback.pushInfo(self.tr("Reading cases..."))
+        __, coordinates, dates = read_point_records(points, date_field)
+        try:
+            codes, bin_starts = space_time.date_bins(dates, period, step)
+        except ValueError as e:
+            feedback.reportError(str(e), fatalError=True)
+            return {}
+        skipped = int((codes < 0).sum())
+        if skipped:
+            feedback.pushInfo(
+                self.tr("{} cases without a date are skipped.").format(skipped)
+            )
+        labels = space_time.bin_labels(bin_starts, period)
+
+        # --- Assign the cases to the polygons, in a single pass ---
+        feedback.pushInfo(self.tr("Assigning cases to polygons..."))
+        assigner = PointInPolygonAssigner(coordinates)
+        polygon_features = []
+        total = 100.0 / polygons.featureCount() if polygons.featureCount() else 0
+        for position, feature in enumerate(polygons.getFeatures()):
+            if feedback.isCanceled():
+                return {}
+            assigner.assign(position, feature.geometry())
+            polygon_features.append(feature)
+            feedback.setProgress(int(position * total))
+
+        counts = space_time.space_time_counts(assigner.assignment, codes, len(labels))
+
+        # --- Write the output ---
+        if layout == self.LAYOUT_WIDE:
+            dest_id = self.write_wide(
+                parameters, context, polygons, polygon_features, counts, labels
+            )
+        else:
+            dest_id = self.write_long(
+                parameters,
+                context,
+                polygons,
+                polygon_features,
+                id_field,
+                counts,
+                labels,
+            )
+
+        if feedback.isCanceled():
+            return {}
+        return {self.OUTPUT_LAYER: dest_id}
+
+    def write_long(
+        self, parameters, context, polygons, polygon_features, id_field, counts, labels
+    ):
+        """Write one row without geometry per polygon and non-empty bin."""
+        out_fields = QgsFields()
+        if id_field:
+            out_fields.append(polygons.fields().field(id_field))
+        else:
+            out_fields.append(QgsField("polygon_id", QVariant.LongLong))
+        out_fields.append(QgsField("bin_start", QVariant.Date))
+        out_fields.append(QgsField("count", QVariant.Int))
+
+        (sink, dest_id) = self.parameterAsSink(
+            parameters,
+            self.OUTPUT_LAYER,
+            context,
+            out_fields,
+            QgsWkbTypes.NoGeometry,
+            polygons.sourceCrs(),
+        )
+        if sink is None:
+            raise GeoPublicHealthException(self.tr("Could not create output layer."))
+
+        identifiers = [
+            feature[id_field] if id_field else feature.id()
+            for feature in polygon_features
+        ]
+        bin_dates = [QDate.fromString(label[:10], Qt.ISODate) for label in labels]
+        rows = []
+        for polygon, time_bin, count in zip(*counts):
+            row = QgsFeature(out_fields)
+            row.setAttributes([identifiers[polygon], bin_dates[time_bin], int(count)])
+            rows.append(row)
+        sink.addFeatures(rows, QgsFeatureSink.FastInsert)
+        return dest_id
+
+    def write_wide(
+        self, parameters, context, polygons, polygon_features, counts, labels
+    ):
+        """Write the polygons with one count column per time bin.
+
+        Columns are named after the bin index, to fit the 10 characters of
+        shapefile field names, with the bin label as alias.
+        """
+        out_fields = QgsFields()
+        out_fields.extend(polygons.fields())
+        names = set(out_fields.names())
+        for time_bin, label in enumerate(labels):
+            name = "c_{}".format(time_bin)
+            if name in names:
+                raise GeoPublicHealthException(
+                    self.tr("The polygon layer already has a field {}.").format(name)
+                )
+            field = QgsField(name, QVariant.Int)
+            field.setAlias(label)
+            out_fields.append(field)
+
+        (sink, dest_id) = self.parameterAsSink(
+            parameters,
+            self.OUTPUT_LAYER,
+            context,
+            out_fields,
+            polygons.wkbType(),
+            polygons.sourceCrs(),
+        )
+        if sink is None:
+            raise GeoPublicHealthException(self.tr("Could not create output layer."))
+
+        matrix = space_time.count_matrix(
+            *counts, polygon_count=len(polygon_features), bin_count=len(labels)
+        )
+        rows = []
+        for feature, polygon_counts in zip(polygon_features, matrix.tolist()):
+            row = QgsFeature(out_fields)
+            row.setGeometry(feature.geometry())
+            row.setAttributes(feature.attributes() + polygon_counts)
+            rows.append(row)
+        sink.addFeatures(rows, QgsFeatureSink.FastInsert)
+        return dest_id
+
+    # --- Metadata Methods ---
+    def name(self):
+        """Returns the unique algorithm name."""
+        return "geopublichealth_space_time_counts"
+
+    def displayName(self):
+        """Returns the translated algorithm name."""
+        return self.tr("Space-time case counts")
+
+    def group(self):
+        """Returns the group name for organization in Processing."""
+        return self.tr("GeoPublicHealth Tools")
+
+    def groupId(self):
+        """Returns the unique group ID."""
+        return "geopublichealthtools"
+
+    def tr(self, string):
+        """Translates a string using the plugin's context."""
+        return QCoreApplication.translate("SpaceTimeCountsAlgorithm", string)
+
+    def createInstance(self):
+        """Creates a new instance of the algorithm."""
+        return SpaceTimeCountsAlgorithm()
+
+    def shortHelpString(self):
+        """Provides a brief description for the Processing GUI."""
+        return self.tr(
+            "Counts the cases of each polygon in each time bin (day, week starting "
+            "on Monday, month or year), in a single pass over the cases.\n"
+            "The output is either a long table (polygon, bin start, count) of the "
+            "non-empty bins, or the polygons with one count column per bin "
+            "(c_0, c_1, ... with the first day of the bin as alias).\n"
+            "Dates may include a time part, the run stops on a value which is not "
+            "a date."
+        )
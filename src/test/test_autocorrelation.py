@@ -21,8 +21,11 @@
  ***************************************************************************/
 """
 
+import itertools
 import unittest
 
+import numpy as np
+
 from src.core.services import autocorrelation
 
 try:
@@ -32,6 +35,13 @@ try:
 except ImportError:
     LIBPYSAL_AVAILABLE = False
 
+try:
+    from scipy import sparse
+
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 
 class TestAutocorrelation(unittest.TestCase):
     @unittest.skipUnless(autocorrelation.PYSAL_AVAILABLE, "PySAL not available")
@@ -106,3 +116,176 @@ class TestAutocorrelation(unittest.TestCase):
         )
         self.assertTrue(hasattr(global_rate, "I"))
         self.assertEqual(len(local_rate.Is), 4)
+
+    @unittest.skipUnless(
+        autocorrelation.PYSAL_AVAILABLE and LIBPYSAL_AVAILABLE,
+        "PySAL not available",
+    )
+    def test_batch_matches_esda(self):
+        from esda.getisord import G_Local
+        from esda.moran import Moran_Local
+
+        values = np.random.default_rng(1).random((25, 3)) * 10
+        result = autocorrelation.batch_local_statistics(
+            values, libpysal.weights.lat2W(5, 5)
+        )
+        for column in range(values.shape[1]):
+            weights = libpysal.weights.lat2W(5, 5)
+            moran = Moran_Local(values[:, column], weights, permutations=0)
+            g_local = G_Local(
+                values[:, column], weights, transform="R", permutations=0
+            )
+            np.testing.assert_allclose(result["moran"]["stat"][:, column], moran.Is)
+            np.testing.assert_array_equal(result["moran"]["q"][:, column], moran.q)
+            np.testing.assert_allclose(result["g_local"]["stat"][:, column], g_local.Gs)
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not available")
+    def test_batch_exact_randomization(self):
+        # Path graph: z-scores must match a full enumeration of the
+        # conditional randomization distribution.
+        matrix = sparse.csr_matrix(np.eye(5, k=1) + np.eye(5, k=-1))
+        values = np.array([1.0, 4.0, 2.0, 8.0, 3.0])
+        result = autocorrelation.batch_local_statistics(values, matrix)
+
+        z_scores = (values - values.mean()) / values.std()
+        for unit in range(5):
+            neighbors = np.flatnonzero(matrix[unit].toarray()[0])
+            others = [other for other in range(5) if other != unit]
+            simulated = {"moran": [], "geary": [], "g_local": []}
+            for draw in itertools.permutations(others, len(neighbors)):
+                draw = list(draw)
+                weight = 1.0 / len(neighbors)
+                lag = weight * z_scores[draw].sum()
+                simulated["moran"].append(0.8 * z_scores[unit] * lag)
+                simulated["geary"].append(
+                    weight * ((z_scores[unit] - z_scores[draw]) ** 2).sum()
+                )
+                simulated["g_local"].append(
+                    weight * values[draw].sum() / (values.sum() - values[unit])
+                )
+            for statistic, sample in simulated.items():
+                sample = np.array(sample)
+                observed = result[statistic]["stat"][unit, 0]
+                self.assertAlmostEqual(
+                    result[statistic]["z"][unit, 0],
+                    (observed - sample.mean()) / sample.std(),
+                )
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not available")
+    def test_batch_permutations(self):
+        matrix = sparse.csr_matrix(np.eye(30, k=1) + np.eye(30, k=-1))
+        values = np.random.default_rng(2).random((30, 2))
+        first = autocorrelation.batch_local_statistics(
+            values, matrix, permutations=99, seed=3
+        )
+        second = autocorrelation.batch_local_statistics(
+            values, matrix, permutations=99, seed=3
+        )
+        for statistic in autocorrelation.BATCH_STATISTICS:
+            p_values = first[statistic]["p"]
+            np.testing.assert_array_equal(p_values, second[statistic]["p"])
+            self.assertTrue(((p_values > 0) & (p_values <= 0.5)).all())
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not available")
+    def test_batch_missing_values(self):
+        # A field with a NULL value has no result, not a significant one.
+        matrix = sparse.csr_matrix(np.eye(30, k=1) + np.eye(30, k=-1))
+        values = np.random.default_rng(5).random((30, 2))
+        values[4, 0] = np.nan
+        for permutations in (0, 99):
+            result = autocorrelation.batch_local_statistics(
+                values, matrix, permutations=permutations, seed=1
+            )
+            for statistic in autocorrelation.BATCH_STATISTICS:
+                for key, column in result[statistic].items():
+                    self.assertTrue(np.isnan(column[:, 0]).all(), (statistic, key))
+                    self.assertFalse(np.isnan(column[:, 1]).any(), (statistic, key))
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not available")
+    def test_batch_invalid_statistic(self):
+        matrix = sparse.csr_matrix(np.eye(3, k=1) + np.eye(3, k=-1))
+        with self.assertRaises(ValueError):
+            autocorrelation.batch_local_statistics(
+                np.ones((3, 1)), matrix, statistics=["join"]
+            )
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not available")
+    def test_batch_progress_and_cancel(self):
+        matrix = sparse.csr_matrix(np.eye(30, k=1) + np.eye(30, k=-1))
+        values = np.random.default_rng(4).random((30, 2))
+        progress = []
+        autocorrelation.batch_local_statistics(
+            values,
+            matrix,
+            permutations=19,
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+        self.assertEqual(progress[-1], (60, 60))
+
+        result = autocorrelation.batch_local_statistics(
+            values, matrix, permutations=19, cancel_callback=lambda: True
+        )
+        self.assertIsNone(result)
+
+    @unittest.skipUnless(
+        autocorrelation.PYSAL_AVAILABLE and LIBPYSAL_AVAILABLE,
+        "PySAL not available",
+    )
+    def test_global_matches_esda(self):
+        from esda.geary import Geary
+        from esda.moran import Moran
+
+        values = np.random.default_rng(2).random(36) * 10
+        for statistic, builder, name in (
+            ("moran", Moran, "I"),
+            ("geary", Geary, "C"),
+        ):
+            expected = builder(values, libpysal.weights.lat2W(6, 6), permutations=0)
+            # Default tails: the ones of esda for each statistic.
+            result = autocorrelation.global_autocorrelation(
+                values, libpysal.weights.lat2W(6, 6), statistic=statistic
+            )
+            self.assertAlmostEqual(result["stat"], getattr(expected, name))
+            for key in ("z_norm", "p_norm", "z_rand", "p_rand"):
+                self.assertAlmostEqual(result[key], getattr(expected, key))
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not available")
+    def test_global_chunked_permutations(self):
+        matrix = sparse.csr_matrix(np.eye(40, k=1) + np.eye(40, k=-1))
+        values = np.cumsum(np.random.default_rng(5).normal(size=40))
+        progress = []
+        chunk_values = autocorrelation.PERMUTATION_CHUNK_VALUES
+        autocorrelation.PERMUTATION_CHUNK_VALUES = 400
+        try:
+            result = autocorrelation.global_autocorrelation(
+                values,
+                matrix,
+                permutations=99,
+                seed=0,
+                progress_callback=lambda done, total: progress.append((done, total)),
+            )
+            cancelled = autocorrelation.global_autocorrelation(
+                values, matrix, permutations=99, cancel_callback=lambda: True
+            )
+        finally:
+            autocorrelation.PERMUTATION_CHUNK_VALUES = chunk_values
+
+        self.assertEqual(progress[0], (10, 99))
+        self.assertEqual(progress[-1], (99, 99))
+        self.assertIsNone(cancelled)
+        # Smooth series: strong positive autocorrelation.
+        self.assertGreater(result["stat"], 0.5)
+        self.assertEqual(result["p_sim"], 0.01)
+        self.assertAlmostEqual(result["expected_sim"], result["expected"], delta=0.1)
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not available")
+    def test_global_invalid_values(self):
+        matrix = sparse.csr_matrix(np.eye(5, k=1) + np.eye(5, k=-1))
+        with self.assertRaises(ValueError):
+            autocorrelation.global_autocorrelation([1, 2, np.nan, 4, 5], matrix)
+        with self.assertRaises(ValueError):
+            autocorrelation.global_autocorrelation([1] * 5, matrix)
+        with self.assertRaises(ValueError):
+            autocorrelation.global_autocorrelation(
+                [1, 2, 3, 4, 5], matrix, statistic="join_counts"
+            )
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import unittest
+
+import numpy as np
+
+try:
+    from qgis.core import QgsFeature, QgsGeometry, QgsVectorLayer
+    from qgis.testing import start_app
+
+    from src.core.blurring.blur import Blur
+    from src.core.blurring.layer_index import LayerIndex
+    from src.core.exceptions import MinimumDisplacementException
+
+    start_app()
+    QGIS_AVAILABLE = True
+except ImportError:
+    QGIS_AVAILABLE = False
+
+
+@unittest.skipUnless(QGIS_AVAILABLE, "QGIS not available")
+class TestBlurMinimumDisplacement(unittest.TestCase):
+    def setUp(self):
+        # 10 x 10 envelope: no point of it is 20 units away from the center.
+        layer = QgsVectorLayer("Polygon?crs=epsg:2154", "envelope", "memory")
+        envelope = QgsFeature()
+        envelope.setGeometry(QgsGeometry.fromWkt("POLYGON((0 0,10 0,10 10,0 10,0 0))"))
+        layer.dataProvider().addFeatures([envelope])
+        self.envelope = LayerIndex(layer)
+
+        self.point = QgsFeature()
+        self.point.setId(7)
+        self.point.setGeometry(QgsGeometry.fromWkt("POINT(5 5)"))
+
+    def test_never_closer_than_the_minimum_radius(self):
+        for sample_in_envelope in (False, True):
+            algo = Blur(100, self.envelope, False, False, sample_in_envelope, 1, 20)
+            with self.assertRaises(MinimumDisplacementException):
+                algo.blur(self.point)
+
+            batch = algo.blur_batch(
+                [5.0, 50.0], [5.0, 5.0], feature_ids=[7, 8], chunk_size=2
+            )
+            self.assertEqual(list(batch), [([], [8, 7])])
+
+    def test_donut_inside_the_envelope(self):
+        for sample_in_envelope in (False, True):
+            algo = Blur(4, self.envelope, False, False, sample_in_envelope, 1, 2)
+            ((features, skipped),) = algo.blur_batch(
+                np.full(50, 5.0), np.full(50, 5.0), rng=np.random.default_rng(2)
+            )
+            self.assertEqual(skipped, [])
+            for feature in features:
+                center = feature.geometry().centroid().asPoint()
+                distance = np.hypot(center.x() - 5.0, center.y() - 5.0)
+                self.assertGreaterEqual(distance, 2.0 - 1e-6)
+
+    def test_clipped_donut_never_closer_than_the_minimum_radius(self):
+        # The disk crosses the left edge of the envelope.
+        algo = Blur(4, self.envelope, False, False, True, 1, 2)
+        ((features, skipped),) = algo.blur_batch(
+            np.full(2000, 1.0), np.full(2000, 5.0), rng=np.random.default_rng(3)
+        )
+        self.assertEqual(skipped, [])
+        for feature in features:
+            center = feature.geometry().centroid().asPoint()
+            self.assertTrue(0.0 <= center.x() <= 10.0)
+            distance = np.hypot(center.x() - 1.0, center.y() - 5.0)
+            self.assertGreaterEqual(distance, 2.0 - 1e-9)
+
+
+@unittest.skipUnless(QGIS_AVAILABLE, "QGIS not available")
+class TestBlurSampleInEnvelope(unittest.TestCase):
+    def setUp(self):
+        layer = QgsVectorLayer("Polygon?crs=epsg:2154", "envelope", "memory")
+        envelope = QgsFeature()
+        envelope.setGeometry(QgsGeometry.fromWkt("POLYGON((0 0,10 0,10 10,0 10,0 0))"))
+        layer.dataProvider().addFeatures([envelope])
+        self.envelope = LayerIndex(layer)
+
+    def test_clipped_disk_near_the_edge(self):
+        # The disks cross the left edge: they are clipped and triangulated.
+        count = 500
+        algo = Blur(2, self.envelope, True, False, True)
+        rng = np.random.default_rng(5)
+        ((features, skipped),) = algo.blur_batch(
+            np.full(count, 0.5), np.full(count, 5.0), rng=rng
+        )
+        self.assertEqual(skipped, [])
+        self.assertEqual(len(features), count)
+
+        # A single draw of three uniforms per point, no rejection.
+        reference = np.random.default_rng(5)
+        reference.random((count, 3))
+        self.assertEqual(rng.bit_generator.state, reference.bit_generator.state)
+
+        for feature in features:
+            geometry = feature.geometry()
+            center = geometry.centroid()
+            self.assertTrue(self.envelope.contains(center))
+            # The radius is never reduced.
+            self.assertEqual(feature.attributes(), [2])
+            point = center.asPoint()
+            for vertex in geometry.vertices():
+                distance = np.hypot(vertex.x() - point.x(), vertex.y() - point.y())
+                self.assertAlmostEqual(distance, 2.0)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import unittest
+
+import numpy as np
+
+from src.core.blurring import evaluation
+
+try:
+    import scipy  # noqa: F401
+
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+@unittest.skipUnless(SCIPY_AVAILABLE, "scipy not available")
+class TestBlurringEvaluation(unittest.TestCase):
+    def setUp(self):
+        self.original = np.array([[0, 0], [10, 0], [20, 0], [np.nan, np.nan]])
+        # The second case is moved next to the third one.
+        self.centers = np.array([[1, 0], [19, 0], [20, 1], [5, 5]])
+        self.reference = np.array([[0, 0], [1, 1], [2, 0], [19, 0], [30, 0]])
+
+    def test_anonymity_counts(self):
+        counts = evaluation.anonymity_counts(self.centers, 2.0, self.reference)
+        self.assertEqual(counts.tolist(), [3, 1, 1, 0])
+
+        counts = evaluation.anonymity_counts(
+            self.centers, [2.0, 0.5, 11.0, 2.0], self.reference
+        )
+        self.assertEqual(counts.tolist(), [3, 1, 2, 0])
+
+    def test_linkage_hits(self):
+        hits = evaluation.linkage_hits(self.original, self.centers)
+        self.assertEqual(hits.tolist(), [True, False, True, False])
+
+        with self.assertRaises(ValueError):
+            evaluation.linkage_hits(self.original, self.centers[:2])
+
+    def test_evaluate_and_summary(self):
+        metrics = evaluation.evaluate_blurring(
+            self.original, self.centers, 2.0, self.reference
+        )
+        np.testing.assert_allclose(
+            metrics[evaluation.METRIC_DISPLACEMENT][:3], [1, 9, 1]
+        )
+        self.assertTrue(np.isnan(metrics[evaluation.METRIC_DISPLACEMENT][3]))
+        self.assertEqual(
+            metrics[evaluation.METRIC_RISK].tolist(), [1 / 3, 1.0, 1.0, 1.0]
+        )
+
+        rows = dict(evaluation.summary(metrics, k=2))
+        self.assertEqual(rows["Count"], "4")
+        self.assertEqual(rows["Displacement median"], "1.000000")
+        self.assertEqual(rows["k-anonymity min"], "0")
+        self.assertEqual(rows["Nearest-neighbour linkage rate"], "0.500000")
+        self.assertEqual(rows["Share below k = 2"], "0.750000")
+
+        # Without reference, the other cases are the population.
+        metrics = evaluation.evaluate_blurring(self.original, self.centers, 2.0)
+        self.assertEqual(metrics[evaluation.METRIC_ANONYMITY].tolist(), [1, 1, 1, 0])
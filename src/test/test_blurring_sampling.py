@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import unittest
+
+import numpy as np
+
+from src.core.blurring import sampling
+
+try:
+    from shapely import wkb
+
+    SHAPELY_AVAILABLE = True
+except ImportError:
+    SHAPELY_AVAILABLE = False
+
+
+class TestBlurringSampling(unittest.TestCase):
+    def test_random_offsets_within_radius(self):
+        rng = np.random.default_rng(1)
+        radius = np.array([10.0, 0.0, 2.5] * 1000)
+        dx, dy = sampling.random_offsets(rng, radius)
+        distance = np.hypot(dx, dy)
+        self.assertTrue((distance <= radius + 1e-12).all())
+        self.assertTrue((distance[1::3] == 0).all())
+
+        again = sampling.random_offsets(np.random.default_rng(1), radius)
+        np.testing.assert_array_equal(again[0], dx)
+
+    def test_feature_random_streams(self):
+        stream = sampling.FeatureRandom(42, 7)
+        values = [stream.random() for _ in range(1000)]
+        self.assertTrue(all(0.0 <= value < 1.0 for value in values))
+        self.assertAlmostEqual(np.mean(values), 0.5, delta=0.05)
+
+        # Same seed and feature id, same numbers, whatever was drawn before.
+        sampling.FeatureRandom(42, 8).random()
+        again = sampling.FeatureRandom(42, 7)
+        self.assertEqual([again.random() for _ in range(1000)], values)
+
+        self.assertNotEqual(sampling.FeatureRandom(42, 8).random(), values[0])
+        self.assertNotEqual(sampling.FeatureRandom(43, 7).random(), values[0])
+        self.assertTrue(-1 <= sampling.FeatureRandom(0, -1).uniform(-1, 1) < 1)
+
+    def test_donut_offsets(self):
+        rng = np.random.default_rng(5)
+        radius = np.full(20000, 10.0)
+        dx, dy = sampling.donut_offsets(rng, 4.0, radius)
+        distance = np.hypot(dx, dy)
+        self.assertTrue((distance >= 4.0 - 1e-12).all())
+        self.assertTrue((distance <= 10.0 + 1e-12).all())
+        # Area-uniform: half of the points inside the ring of half the area.
+        middle = np.sqrt((10.0**2 + 4.0**2) / 2)
+        self.assertAlmostEqual((distance < middle).mean(), 0.5, delta=0.02)
+
+        dx, dy = sampling.donut_offsets(rng, [1.0, 0.0], [1.0, 2.0])
+        self.assertAlmostEqual(np.hypot(dx[0], dy[0]), 1.0)
+
+        dx, dy = sampling.sample_in_donut(4.0, 10.0, [0.0, 0.25])
+        self.assertAlmostEqual(dx, 0.0)
+        self.assertAlmostEqual(dy, 4.0)
+
+    def test_circle_template(self):
+        template = sampling.circle_template(20)
+        self.assertEqual(template.shape, (81, 2))
+        np.testing.assert_array_equal(template[0], template[-1])
+        np.testing.assert_allclose(np.hypot(*template.T), 1.0)
+        # Clockwise, as GEOS buffers.
+        self.assertLess(template[1, 1], 0)
+
+    @unittest.skipUnless(SHAPELY_AVAILABLE, "shapely not available")
+    def test_circle_polygons_wkb(self):
+        template = sampling.circle_template(20)
+        polygons = sampling.circle_polygons_wkb(
+            [0.0, 100.0], [0.0, -5.0], 2.0, template
+        )
+        self.assertEqual(len(polygons), 2)
+
+        polygon = wkb.loads(polygons[1])
+        self.assertTrue(polygon.is_valid)
+        self.assertAlmostEqual(polygon.centroid.x, 100.0)
+        self.assertAlmostEqual(polygon.centroid.y, -5.0)
+        # Inscribed 80-gon of the circle.
+        self.assertAlmostEqual(polygon.area, np.pi * 4, delta=0.02)
+
+        sizes = sampling.circle_polygons_wkb([0, 0], [0, 0], [1.0, 3.0], template)
+        self.assertAlmostEqual(wkb.loads(sizes[1]).bounds[2], 3.0)
+
+    def test_sample_in_disk(self):
+        dx, dy = sampling.sample_in_disk(3.0, [1.0, 0.25])
+        self.assertAlmostEqual(dx, 0.0)
+        self.assertAlmostEqual(dy, 3.0)
+
+    def test_triangulate_polygon_with_hole(self):
+        outer = [(0, 0), (0, 10), (10, 10), (10, 0), (0, 0)]
+        hole = [(3, 3), (6, 3), (6, 6), (3, 6), (3, 3)]
+        triangles = sampling.triangulate_polygon([outer, hole])
+        self.assertEqual(triangles.shape, (8, 3, 2))
+        self.assertAlmostEqual(sampling.triangle_areas(triangles).sum(), 91.0)
+
+    @unittest.skipUnless(SHAPELY_AVAILABLE, "shapely not available")
+    def test_sample_in_clipped_disk(self):
+        from shapely.geometry import Point, Polygon
+
+        # Disk clipped by a concave envelope, as done by Blur.
+        envelope = Polygon(
+            [(-10, -10), (1, -10), (1, 0), (-2, 1), (1, 2), (1, 10), (-10, 10)]
+        )
+        region = Point(0, 0).buffer(5, 20).intersection(envelope)
+        triangles = sampling.triangulate_polygon([region.exterior.coords])
+        self.assertAlmostEqual(
+            sampling.triangle_areas(triangles).sum(), region.area, places=9
+        )
+
+        rng = np.random.default_rng(3)
+        tolerance = region.buffer(1e-9)
+        for uniforms in rng.random((500, 3)):
+            point = sampling.sample_in_triangles(triangles, uniforms)
+            self.assertTrue(tolerance.contains(Point(point)))
+
+        self.assertIsNone(sampling.sample_in_triangles(triangles[:0], [0, 0, 0]))
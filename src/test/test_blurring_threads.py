@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import unittest
+from os.path import abspath, dirname, join
+
+try:
+    from qgis.core import (
+        QgsFeature,
+        QgsGeometry,
+        QgsProcessingContext,
+        QgsProcessingFeedback,
+        QgsProcessingUtils,
+        QgsVectorLayer,
+    )
+    from qgis.testing import start_app
+
+    from src.processing_geopublichealth.blurring import BlurringGeoAlgorithm
+
+    start_app()
+    QGIS_AVAILABLE = True
+except ImportError:
+    QGIS_AVAILABLE = False
+
+CASES = join(
+    dirname(dirname(abspath(__file__))),
+    "processing_geopublichealth",
+    "testdata",
+    "geohealth_sample_data_en",
+    "fictional_cases.shp",
+)
+
+
+@unittest.skipUnless(QGIS_AVAILABLE, "QGIS not available")
+class TestBlurringThreads(unittest.TestCase):
+    def setUp(self):
+        self.cases = QgsVectorLayer(CASES, "cases", "ogr")
+        self.assertTrue(self.cases.isValid())
+
+        # Envelope slightly larger than the cases, so buffers cross its edge.
+        extent = self.cases.extent()
+        extent.grow(0.005)
+        self.envelope = QgsVectorLayer(
+            "Polygon?crs={}".format(self.cases.crs().authid()), "envelope", "memory"
+        )
+        feature = QgsFeature()
+        feature.setGeometry(QgsGeometry.fromRect(extent))
+        self.envelope.dataProvider().addFeatures([feature])
+
+    def blur(self, threads, envelope=None, sample_in_envelope=False):
+        """Run the algorithm and return the WKB and attributes by feature."""
+        algorithm = BlurringGeoAlgorithm().createInstance()
+        algorithm.initAlgorithm({})
+        # Several chunks, so the workers run concurrently.
+        algorithm.CHUNK_SIZE = 50
+        parameters = {
+            algorithm.INPUT_LAYER: self.cases,
+            algorithm.RADIUS_FIELD: 0.01,
+            algorithm.RADIUS_EXPORT: True,
+            algorithm.CENTROID_EXPORT: True,
+            algorithm.ENVELOPE_LAYER: envelope,
+            algorithm.SAMPLE_IN_ENVELOPE: sample_in_envelope,
+            algorithm.RANDOM_SEED: 42,
+            algorithm.THREADS: threads,
+            algorithm.OUTPUT_LAYER: "memory:",
+        }
+        context = QgsProcessingContext()
+        results, ok = algorithm.run(parameters, context, QgsProcessingFeedback())
+        self.assertTrue(ok)
+        layer = QgsProcessingUtils.mapLayerFromString(
+            results[algorithm.OUTPUT_LAYER], context
+        )
+        return [
+            (bytes(feature.geometry().asWkb()), feature.attributes())
+            for feature in layer.getFeatures()
+        ]
+
+    def test_threads_match_serial_run(self):
+        for envelope, sample_in_envelope in (
+            (None, False),
+            (self.envelope, False),
+            (self.envelope, True),
+        ):
+            serial = self.blur(1, envelope, sample_in_envelope)
+            self.assertEqual(len(serial), self.cases.featureCount())
+            self.assertEqual(self.blur(4, envelope, sample_in_envelope), serial)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import json
+import unittest
+from os.path import dirname, join
+
+from src.core.services import contiguity
+
+try:
+    import libpysal
+    from shapely.geometry import shape
+
+    LIBPYSAL_AVAILABLE = True
+except ImportError:
+    LIBPYSAL_AVAILABLE = False
+
+
+def _square(x, y):
+    return [[(x, y), (x + 1, y), (x + 1, y + 1), (x, y + 1), (x, y)]]
+
+
+class TestContiguity(unittest.TestCase):
+    def setUp(self):
+        # 2 x 2 grid, ids: 0 1 / 2 3
+        self.grid = [_square(0, 1), _square(1, 1), _square(0, 0), _square(1, 0)]
+
+    def test_queen_grid(self):
+        neighbors = contiguity.contiguity_neighbors(self.grid)
+        self.assertEqual(neighbors[0], [1, 2, 3])
+        self.assertEqual(neighbors[3], [0, 1, 2])
+
+    def test_rook_grid(self):
+        neighbors = contiguity.contiguity_neighbors(self.grid, rook=True)
+        self.assertEqual(neighbors[0], [1, 2])
+        self.assertEqual(neighbors[1], [0, 3])
+
+    def test_island_and_reversed_ring(self):
+        polygons = [
+            _square(0, 0),
+            [list(reversed(_square(1, 0)[0]))],
+            _square(5, 5),
+        ]
+        neighbors = contiguity.contiguity_neighbors(polygons, rook=True)
+        self.assertEqual(neighbors, {0: [1], 1: [0], 2: []})
+
+    def test_sparse_matrix(self):
+        count, first, second = contiguity.contiguity_pairs(self.grid, rook=True)
+        matrix = contiguity.sparse_from_pairs(count, first, second)
+        self.assertEqual(matrix.shape, (4, 4))
+        self.assertEqual(matrix.nnz, 8)
+
+    @unittest.skipUnless(LIBPYSAL_AVAILABLE, "libpysal not available")
+    def test_matches_libpysal(self):
+        path = join(dirname(__file__), "data", "grid-500m.geojson")
+        with open(path) as handle:
+            features = json.load(handle)["features"]
+        polygons = [feature["geometry"]["coordinates"] for feature in features]
+        geometries = [shape(feature["geometry"]) for feature in features]
+
+        for rook, builder in (
+            (False, libpysal.weights.Queen),
+            (True, libpysal.weights.Rook),
+        ):
+            expected = builder.from_iterable(geometries).neighbors
+            result = contiguity.contiguity_neighbors(polygons, rook=rook)
+            self.assertEqual(
+                result, {key: sorted(value) for key, value in expected.items()}
+            )
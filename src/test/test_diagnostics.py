@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import csv
+import os
+import tempfile
+import unittest
+
+from src.core.diagnostics import Diagnostics
+
+
+class TestDiagnostics(unittest.TestCase):
+    def setUp(self):
+        self.diagnostics = Diagnostics(max_examples=2)
+        for feature_id in range(5):
+            self.diagnostics.add("invalid_case", feature_id, "n/a")
+        self.diagnostics.add_many("zero_area", [7])
+        self.diagnostics.add_many("empty", [])
+
+    def test_counts_and_examples(self):
+        self.assertEqual(len(self.diagnostics), 6)
+        self.assertEqual(self.diagnostics.categories(), ["invalid_case", "zero_area"])
+        self.assertEqual(self.diagnostics.count("invalid_case"), 5)
+        self.assertEqual(self.diagnostics.examples("invalid_case"), [0, 1])
+
+    def test_summary(self):
+        lines = self.diagnostics.summary({"invalid_case": "Invalid case value"})
+        self.assertEqual(
+            lines, ["Invalid case value: 5 (0, 1, ...)", "zero_area: 1 (7)"]
+        )
+
+    def test_write_csv(self):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            self.diagnostics.write_csv(path)
+            with open(path, newline="", encoding="utf-8") as handle:
+                rows = list(csv.reader(handle))
+        finally:
+            os.remove(path)
+        self.assertEqual(rows[0], ["category", "feature_id", "value"])
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[1], ["invalid_case", "0", "n/a"])
+        self.assertEqual(rows[-1], ["zero_area", "7", ""])
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import unittest
+
+import numpy as np
+
+from src.core.blurring.evaluation import anonymity_counts
+from src.core.blurring.k_anonymity import covering_buffer_radius, k_anonymity_radius
+from src.core.blurring.sampling import random_offsets
+
+try:
+    import scipy  # noqa: F401
+
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+@unittest.skipUnless(SCIPY_AVAILABLE, "scipy not available")
+class TestKAnonymityRadius(unittest.TestCase):
+    def setUp(self):
+        # A dense cluster around the origin and a few sparse points.
+        self.reference = np.array(
+            [[0, 0], [1, 0], [0, 1], [-1, 0], [0, -1], [100, 0], [200, 0]],
+            dtype=float,
+        )
+
+    def test_radius_covers_k_points(self):
+        points = np.array([[0, 0], [100, 0], [np.nan, np.nan]])
+        radii = k_anonymity_radius(points, self.reference, 3)
+        self.assertAlmostEqual(radii[0], 1.0)
+        self.assertAlmostEqual(radii[1], 100.0)
+        self.assertTrue(np.isnan(radii[2]))
+
+        # Each radius is the smallest one covering k reference points.
+        for point, radius in zip(points[:2], radii[:2]):
+            distances = np.hypot(*(self.reference - point).T)
+            self.assertGreaterEqual((distances <= radius).sum(), 3)
+            self.assertLess((distances < radius).sum(), 3)
+
+    def test_bounds(self):
+        points = np.array([[0, 0], [100, 0]])
+        radii = k_anonymity_radius(
+            points, self.reference, 3, min_radius=5.0, max_radius=50.0
+        )
+        self.assertEqual(radii.tolist(), [5.0, 50.0])
+
+    def test_invalid_k(self):
+        with self.assertRaises(ValueError):
+            k_anonymity_radius([[0, 0]], self.reference, 0)
+        with self.assertRaises(ValueError):
+            k_anonymity_radius([[0, 0]], self.reference, 8)
+
+    def test_displaced_buffer_covers_k_points(self):
+        rng = np.random.default_rng(42)
+        reference = rng.random((20000, 2))
+        points = rng.random((5000, 2))
+        k = 10
+        radii = k_anonymity_radius(points, reference, k)
+        dx, dy = random_offsets(rng, radii)
+        centers = points + np.column_stack((dx, dy))
+
+        counts = anonymity_counts(centers, covering_buffer_radius(radii), reference)
+        self.assertTrue((counts >= k).all())
+        # The k-anonymity radius alone does not survive the displacement.
+        self.assertFalse((anonymity_counts(centers, radii, reference) >= k).all())
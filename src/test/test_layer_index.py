@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import unittest
+
+try:
+    from qgis.core import QgsFeature, QgsGeometry, QgsVectorLayer
+    from qgis.testing import start_app
+
+    from src.core.blurring.layer_index import LayerIndexCache
+
+    start_app()
+    QGIS_AVAILABLE = True
+except ImportError:
+    QGIS_AVAILABLE = False
+
+
+@unittest.skipUnless(QGIS_AVAILABLE, "QGIS not available")
+class TestLayerIndexCache(unittest.TestCase):
+    def test_edited_layer_gets_a_new_index(self):
+        layer = QgsVectorLayer("Polygon?crs=epsg:2154", "envelope", "memory")
+        feature = QgsFeature()
+        feature.setGeometry(QgsGeometry.fromWkt("POLYGON((0 0,10 0,10 10,0 10,0 0))"))
+        layer.dataProvider().addFeatures([feature])
+        feature_id = next(layer.getFeatures()).id()
+
+        cache = LayerIndexCache()
+        point = QgsGeometry.fromWkt("POINT(15 5)")
+        self.assertFalse(cache.get(layer).contains(point))
+
+        # Unsaved edit of the envelope: the mask follows the edit buffer.
+        layer.startEditing()
+        layer.changeGeometry(
+            feature_id, QgsGeometry.fromWkt("POLYGON((0 0,20 0,20 10,0 10,0 0))")
+        )
+        self.assertTrue(cache.get(layer).contains(point))
+
+        layer.rollBack()
+        self.assertFalse(cache.get(layer).contains(point))
+        self.assertEqual(len(cache), 0)
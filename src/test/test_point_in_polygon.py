@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import unittest
+
+import numpy as np
+
+from src.core.gis.point_in_polygon import (
+    AssignmentCache,
+    PointInPolygonAssigner,
+    category_codes,
+    category_counts,
+)
+
+
+class TestPointInPolygon(unittest.TestCase):
+    def setUp(self):
+        self.coordinates = np.array(
+            [[0.5, 0.5], [1.0, 1.0], [2.5, 0.5], [np.nan, np.nan], [0.2, 3.0]]
+        )
+
+    def test_candidates_in_rectangle(self):
+        assigner = PointInPolygonAssigner(self.coordinates)
+        self.assertEqual(sorted(assigner.candidates(0, 0, 1, 1).tolist()), [0, 1])
+        self.assertEqual(assigner.candidates(3, 3, 4, 4).tolist(), [])
+
+    def test_assigned_points_are_skipped(self):
+        assigner = PointInPolygonAssigner(self.coordinates)
+        assigner.assignment[1] = 0
+        self.assertEqual(sorted(assigner.candidates(0, 0, 3, 2).tolist()), [0, 2])
+
+    def test_counts(self):
+        assigner = PointInPolygonAssigner(self.coordinates)
+        assigner.assignment[:] = [0, 2, 2, -1, -1]
+        self.assertEqual(assigner.counts(4).tolist(), [1, 0, 2, 0])
+
+    def test_assign_points_keeps_first_polygon(self):
+        assigner = PointInPolygonAssigner(self.coordinates)
+        self.assertEqual(assigner.assign_points(0, [0, 1]), 2)
+        self.assertEqual(assigner.assign_points(1, [1, 2]), 1)
+        self.assertEqual(assigner.assignment.tolist(), [0, 0, 1, -1, -1])
+
+    def test_assignment_cache(self):
+        cache = AssignmentCache(max_entries=2)
+        cache.put("a", [10, 11], [1, 0], [5], [0])
+        cache.put("b", [10, 11], [0, 1], [5], [1])
+        self.assertEqual(cache.get("a", [10, 11])["counts"].tolist(), [1, 0])
+        self.assertIsNone(cache.get("a", [11, 10]))
+
+        # "b" is the least recently used entry
+        cache.put("c", [10], [1], [5], [0])
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+
+    def test_category_codes(self):
+        codes, labels = category_codes(["b", "a", None, 2, "b"])
+        self.assertEqual(labels, ["2", "a", "b"])
+        self.assertEqual(codes.tolist(), [2, 1, -1, 0, 2])
+
+        codes, labels = category_codes(["b", "a", "c"], selected=["c", "a", "c"])
+        self.assertEqual(labels, ["c", "a"])
+        self.assertEqual(codes.tolist(), [-1, 1, 0])
+
+    def test_category_counts(self):
+        counts = category_counts([0, 2, 2, -1, 0], [1, 0, 1, 0, -1], 3, 2)
+        self.assertEqual(counts.tolist(), [[0, 1], [0, 0], [1, 1]])
@@ -32,6 +32,13 @@ try:
 except ImportError:
     NUMPY_AVAILABLE = False
 
+try:
+    import scipy  # noqa: F401
+
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 
 class TestRates(unittest.TestCase):
     def test_incidence_basic(self):
@@ -50,6 +57,77 @@ class TestRates(unittest.TestCase):
         result = rates.compute_incidence([None, 10], [1000, None], 100000)
         self.assertEqual(result, [None, None])
 
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_incidence_array_matches_list_api(self):
+        cases = [10, 20, 0, None, 5, -1, "7"]
+        population = [1000, 2000, 1000, 1000, 0, 1000, 700]
+        result = rates.compute_incidence_array(cases, population, 100000)
+        expected = rates.compute_incidence(cases, population, 100000)
+        self.assertEqual(
+            [None if value != value else value for value in result.tolist()],
+            expected,
+        )
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_density_array_invalid_area(self):
+        result = rates.compute_density_array(
+            numpy.array([10, 4, 3]), numpy.array([2.0, numpy.nan, -1.0])
+        )
+        self.assertEqual(result[0], 5.0)
+        self.assertTrue(numpy.isnan(result[1:]).all())
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_direct_standardized_rates(self):
+        cases = [[1, 6], [2, None], [1, 0]]
+        population = [[100, 200], [100, 100], [100, 0]]
+        result = rates.direct_standardized_rates(cases, population, [1, 3], 1000)
+        # (10 * 1 + 30 * 3) / 4
+        self.assertAlmostEqual(result[0], 25.0)
+        self.assertTrue(numpy.isnan(result[1]))
+        # Empty second stratum contributes a zero rate.
+        self.assertAlmostEqual(result[2], 2.5)
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_indirect_standardization(self):
+        cases = numpy.array([[1, 6], [3, 2], [0, 0]])
+        population = numpy.array([[100, 200], [100, 200], [0, 0]])
+        result = rates.indirect_standardization(cases, population)
+        numpy.testing.assert_allclose(result["reference_rates"], [0.02, 0.02])
+        numpy.testing.assert_allclose(result["expected"], [6.0, 6.0, 0.0])
+        numpy.testing.assert_allclose(result["smr"][:2], [7 / 6, 5 / 6])
+        self.assertTrue(numpy.isnan(result["smr"][2]))
+
+        totals = rates.indirect_standardization(
+            [7, 5, 0], population, reference_rates=[0.02, 0.02]
+        )
+        numpy.testing.assert_allclose(totals["smr"][:2], result["smr"][:2])
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not available")
+    def test_poisson_confidence_limits(self):
+        lower, upper = rates.poisson_confidence_limits([0, 10, None, -1])
+        numpy.testing.assert_allclose(lower[:2], [0.0, 4.7954], atol=1e-4)
+        numpy.testing.assert_allclose(upper[:2], [3.6889, 18.3904], atol=1e-4)
+        self.assertTrue(numpy.isnan(lower[2:]).all())
+        self.assertTrue(numpy.isnan(upper[2:]).all())
+
+        byar_lower, byar_upper = rates.poisson_confidence_limits(
+            [10], method=rates.CI_BYAR
+        )
+        self.assertAlmostEqual(byar_lower[0], 4.7954, delta=0.01)
+        self.assertAlmostEqual(byar_upper[0], 18.3904, delta=0.01)
+
+        with self.assertRaises(ValueError):
+            rates.poisson_confidence_limits([1], confidence=95)
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not available")
+    def test_rate_confidence_intervals(self):
+        lower, upper = rates.rate_confidence_intervals(
+            [10, 3], [1000, 0], ratio=1000
+        )
+        self.assertAlmostEqual(lower[0], 4.7954, places=4)
+        self.assertAlmostEqual(upper[0], 18.3904, places=4)
+        self.assertTrue(numpy.isnan(lower[1]) and numpy.isnan(upper[1]))
+
     @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
     def test_rate_summary_stats_population(self):
         summary = rates.summarize_rates([1.0, 2.0, 3.0], sample_variance=False)
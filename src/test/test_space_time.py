@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+
+                                 GeoPublicHealth
+                                 A QGIS plugin
+
+                              -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by GeoPublicHealth Team
+        email                : info@geopublichealth.org
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import datetime
+import unittest
+
+import numpy as np
+
+from src.core.services import space_time
+
+
+class TestSpaceTime(unittest.TestCase):
+    def setUp(self):
+        self.dates = [
+            "2024-01-03",
+            datetime.date(2024, 1, 8),
+            None,
+            "not a date",
+            datetime.datetime(2024, 2, 15, 10, 30),
+        ]
+
+    def test_as_datetime64(self):
+        dates = space_time.as_datetime64(self.dates, errors="coerce")
+        self.assertEqual(str(dates[1]), "2024-01-08")
+        self.assertTrue(np.isnat(dates[2:4]).all())
+        self.assertEqual(str(dates[4]), "2024-02-15")
+
+        dates = space_time.as_datetime64(
+            ["2024-01-05T10:00", "2024-01-05 23:30:00", "2024-01-05T23:30+05:00", ""]
+        )
+        self.assertEqual(dates[:3].astype(str).tolist(), ["2024-01-05"] * 3)
+        self.assertTrue(np.isnat(dates[3]))
+
+    def test_invalid_dates(self):
+        with self.assertRaises(ValueError):
+            space_time.as_datetime64(self.dates)
+        # Numbers are not days since the epoch.
+        with self.assertRaises(ValueError):
+            space_time.as_datetime64(["2024-01-05", 5])
+        with self.assertRaises(ValueError):
+            space_time.date_bins(["2024-13-45"])
+
+    def test_weekly_bins_start_on_monday(self):
+        codes, starts = space_time.date_bins(
+            self.dates, space_time.PERIOD_WEEK, errors="coerce"
+        )
+        self.assertEqual(codes.tolist(), [0, 1, -1, -1, 6])
+        self.assertEqual(str(starts[0]), "2024-01-01")
+        self.assertEqual(len(starts), 7)
+
+    def test_monthly_bins(self):
+        codes, starts = space_time.date_bins(
+            self.dates, space_time.PERIOD_MONTH, start="2023-12-20", errors="coerce"
+        )
+        self.assertEqual(codes.tolist(), [1, 1, -1, -1, 2])
+        self.assertEqual(
+            space_time.bin_labels(starts, space_time.PERIOD_MONTH),
+            ["2023-12", "2024-01", "2024-02"],
+        )
+
+        codes, starts = space_time.date_bins(
+            self.dates, space_time.PERIOD_DAY, step=30, errors="coerce"
+        )
+        self.assertEqual(codes.tolist(), [0, 0, -1, -1, 1])
+
+    def test_sparse_counts(self):
+        polygons, bins, counts = space_time.space_time_counts(
+            [2, 1, 1, -1, 1, 0], [0, 1, 1, 0, -1, 1], 2
+        )
+        self.assertEqual(polygons.tolist(), [0, 1, 2])
+        self.assertEqual(bins.tolist(), [1, 1, 0])
+        self.assertEqual(counts.tolist(), [1, 2, 1])
+
+        matrix = space_time.count_matrix(polygons, bins, counts, 4, 2)
+        self.assertEqual(matrix.tolist(), [[0, 1], [0, 2], [1, 0], [0, 0]])
+
+        # Many polygons and bins, without a dense array.
+        polygons, bins, counts = space_time.space_time_counts(
+            [299999, 299999], [3999, 3999], 4000
+        )
+        self.assertEqual(polygons.tolist(), [299999])
+        self.assertEqual(bins.tolist(), [3999])
+        self.assertEqual(counts.tolist(), [2])